@@ -0,0 +1,61 @@
+"""
+Precompile the firmware for copying to a board running stock MicroPython.
+
+Every module except main.py and boot.py is compiled to .mpy with
+mpy-cross, so the board skips compiling it at each boot. The output
+folder holds everything to copy to the board (data files included).
+
+Usage:
+    pip install mpy-cross        # version must match the board's MicroPython
+    python Build_Tools/build_mpy.py [--out build]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIRMWARE = os.path.join(os.path.dirname(HERE), "Firmware_Code")
+
+KEEP_AS_SOURCE = ("main.py", "boot.py")          # Run by the firmware by name
+DATA_FILES = ("colors.txt", "settings.json", os.path.join("portal", "style.css.gz"))
+
+
+def mpy_cross_command():
+    """
+    Returns the command used to run mpy-cross (standalone binary, or the
+    pip package through this Python).
+    """
+    if shutil.which("mpy-cross"):
+        return ["mpy-cross"]
+    return [sys.executable, "-m", "mpy_cross"]
+
+
+def build(out):
+    os.makedirs(os.path.join(out, "portal"), exist_ok=True)
+    cmd = mpy_cross_command()
+    for name in sorted(os.listdir(FIRMWARE)):
+        src = os.path.join(FIRMWARE, name)
+        if not name.endswith(".py"):
+            continue
+        if name in KEEP_AS_SOURCE:
+            shutil.copy(src, os.path.join(out, name))
+            continue
+        dst = os.path.join(out, name[:-3] + ".mpy")
+        subprocess.run(cmd + ["-o", dst, src], check=True)
+        print(f"[build] {name} -> {os.path.relpath(dst)}")
+    for name in DATA_FILES:
+        shutil.copy(os.path.join(FIRMWARE, name), os.path.join(out, name))
+    print(f"[build] Copy the contents of {out} to the board")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--out", default="build", help="output folder")
+    args = parser.parse_args()
+    build(args.out)
+
+
+if __name__ == "__main__":
+    main()
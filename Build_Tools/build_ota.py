@@ -0,0 +1,84 @@
+"""
+Package a firmware release for over-the-air updates.
+
+Copies the firmware files into a release folder together with the
+manifest the boards download first (version, size and SHA-256 of every
+file). Files that compress well also get a gzipped copy, which boards
+download instead and inflate locally; they are compressed with a small
+window (GZ_WBITS) so inflating needs little RAM. settings.json is never
+included, so updates keep each board's own settings.
+
+Serve the release folder with the FastAPI server (FIRMWARE_DIR) or with
+Host_Simulator/ota_server.py, and raise the server's latestVersion to
+the release version.
+
+Usage:
+    python Build_Tools/build_ota.py --version 2 [--src Firmware_Code] [--out release]
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import zlib
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIRMWARE = os.path.join(os.path.dirname(HERE), "Firmware_Code")
+
+EXCLUDE = ("settings.json",)   # Per-board files
+EXTENSIONS = (".py", ".mpy", ".txt", ".gz")
+MIN_SAVING = 0.8               # Keep a gzipped copy only if at most this fraction of the size
+GZ_WBITS = 10                  # 1 KiB LZ77 window: the board allocates the same to inflate
+
+
+def release_files(src):
+    """
+    Returns the board-relative paths of the files to release, with "/"
+    separators.
+    """
+    names = []
+    for root, dirs, files in os.walk(src):
+        dirs[:] = [d for d in dirs if not d.startswith((".", "__"))]
+        for name in files:
+            path = os.path.relpath(os.path.join(root, name), src).replace(os.sep, "/")
+            if name.endswith(EXTENSIONS) and path not in EXCLUDE:
+                names.append(path)
+    return sorted(names)
+
+
+def build(src, out, version):
+    files = []
+    for name in release_files(src):
+        with open(os.path.join(src, name), "rb") as f:
+            data = f.read()
+        dst = os.path.join(out, "files", name)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        shutil.copy(os.path.join(src, name), dst)
+        entry = {"name": name, "size": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+        if not name.endswith(".gz"):
+            packer = zlib.compressobj(9, zlib.DEFLATED, 16 + GZ_WBITS)
+            packed = packer.compress(data) + packer.flush()
+            if len(packed) <= len(data) * MIN_SAVING:
+                with open(dst + ".gz", "wb") as f:
+                    f.write(packed)
+                entry["gz_size"] = len(packed)
+                entry["gz_sha256"] = hashlib.sha256(packed).hexdigest()
+                entry["gz_wbits"] = GZ_WBITS
+        files.append(entry)
+        print(f"[ota] {name}: {len(data)} B" + (f" ({entry['gz_size']} B gzipped)" if "gz_size" in entry else ""))
+    with open(os.path.join(out, "manifest.json"), "w") as f:
+        json.dump({"version": version, "files": files}, f, separators=(",", ":"))
+    print(f"[ota] Version {version}: {len(files)} files in {out}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--version", type=int, required=True, help="release version (latestVersion)")
+    parser.add_argument("--src", default=FIRMWARE, help="firmware folder (e.g. a build_mpy.py output)")
+    parser.add_argument("--out", default="release", help="output folder")
+    args = parser.parse_args()
+    build(args.src, args.out, args.version)
+
+
+if __name__ == "__main__":
+    main()
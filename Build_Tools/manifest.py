@@ -0,0 +1,34 @@
+# Freeze the LumaRink firmware modules into a custom MicroPython build:
+#   make -C ports/esp32 BOARD=ESP32_GENERIC_C3 FROZEN_MANIFEST=/path/to/Build_Tools/manifest.py
+# Frozen modules run from flash without being compiled or loaded into RAM
+# at import time. main.py and boot.py stay as files on the board, so they
+# are not frozen here.
+include("$(PORT_DIR)/boards/manifest.py")
+
+for name in (
+    "api_nhl",
+    "buttons",
+    "captive_dns",
+    "celebration",
+    "frame_cache",
+    "heap",
+    "http_client",
+    "layout",
+    "letters",
+    "marquee",
+    "ota",
+    "ota_apply",
+    "palette",
+    "power",
+    "profiler",
+    "relay",
+    "render_thread",
+    "routines",
+    "score_state",
+    "scoreboard",
+    "settings_manager",
+    "upstream",
+    "wifi_functions",
+    "wifi_manager",
+):
+    module(name + ".py", base_path="../Firmware_Code")
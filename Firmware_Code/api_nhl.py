@@ -1,47 +1,105 @@
 import machine
-import urequests
+import time
+import ujson
 import uasyncio as asyncio
-from settings_manager import save_settings, load_settings
-import globals
+from settings_manager import get_settings
+import profiler
+import ota
+import upstream
+from http_client import HttpClient
 
+FAILED_POLL_SEC = 60  # Retry interval while the server is failing, before the fallback starts
 
-async def team_info(url, myTeam, myVersion):
+_client = None  # Keep-alive connection reused across polls
+_payload = None  # Encoded request body, reused while team and version are unchanged
+_payload_for = None
+server_failures = 0  # Consecutive polls the server did not answer
+latest_version = 0  # Latest firmware version the server reported (shared by the LAN relay)
+
+
+def check_version(url, latestVersion, myVersion, state):
+    """
+    Start a firmware update if `latestVersion` differs from the installed one.
+
+    Args:
+        url (str): Server endpoint URL.
+        latestVersion (int): Version the server offers.
+        myVersion (int): Installed version.
+        state (ScoreState): Passed to the updater (no restart during a game).
+    """
+    if latestVersion == myVersion or ota.busy:
+        return
+    if get_settings().get('OTA', True):
+        print(f"[team_info] Firmware version {latestVersion} available, updating")
+        asyncio.create_task(ota.run(url, state))
+    else:
+        print(f"[team_info] Firmware version {latestVersion} available (OTA disabled)")
+
+
+def _publish(state, game_state, team_score, opponent_score=None):
+    # Publish a fetched game; returns (game_state, team_score) as team_info does
+    if game_state in ("PRE", "LIVE", "CRIT", "FUT"):
+        state.publish(game_state, team_score, opponent_score)
+        return game_state, team_score
+    state.publish("OFF", team_score)
+    return "OFF", 0
+
+
+async def team_info(url, myTeam, myVersion, state):
     """
-    Fetch team information from the server.
+    Fetch team information from the server and publish it to `state`.
 
     Args:
         url (str): Server endpoint URL.
         myTeam (str): Team name.
-        myVersion (int): Firmware version (informational only).
+        myVersion (int): Firmware version; a newer `latestVersion` starts an update.
+        state (ScoreState): Receives the fetched game state and score.
 
     Returns:
         tuple: (game_state, team_score), defaults to ("OFF", 0) on errors.
     """
+    global server_failures, latest_version
     try:
         # -----------------------------
-        # Prepare payload
+        # Prepare payload (encoded once unless profiling is attached)
         # -----------------------------
-        payload = {"message": myTeam, "version": myVersion}
+        global _payload, _payload_for
+        if profiler.enabled:
+            payload = {"message": myTeam, "version": myVersion, "profile": profiler.summary()}
+            body = ujson.dumps(payload).encode()
+        else:
+            if _payload is None or _payload_for[0] != myTeam or _payload_for[1] != myVersion:
+                _payload = ujson.dumps({"message": myTeam, "version": myVersion}).encode()
+                _payload_for = (myTeam, myVersion)
+            body = _payload
 
         # -----------------------------
-        # Send POST request to server
+        # Send POST request to server (non-blocking, over the kept-alive connection)
         # -----------------------------
-        response = urequests.post(url, json=payload)
-        print(f"[team_info] Response status: {response.status_code}")
+        global _client
+        if _client is None:
+            _client = HttpClient(url)
+        else:
+            _client.set_url(url)
+        status, body = await _client.post(body)
+        print("[team_info] Response status:", status)
 
-        if response.status_code != 200:
+        if status != 200:
             print("[team_info] Error: Failed to fetch team info from server.")
+            server_failures += 1
             return "OFF", 0
 
         # -----------------------------
         # Parse JSON response
         # -----------------------------
         try:
-            data = response.json()
-            print(f"[team_info] Fetched data: {data}")
+            data = ujson.loads(bytes(body))
+            print("[team_info] Fetched data:", data)
         except ValueError:
             print("[team_info] Error: Failed to parse JSON response.")
+            server_failures += 1
             return "OFF", 0
+        server_failures = 0
 
         if 'error' in data:
             print(f"[team_info] Server error: {data['error']}")
@@ -52,12 +110,13 @@ async def team_info(url, myTeam, myVersion):
         # -----------------------------
         if isinstance(data, dict):
             team_name = data.get("team_name", "Unknown")
-            globals.teamscore = data.get("score_game", 0)
+            team_score = data.get("score_game", 0)
+            opponent_score = data.get("score_opponent")
             game_state = data.get("game_state", "OFF")
             latestVersion = data.get("latestVersion", myVersion)
             firmware_server_url = data.get("firmware_server_url", url)
 
-            print(f"[team_info] Team: {team_name}, Score: {globals.teamscore}, Game State: {game_state}")
+            print("[team_info] Team:", team_name, "Score:", team_score, "Game State:", game_state)
 
             # -----------------------------
             # Update server URL if changed
@@ -65,29 +124,19 @@ async def team_info(url, myTeam, myVersion):
             if firmware_server_url != url:
                 print(f"[team_info] Updating server URL to {firmware_server_url}")
                 url = firmware_server_url
-                settings = load_settings()
-                settings['url'] = url
-                save_settings(settings)
+                get_settings()['url'] = url
                 print("[team_info] URL updated successfully!")
 
             # -----------------------------
-            # Version info update (no debounce/double-press)
+            # Firmware update (myVersion changes once it is installed)
             # -----------------------------
-            if latestVersion != myVersion:
-                settings = load_settings()
-                settings['myVersion'] = latestVersion
-                save_settings(settings)
-                print(f"[team_info] Firmware version updated to {latestVersion}")
-                # Optional: trigger reset if needed
-                # machine.reset()
+            latest_version = latestVersion
+            check_version(url, latestVersion, myVersion, state)
 
             # -----------------------------
             # Determine return based on game state
             # -----------------------------
-            if game_state in ["PRE", "LIVE", "CRIT", "FUT"]:
-                return game_state, globals.teamscore
-            else:
-                return "OFF", 0
+            return _publish(state, game_state, team_score, opponent_score)
 
         else:
             print("[team_info] Error: Invalid data format from server.")
@@ -95,10 +144,36 @@ async def team_info(url, myTeam, myVersion):
 
     except Exception as e:
         print(f"[team_info] Exception fetching team info: {e}")
+        server_failures += 1
         return "OFF", 0
 
 
-async def team_info_update(url, myTeam, myVersion):
+async def upstream_info(myTeam, state):
+    """
+    Fetch the team's game straight from the NHL score feed (fallback while
+    the server is down) and publish it to `state`.
+
+    Args:
+        myTeam (str): Team name.
+        state (ScoreState): Receives the fetched game state and score.
+
+    Returns:
+        tuple: (game_state, team_score), defaults to ("OFF", 0) on errors.
+    """
+    try:
+        result = await upstream.fetch_score(get_settings().get('NHL_URL'), myTeam)
+    except Exception as e:
+        print(f"[upstream] Exception fetching the NHL feed: {e}")
+        return "OFF", 0
+    if result is None:
+        print(f"[upstream] No game today for {myTeam}")
+        return "OFF", 0
+    game_state, team_score, opponent_score = result
+    print("[upstream] Game State:", game_state, "Score:", team_score, "-", opponent_score)
+    return _publish(state, game_state, team_score, opponent_score)
+
+
+async def team_info_update(url, myTeam, myVersion, state, online=None):
     """
     Continuously fetch and update team info at intervals based on game state.
 
@@ -106,27 +181,38 @@ async def team_info_update(url, myTeam, myVersion):
         url (str): Server endpoint URL.
         myTeam (str): Team name.
         myVersion (int): Firmware version.
+        state (ScoreState): Receives each fetched game state and score.
+        online (Event): Polling pauses while this is cleared (WiFi down).
     """
     while True:
-        gamestate, score = await team_info(url, myTeam, myVersion)
-
-        # -----------------------------
-        # Track first NHL score fetches
-        # -----------------------------
-        if globals.first_nhl_scores <= 1:
-            globals.first_nhl_scores += 1
-            print(f"[team_info_update] First NHL fetch count: {globals.first_nhl_scores}")
-
-        print(f"[team_info_update] Game state: {gamestate}, Score: {score}")
+        if online is not None and not online.is_set():
+            print("[team_info_update] WiFi down, polling paused")
+            await online.wait()
+
+        myVersion = get_settings().get('myVersion', myVersion)  # Changed by an update
+        t0 = profiler.start()
+        gamestate, score = await team_info(url, myTeam, myVersion, state)
+        fallback_after = get_settings().get('FALLBACK_AFTER', 0)
+        failing = fallback_after and server_failures > 0
+        if failing and server_failures >= fallback_after:
+            print(f"[team_info_update] Server failed {server_failures} polls in a row, using the NHL feed")
+            gamestate, score = await upstream_info(myTeam, state)
+            failing = False
+        profiler.stop(profiler.NET_POLL, t0)
+
+        print("[team_info_update] Game state:", gamestate, "Score:", score)
 
         # -----------------------------
         # Adjust polling interval based on game state
         # -----------------------------
-        if gamestate in ["PRE", "LIVE", "CRIT"]:
+        if failing:
+            sleep_sec = FAILED_POLL_SEC  # Find out soon whether the fallback is needed
+        elif gamestate in ("PRE", "LIVE", "CRIT"):
             sleep_sec = 10        # Active game: frequent updates
         elif gamestate == "FUT":
             sleep_sec = 600       # Future game: periodic polling
         else:
             sleep_sec = 1800      # OFF or error: conserve bandwidth and power
 
+        state.next_poll = time.ticks_add(time.ticks_ms(), sleep_sec * 1000)  # Power manager wakes for it
         await asyncio.sleep(sleep_sec)
\ No newline at end of file
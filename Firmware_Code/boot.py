@@ -3,3 +3,10 @@
 #esp.osdebug(None)
 #import webrepl
 #webrepl.start()
+
+# Install a staged firmware update before anything else is imported
+# (ota_apply imports only os and ujson, so nothing swapped is loaded yet)
+import sys
+import ota_apply
+ota_apply.apply()
+del sys.modules["ota_apply"]  # ota.py imports the installed copy
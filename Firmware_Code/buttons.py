@@ -0,0 +1,179 @@
+"""
+Interrupt-driven button handling.
+
+Pin IRQs push timestamped edges into a preallocated ring buffer and wake
+a single consumer task, which debounces them and classifies presses as
+short, long or double. Nothing runs while the buttons are idle.
+"""
+import time
+import uasyncio as asyncio
+from array import array
+from machine import Pin
+
+# Press kinds passed to the handler
+SHORT = 0
+LONG = 1
+DOUBLE = 2
+
+
+class ButtonEvents:
+    """
+    Debounced press events for a set of active-low buttons.
+    """
+
+    RING_SIZE = 32  # Edges buffered between two consumer wake-ups
+
+    def __init__(self, pins, debounce_ms=50, double_ms=500, long_ms=5000,
+                 long_press=(), double_press=()):
+        """
+        Args:
+            pins (list): Pin objects (inputs with pull-ups, pressed = 0).
+            debounce_ms (int): Edges closer than this to the last accepted
+                               edge on the same button are ignored.
+            double_ms (int): Maximum gap between two presses of a double press.
+            long_ms (int): Hold time that triggers a long press.
+            long_press (tuple): Button indexes that report long presses.
+            double_press (tuple): Button indexes that report double presses.
+                                  Short presses on these are delayed by
+                                  `double_ms` while waiting for a second press.
+        """
+        self.pins = pins
+        self.debounce_ms = debounce_ms
+        self.double_ms = double_ms
+        self.long_ms = long_ms
+        self.long_press = long_press
+        self.double_press = double_press
+
+        n = len(pins)
+        # Ring of (button index * 2 + level, ticks_ms) pairs, written by the IRQs
+        self._ring = array('i', [0] * (self.RING_SIZE * 2))
+        self._head = 0
+        self._tail = 0
+        self._flag = asyncio.ThreadSafeFlag()
+
+        # Consumer-side state per button
+        self._pressed = bytearray(n)
+        self._long_fired = bytearray(n)
+        self._pending = bytearray(n)       # Short press waiting for a possible second press
+        self._settling = bytearray(n)      # Level must be re-checked once the debounce window ends
+        self._last_edge = array('i', [0] * n)
+        self._down_at = array('i', [0] * n)
+        self._released_at = array('i', [0] * n)
+
+        for i, pin in enumerate(pins):
+            pin.irq(handler=self._make_irq(i), trigger=Pin.IRQ_FALLING | Pin.IRQ_RISING)
+
+    # ---------------- IRQ side ----------------
+    def _make_irq(self, idx):
+        ring = self._ring
+        size = self.RING_SIZE
+        flag = self._flag
+        code = idx * 2
+
+        def irq(pin):
+            n = self._head
+            slot = (n % size) * 2
+            ring[slot] = code + pin.value()
+            ring[slot + 1] = time.ticks_ms()
+            self._head = n + 1
+            flag.set()
+
+        return irq
+
+    # ---------------- Consumer side ----------------
+    def _next_timeout(self, now):
+        """
+        Returns ms until the nearest debounce re-check, long-press or
+        double-press deadline, or -1 when nothing is pending.
+        """
+        timeout = -1
+        for i in range(len(self.pins)):
+            if self._settling[i]:
+                left = time.ticks_diff(time.ticks_add(self._last_edge[i], self.debounce_ms), now)
+            elif self._pressed[i] and not self._long_fired[i] and i in self.long_press:
+                left = time.ticks_diff(time.ticks_add(self._down_at[i], self.long_ms), now)
+            elif self._pending[i]:
+                left = time.ticks_diff(time.ticks_add(self._released_at[i], self.double_ms), now)
+            else:
+                continue
+            left = max(0, left)
+            if timeout < 0 or left < timeout:
+                timeout = left
+        return timeout
+
+    async def _edge(self, idx, level, t, handler):
+        if time.ticks_diff(t, self._last_edge[idx]) < self.debounce_ms:
+            return
+        pressed = 0 if level else 1
+        if pressed == self._pressed[idx]:
+            return  # Bounce back to the level we already have
+        self._last_edge[idx] = t
+        self._pressed[idx] = pressed
+        self._settling[idx] = 1
+
+        if pressed:
+            self._down_at[idx] = t
+            self._long_fired[idx] = 0
+            return
+
+        # Release
+        if self._long_fired[idx]:
+            return
+        if idx not in self.double_press:
+            await handler(idx, SHORT)
+        elif self._pending[idx] and time.ticks_diff(t, self._released_at[idx]) <= self.double_ms:
+            self._pending[idx] = 0
+            await handler(idx, DOUBLE)
+        else:
+            self._pending[idx] = 1
+            self._released_at[idx] = t
+
+    async def _timers(self, now, handler):
+        for i in range(len(self.pins)):
+            if self._settling[i] and time.ticks_diff(now, self._last_edge[i]) >= self.debounce_ms:
+                # Catch a change hidden inside the debounce window (e.g. a very short tap)
+                self._settling[i] = 0
+                level = self.pins[i].value()
+                if level == self._pressed[i]:
+                    await self._edge(i, level, now, handler)
+            if (self._pressed[i] and not self._long_fired[i] and i in self.long_press
+                    and time.ticks_diff(now, self._down_at[i]) >= self.long_ms):
+                self._long_fired[i] = 1
+                self._pending[i] = 0
+                await handler(i, LONG)
+            elif (self._pending[i] and not self._pressed[i]
+                  and time.ticks_diff(now, self._released_at[i]) > self.double_ms):
+                self._pending[i] = 0
+                await handler(i, SHORT)
+
+    async def run(self, handler):
+        """
+        Consume edges and deliver presses. Run with asyncio.create_task().
+
+        Args:
+            handler (coroutine function): Called as `await handler(idx, kind)`
+                                          with kind SHORT, LONG or DOUBLE.
+        """
+        ring = self._ring
+        size = self.RING_SIZE
+        while True:
+            timeout = self._next_timeout(time.ticks_ms())
+            if timeout < 0:
+                await self._flag.wait()
+            else:
+                try:
+                    await asyncio.wait_for_ms(self._flag.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+            head = self._head
+            if head - self._tail > size:
+                print("[Buttons] Edge buffer overrun")
+                self._tail = head - size
+            while self._tail != head:
+                slot = (self._tail % size) * 2
+                code = ring[slot]
+                self._tail += 1
+                await self._edge(code >> 1, code & 1, ring[slot + 1], handler)
+
+            await self._timers(time.ticks_ms(), handler)
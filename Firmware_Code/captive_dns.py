@@ -0,0 +1,71 @@
+"""
+Captive-portal DNS server.
+
+While the setup access point is up, every DNS query is answered with the
+board's own address, so phones and laptops that probe for internet
+access land on the WiFi setup page.
+"""
+import socket
+import uasyncio as asyncio
+
+POLL_MS = 50  # Socket poll period (uasyncio has no UDP streams)
+
+
+def _answer(query, ip):
+    """
+    Build the response to a DNS query.
+
+    Args:
+        query (bytes): Raw DNS request.
+        ip (bytes): Address to answer with (4 bytes).
+
+    Returns:
+        bytes: Response, or None if the packet is not a standard query.
+    """
+    if len(query) < 12 or query[2] & 0xF8 or query[4:6] != b'\x00\x01':
+        return None  # A response, not a standard query, or not one question
+    # Skip the name in the question section
+    i = 12
+    while i < len(query) and query[i]:
+        i += query[i] + 1
+    end = i + 5
+    if end > len(query):
+        return None
+    is_a = query[i + 1:i + 5] == b'\x00\x01\x00\x01'  # Type A, class IN
+    header = query[:2] + b'\x81\x80\x00\x01' + (b'\x00\x01' if is_a else b'\x00\x00') + b'\x00\x00\x00\x00'
+    if not is_a:
+        return header + query[12:end]  # No record for AAAA etc.
+    # Answer: pointer to the question name, A/IN, TTL 60 s, 4-byte address
+    return header + query[12:end] + b'\xc0\x0c\x00\x01\x00\x01\x00\x00\x00\x3c\x00\x04' + ip
+
+
+async def dns_server(ip, port=53):
+    """
+    Answer every A query with `ip` until cancelled.
+    Run with asyncio.create_task().
+
+    Args:
+        ip (str): Address of the captive portal, e.g. "192.168.4.1".
+        port (int): UDP port to listen on.
+    """
+    addr = bytes([int(part) for part in ip.split('.')])
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setblocking(False)
+    try:
+        sock.bind(('0.0.0.0', port))
+        print(f"[DNS] Redirecting all lookups to {ip}")
+        while True:
+            try:
+                query, client = sock.recvfrom(512)
+            except OSError:
+                await asyncio.sleep_ms(POLL_MS)
+                continue
+            response = _answer(query, addr)
+            if response:
+                try:
+                    sock.sendto(response, client)
+                except OSError as e:
+                    print("[DNS] Send failed:", e)
+    finally:
+        sock.close()
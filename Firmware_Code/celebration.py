@@ -0,0 +1,86 @@
+"""
+Goal celebration overlay.
+
+Goal celebrations run in their own task on top of the normal animation,
+so the main loop, score polling and buttons stay live while the sign
+celebrates. The task sleeps until ScoreState delivers a goal event, and
+consecutive goals are each shown in turn.
+"""
+import uasyncio as asyncio
+from routines import goal_routine
+
+
+class GoalOverlay:
+    """
+    Plays goal celebrations as goal events arrive.
+
+    While `active` is True the overlay owns the strip and the normal
+    colour routines should not draw; `finished` is set once the pending
+    goals have been played out. The main loop clears `strip_free` while a
+    routine step runs, and a celebration starts only once that step is
+    done, so a step resuming from its sleep can't draw over it.
+    """
+
+    def __init__(self, np, num_pixels, palette, brightness, on_done=None):
+        """
+        Args:
+            np (NeoPixel): Strip to draw on.
+            num_pixels (int): Total LEDs.
+            palette (Palette): Colours used for the celebration.
+            brightness (float): LED brightness (may be changed at any time).
+            on_done (callable): Called once the pending goals have been played.
+        """
+        self.np = np
+        self.num_pixels = num_pixels
+        self.palette = palette
+        self.brightness = brightness
+        self.on_done = on_done
+        self.active = False
+        self.finished = asyncio.Event()
+        self.strip_free = asyncio.Event()
+        self.strip_free.set()
+        self._task = None
+        self._cancelled = False
+
+    def cancel(self):
+        """
+        Stop the celebration currently playing; pending goals still follow.
+        """
+        if self._task is not None:
+            self._cancelled = True
+            self._task.cancel()
+
+    async def _play(self, score):
+        print(f"[Goal] Celebrating goal ({score})")
+        self._task = asyncio.create_task(
+            goal_routine(self.np, self.num_pixels, self.palette, self.brightness))
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            if not self._cancelled:
+                raise  # The overlay task itself is being cancelled
+            print("[Goal] Celebration cancelled")
+        finally:
+            self._task = None
+            self._cancelled = False
+
+    async def run(self, state):
+        """
+        Play a celebration for every goal published to `state`.
+        Run with asyncio.create_task().
+
+        Args:
+            state (ScoreState): Source of goal events.
+        """
+        while True:
+            score = await state.next_goal()
+            self.active = True  # No new routine step starts
+            self.finished.clear()
+            await self.strip_free.wait()  # Let the step already drawing finish
+            await self._play(score)
+            while state.pending_goals():
+                await self._play(await state.next_goal())
+            self.active = False
+            self.finished.set()
+            if self.on_done:
+                self.on_done()
@@ -0,0 +1,73 @@
+"""
+Frame cache for fixed LED sequences.
+
+Sequences that always produce the same frames (goal celebration,
+flashing, WiFi connected blink) are rendered once per key into packed
+byte buffers in the strip's own byte order, then replayed by copying the
+buffer straight into np.buf instead of recomputing every pixel.
+
+Keys should include everything the frames depend on (word, palette,
+brightness). Call `clear()` when settings change to free stale frames.
+"""
+
+MAX_ENTRIES = 8  # Sequences kept before the cache is emptied
+
+_cache = {}
+
+
+def clear():
+    """
+    Drop every cached sequence.
+    """
+    _cache.clear()
+
+
+def render(np, draw, start=0, end=None):
+    """
+    Render pixels [start, end) with `draw(np)` and capture them as a frame.
+    The strip buffer is restored afterwards, so nothing visible changes.
+
+    Args:
+        np (NeoPixel): Strip to render with.
+        draw (callable): Sets pixels on np (must not call np.write()).
+        start (int): First pixel captured.
+        end (int): Pixel after the last one captured (default: whole strip).
+
+    Returns:
+        tuple: (byte offset, bytes) frame for `show()`.
+    """
+    bpp = np.bpp
+    lo = start * bpp
+    hi = len(np.buf) if end is None else end * bpp
+    saved = bytes(np.buf[lo:hi])
+    draw(np)
+    frame = (lo, bytes(np.buf[lo:hi]))
+    np.buf[lo:hi] = saved
+    return frame
+
+
+def show(np, frame):
+    """
+    Copy a cached frame into the strip buffer and push it to the LEDs.
+    """
+    lo, data = frame
+    np.buf[lo:lo + len(data)] = data
+    np.write()
+
+
+def frames(key, build):
+    """
+    Return the cached frames for `key`, building them with `build()` on
+    first use.
+
+    Args:
+        key (tuple): Everything the frames depend on.
+        build (callable): Returns a tuple of frames from `render()`.
+    """
+    seq = _cache.get(key)
+    if seq is None:
+        if len(_cache) >= MAX_ENTRIES:
+            _cache.clear()
+        seq = build()
+        _cache[key] = seq
+    return seq
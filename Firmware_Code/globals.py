@@ -1,3 +0,0 @@
-teamscore = 0           # Current score of the team
-previous_score = 0      # Previous score for comparison/delta
-first_nhl_scores = 0    # Counter for initial NHL score fetches
\ No newline at end of file
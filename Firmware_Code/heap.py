@@ -0,0 +1,71 @@
+"""
+Heap housekeeping.
+
+Once the sign is running, the animation and polling paths allocate
+(almost) nothing per frame, so the heap fills slowly and an automatic
+collection would only start at some random moment mid-frame. Instead,
+`collector()` runs gc.collect() on a fixed period from its own task;
+since the routines draw and then sleep until their next frame, the task
+only ever gets to run in that idle slack.
+"""
+import gc
+import uasyncio as asyncio
+import profiler
+
+COLLECT_PERIOD_MS = 1000  # Scheduled collection period
+_collections = 0
+
+
+def largest_free_block(limit=None):
+    """
+    Find the largest block that can currently be allocated, by trying
+    allocations (binary search). Run right after a collection.
+
+    Args:
+        limit (int): Upper bound to search up to (default: free heap).
+
+    Returns:
+        int: Size in bytes.
+    """
+    lo = 0
+    hi = gc.mem_free() if limit is None else limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        try:
+            block = bytearray(mid)
+            del block
+            lo = mid
+        except MemoryError:
+            hi = mid - 1
+    return lo
+
+
+def report():
+    """
+    Print a heap report over serial: usage, the largest free block and
+    how fragmented the free space is.
+    """
+    gc.collect()
+    free = gc.mem_free()
+    used = gc.mem_alloc()
+    largest = largest_free_block(free)
+    gc.collect()
+    profiler.collected()
+    frag = 100 - largest * 100 // free if free else 0
+    print(f"[Heap] used {used} B, free {free} B, largest free block {largest} B "
+          f"({frag}% fragmented), scheduled collections {_collections}")
+
+
+async def collector(period_ms=COLLECT_PERIOD_MS):
+    """
+    Collect garbage every `period_ms` (in the animation's idle time).
+    Run with asyncio.create_task().
+    """
+    global _collections
+    while True:
+        await asyncio.sleep_ms(period_ms)
+        t0 = profiler.start()
+        gc.collect()
+        profiler.stop(profiler.COLLECT, t0)
+        profiler.collected()
+        _collections += 1
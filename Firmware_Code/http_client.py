@@ -0,0 +1,324 @@
+"""
+Minimal keep-alive HTTP/1.1 client for the score poller.
+
+Runs on uasyncio streams, so the LEDs keep animating while a request is
+in flight. Keeps one connection open to the server between polls,
+caches the DNS lookup, and reads responses into a single preallocated
+buffer, so each poll costs one round trip instead of DNS + connect +
+request.
+
+`get()` streams larger downloads (firmware files, the NHL score feed)
+chunk by chunk instead of buffering the whole body.
+"""
+import socket
+import uasyncio as asyncio
+
+
+class HttpClient:
+    """
+    Persistent connection to one HTTP server.
+    """
+
+    BUF_SIZE = 1024           # Largest response body accepted
+    CONNECT_TIMEOUT_MS = 5000
+    REQUEST_TIMEOUT_MS = 8000  # Send request + receive the whole response
+
+    def __init__(self, url):
+        """
+        Args:
+            url (str): Endpoint URL, e.g. "http://host:8000/nhl-data/".
+        """
+        self._reader = None
+        self._writer = None
+        self._ip = None
+        self._buf = bytearray(self.BUF_SIZE)
+        self._mv = memoryview(self._buf)
+        self.url = None
+        self.set_url(url)
+
+    def set_url(self, url):
+        """
+        Point the client at a new endpoint (drops the connection if the
+        host changed).
+        """
+        if url == self.url:
+            return
+        proto, _, rest = url.partition("://")
+        if proto != "http":
+            raise ValueError("only http:// URLs are supported")
+        hostport, _, path = rest.partition("/")
+        host, _, port = hostport.partition(":")
+        if self.url is None or host != self.host or int(port or 80) != self.port:
+            self.close()
+            self._ip = None
+        self.url = url
+        self.host = host
+        self.port = int(port or 80)
+        self.path = "/" + path
+        self._head = ("POST %s HTTP/1.1\r\nHost: %s\r\nContent-Type: application/json\r\n"
+                      "Connection: keep-alive\r\nContent-Length: " % (self.path, hostport)).encode()
+
+    def close(self):
+        """
+        Close the connection (it is reopened on the next request).
+        """
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except OSError:
+                pass
+            self._reader = self._writer = None
+
+    async def _connect(self):
+        if self._ip is None:
+            # Resolve once (this lookup blocks); the cached address is
+            # dropped if connecting fails
+            self._ip = socket.getaddrinfo(self.host, self.port, 0, socket.SOCK_STREAM)[0][-1][0]
+        try:
+            self._reader, self._writer = await asyncio.wait_for_ms(
+                asyncio.open_connection(self._ip, self.port), self.CONNECT_TIMEOUT_MS)
+        except (OSError, asyncio.TimeoutError):
+            self._ip = None
+            raise
+
+    async def _exchange(self, body):
+        reader = self._reader
+        writer = self._writer
+        writer.write(self._head)
+        writer.write(("%d\r\n\r\n" % len(body)).encode())
+        writer.write(body)
+        await writer.drain()
+
+        # Status line and the headers we care about
+        line = await reader.readline()
+        if not line:
+            raise OSError("connection closed")
+        status = int(line[9:12])
+        length = -1
+        keep_alive = True
+        while True:
+            line = await reader.readline()
+            if not line or line == b"\r\n":
+                break
+            line = line.lower()
+            if line.startswith(b"content-length:"):
+                length = int(line[15:])
+            elif line.startswith(b"connection:") and b"close" in line:
+                keep_alive = False
+
+        # Body, read straight into the preallocated buffer
+        mv = self._mv
+        n = 0
+        if length < 0:
+            keep_alive = False  # Body runs until the server closes
+            while True:
+                if n == self.BUF_SIZE:
+                    raise OSError("response too large")
+                got = await reader.readinto(mv[n:])
+                if not got:
+                    break
+                n += got
+        else:
+            if length > self.BUF_SIZE:
+                raise OSError("response too large")
+            while n < length:
+                got = await reader.readinto(mv[n:length])
+                if not got:
+                    raise OSError("connection closed")
+                n += got
+
+        if not keep_alive:
+            self.close()
+        return status, mv[:n]
+
+    async def _request(self, body):
+        return await asyncio.wait_for_ms(self._exchange(body), self.REQUEST_TIMEOUT_MS)
+
+    async def post(self, body):
+        """
+        POST a JSON body, reusing the open connection when possible.
+
+        Args:
+            body (bytes): Encoded JSON request body.
+
+        Returns:
+            tuple: (status code, memoryview of the response body). The body
+                   is only valid until the next request.
+
+        Raises:
+            OSError: On network errors or timeouts. The connection is closed
+                     on any error or cancellation.
+        """
+        reused = self._writer is not None
+        try:
+            if not reused:
+                await self._connect()
+            return await self._request(body)
+        except (OSError, asyncio.TimeoutError):
+            self.close()
+            if not reused:
+                raise
+        except BaseException:
+            # Garbled response or cancelled mid-request: the stream is out
+            # of step, so never reuse it
+            self.close()
+            raise
+        # The server dropped the idle connection: retry once on a new one
+        try:
+            await self._connect()
+            return await self._request(body)
+        except BaseException:
+            self.close()
+            raise
+
+
+class StreamResponse:
+    """
+    Response to `get()`, with the body read incrementally.
+
+    Attributes:
+        status (int): HTTP status code.
+        length (int): Body length from Content-Length, or -1 if unknown.
+    """
+
+    def __init__(self, reader, writer, status, length, chunked, timeout_ms):
+        self.status = status
+        self.length = length
+        self._reader = reader
+        self._writer = writer
+        self._chunked = chunked
+        self._timeout_ms = timeout_ms
+        self._left = 0 if chunked else length  # Bytes left in the body or current chunk
+        self._first = True
+
+    async def _next_chunk(self):
+        # Chunked transfer encoding: "<hex size>\r\n<data>\r\n", ending with size 0
+        reader = self._reader
+        if not self._first:
+            await asyncio.wait_for_ms(reader.readline(), self._timeout_ms)  # CRLF after the data
+        self._first = False
+        line = await asyncio.wait_for_ms(reader.readline(), self._timeout_ms)
+        if not line:
+            raise OSError("connection closed")
+        self._left = int(line.split(b";")[0], 16)
+        if self._left == 0:
+            self._chunked = False  # Done; trailers are ignored
+
+    async def readinto(self, mv):
+        """
+        Read the next part of the body.
+
+        Args:
+            mv (memoryview): Destination.
+
+        Returns:
+            int: Bytes read, 0 at the end of the body.
+
+        Raises:
+            OSError: If the connection closes early.
+        """
+        if self._chunked and self._left == 0:
+            await self._next_chunk()
+        if self._left == 0:
+            return 0
+        if 0 < self._left < len(mv):
+            mv = mv[:self._left]
+        n = await asyncio.wait_for_ms(self._reader.readinto(mv), self._timeout_ms)
+        if not n:
+            if self._left > 0:
+                raise OSError("connection closed")
+            return 0  # Length unknown: the body ends with the connection
+        if self._left > 0:
+            self._left -= n
+        return n
+
+    def close(self):
+        try:
+            self._writer.close()
+        except OSError:
+            pass
+
+
+MAX_REDIRECTS = 3  # Location hops followed by get()
+REDIRECTS = (301, 302, 303, 307, 308)
+
+
+def _resolve(url, location):
+    # Absolute URL for a Location header (absolute, host-relative or path-relative)
+    if "://" in location:
+        return location
+    proto, _, rest = url.partition("://")
+    hostport, _, path = rest.partition("/")
+    if location.startswith("/"):
+        return "%s://%s%s" % (proto, hostport, location)
+    folder = path.split("?")[0].rpartition("/")[0]
+    return "%s://%s/%s" % (proto, hostport, folder + "/" + location if folder else location)
+
+
+async def _get_once(url, start, timeout_ms):
+    # One request; returns (StreamResponse, Location header or None)
+    proto, _, rest = url.partition("://")
+    if proto not in ("http", "https"):
+        raise ValueError("only http:// and https:// URLs are supported")
+    tls = proto == "https"
+    hostport, _, path = rest.partition("/")
+    host, _, port = hostport.partition(":")
+    port = int(port or (443 if tls else 80))
+    if tls:
+        connect = asyncio.open_connection(host, port, ssl=True)
+    else:
+        connect = asyncio.open_connection(host, port)
+    reader, writer = await asyncio.wait_for_ms(connect, timeout_ms)
+    try:
+        writer.write(("GET /%s HTTP/1.1\r\nHost: %s\r\nConnection: close\r\n" % (path, hostport)).encode())
+        if start:
+            writer.write(("Range: bytes=%d-\r\n" % start).encode())
+        writer.write(b"\r\n")
+        await writer.drain()
+        line = await asyncio.wait_for_ms(reader.readline(), timeout_ms)
+        if len(line) < 12:
+            raise OSError("bad response")
+        status = int(line[9:12])
+        length = -1
+        chunked = False
+        location = None
+        while True:
+            line = await asyncio.wait_for_ms(reader.readline(), timeout_ms)
+            if not line or line == b"\r\n":
+                break
+            lower = line.lower()
+            if lower.startswith(b"content-length:"):
+                length = int(line[15:])
+            elif lower.startswith(b"transfer-encoding:") and b"chunked" in lower:
+                chunked = True
+            elif lower.startswith(b"location:"):
+                location = line[9:].strip().decode()
+        if chunked:
+            length = -1
+        return StreamResponse(reader, writer, status, length, chunked, timeout_ms), location
+    except BaseException:  # Errors and cancellation: don't leak the socket
+        writer.close()
+        raise
+
+
+async def get(url, start=0, timeout_ms=10000):
+    """
+    Send a GET request on a new connection and read the response head,
+    following up to MAX_REDIRECTS redirects.
+
+    Args:
+        url (str): http:// or https:// URL.
+        start (int): First byte wanted; sent as a Range header if not 0
+                     (a server that ignores it answers 200 with the whole body).
+        timeout_ms (int): Limit for connecting and for each read.
+
+    Returns:
+        StreamResponse: Call close() when done.
+    """
+    for _ in range(MAX_REDIRECTS + 1):
+        resp, location = await _get_once(url, start, timeout_ms)
+        if resp.status not in REDIRECTS or not location:
+            return resp
+        resp.close()
+        url = _resolve(url, location)
+    raise OSError("too many redirects")
@@ -0,0 +1,122 @@
+"""
+Sign geometry.
+
+Describes where every LED sits on the sign as straight runs of LEDs, and
+compiles that at boot into a packed (x, y) -> LED index table covering
+the whole canvas, so effects can draw by coordinate with one byte lookup
+per pixel.
+
+Canvas coordinates: x grows to the right, y grows downwards. Rows 0-4
+hold the word (5x5 letters side by side), rows 5-6 the skate below it.
+"""
+
+NONE = 0xFF  # Table value for canvas positions without an LED
+
+LETTER_SIZE = 5
+LETTER_PIXELS = LETTER_SIZE * LETTER_SIZE
+SKATE_ENDS = 5   # Row of the two skate end LEDs (first and last)
+SKATE_BLADE = 6  # Row of the skate blade
+HEIGHT = 7
+
+# One letter, wired as a serpentine from its bottom-left corner:
+# (first LED, LED count, x, y, dx) relative to the letter's origin
+LETTER_RUNS = (
+    (0, 5, 0, 4, 1),
+    (5, 5, 4, 3, -1),
+    (10, 5, 0, 2, 1),
+    (15, 5, 4, 1, -1),
+    (20, 5, 0, 0, 1),
+)
+
+
+def describe(num_pixels, skate_pixels):
+    """
+    Lists the runs of LEDs making up a sign: the skate first (it is first
+    on the strip), then the letters left to right.
+
+    Arguments:
+    - num_pixels: total LEDs on the strip
+    - skate_pixels: LEDs in the skate
+
+    Returns:
+        list: (first LED, LED count, x, y, dx) runs
+    """
+    letters = (num_pixels - skate_pixels) // LETTER_PIXELS
+    width = max(letters * LETTER_SIZE, 1)
+    blade = skate_pixels - 2
+    runs = []
+    if skate_pixels > 0:
+        runs.append((0, 1, 0, SKATE_ENDS, 1))
+    if blade > 0:
+        # Blade LEDs spread evenly under the word
+        runs.append((1, blade, 0, SKATE_BLADE, max(width // blade, 1)))
+    if skate_pixels > 1:
+        runs.append((skate_pixels - 1, 1, width - 1, SKATE_ENDS, 1))
+    for letter in range(letters):
+        base = skate_pixels + letter * LETTER_PIXELS
+        x0 = letter * LETTER_SIZE
+        for first, count, x, y, dx in LETTER_RUNS:
+            runs.append((base + first, count, x0 + x, y, dx))
+    return runs
+
+
+class Layout:
+    """
+    Compiled sign geometry.
+
+    Attributes:
+        width (int): Canvas width (5 per letter).
+        height (int): Canvas height.
+        letters (int): Number of letters the sign has room for.
+        skate (range): LED indexes of the skate, in strip order.
+        extra (range): LEDs past the last letter (not on the canvas).
+        grid (bytearray): LED index per canvas position, row by row
+                          (NONE where there is no LED).
+    """
+
+    def __init__(self, num_pixels, skate_pixels):
+        """
+        Arguments:
+        - num_pixels: total LEDs on the strip (fewer than 255)
+        - skate_pixels: LEDs in the skate
+        """
+        self.num_pixels = num_pixels
+        self.skate_pixels = skate_pixels
+        self.letters = max((num_pixels - skate_pixels) // LETTER_PIXELS, 0)
+        self.width = max(self.letters * LETTER_SIZE, 1)
+        self.height = HEIGHT
+        self.skate = range(min(skate_pixels, num_pixels))
+        self.extra = range(skate_pixels + self.letters * LETTER_PIXELS, num_pixels)
+        self.grid = bytearray(b'\xff' * (self.width * self.height))
+        for first, count, x, y, dx in describe(num_pixels, skate_pixels):
+            for i in range(count):
+                if first + i < num_pixels and 0 <= x < self.width:
+                    self.grid[y * self.width + x] = first + i
+                x += dx
+        self._rows = [bytes([i for i in self.grid[y * self.width:(y + 1) * self.width] if i != NONE])
+                      for y in range(self.height)]
+
+    def index(self, x, y):
+        """
+        Returns the LED index at (x, y), or NONE.
+        """
+        return self.grid[y * self.width + x]
+
+    def row(self, y):
+        """
+        Returns the LED indexes on row y, left to right (as bytes).
+        """
+        return self._rows[y]
+
+
+_layout = None
+
+
+def for_sign(num_pixels, skate_pixels):
+    """
+    Returns the Layout for a sign, compiling it on first use.
+    """
+    global _layout
+    if _layout is None or _layout.num_pixels != num_pixels or _layout.skate_pixels != skate_pixels:
+        _layout = Layout(num_pixels, skate_pixels)
+    return _layout
@@ -1,294 +1,71 @@
 """
 letters_5x5: 5x5 LED-style pixel maps for letters, numbers, and symbols.
 
-Each value is a 5x5 list of 0 (off) and 1 (on) pixels.
+Each glyph is packed into one 25-bit int (a small int, so no heap objects
+per glyph): bit `row * 5 + col` is set when that pixel is lit, row 0 at
+the top, as drawn in the comments. Mapping to the wiring is left to
+layout.py.
+
+Use `lit()` to read a pixel; `decode()` expands a glyph back to a 5x5
+list for debugging.
 """
+
 letters_5x5 = {
-    "A": [
-        [0,1,1,1,0],
-        [1,0,0,0,1],
-        [1,1,1,1,1][::-1],  # row mirrored
-        [1,0,0,0,1],
-        [1,0,0,0,1],
-    ],
-    "B": [
-        [1,1,1,1,0],
-        [1,0,0,0,1],
-        [1,1,1,1,0][::-1],  # row mirrored
-        [1,0,0,0,1],
-        [1,1,1,1,0],
-    ],
-    "C": [
-        [0,1,1,1,1],
-        [1,0,0,0,0],
-        [1,0,0,0,0][::-1],  # row mirrored
-        [1,0,0,0,0],
-        [0,1,1,1,1],
-    ],
-    "D": [
-        [1,1,1,1,0],
-        [1,0,0,0,1],
-        [1,0,0,0,1][::-1],  # row mirrored
-        [1,0,0,0,1],
-        [1,1,1,1,0],
-    ],
-    "E": [
-        [1,1,1,1,1],
-        [1,0,0,0,0],
-        [1,1,1,1,0][::-1],  # row mirrored
-        [1,0,0,0,0],
-        [1,1,1,1,1],
-    ],
-    "F": [
-        [1,1,1,1,1],
-        [1,0,0,0,0],
-        [1,1,1,1,0][::-1],  # row mirrored
-        [1,0,0,0,0],
-        [1,0,0,0,0],
-    ],
-    "G": [
-        [0,1,1,1,1],
-        [1,0,0,0,0],
-        [1,0,1,1,1][::-1],  # row mirrored
-        [1,0,0,0,1],
-        [0,1,1,1,1],
-    ],
-    "H": [
-        [1,0,0,0,1],
-        [1,0,0,0,1],
-        [1,1,1,1,1][::-1],  # row mirrored
-        [1,0,0,0,1],
-        [1,0,0,0,1],
-    ],
-    "I": [
-        [1,1,1,1,1],
-        [0,0,1,0,0],
-        [0,0,1,0,0][::-1],  # row mirrored
-        [0,0,1,0,0],
-        [1,1,1,1,1],
-    ],
-    "J": [
-        [0,0,0,1,1],
-        [0,0,0,0,1],
-        [0,0,0,0,1][::-1],  # row mirrored
-        [1,0,0,0,1],
-        [0,1,1,1,0],
-    ],
-    "K": [
-        [1,0,0,0,1],
-        [1,0,0,1,0],
-        [1,1,1,0,0][::-1],  # row mirrored
-        [1,0,0,1,0],
-        [1,0,0,0,1],
-    ],
-    "L": [
-        [1,0,0,0,0],
-        [1,0,0,0,0],
-        [1,0,0,0,0][::-1],  # row mirrored
-        [1,0,0,0,0],
-        [1,1,1,1,1],
-    ],
-    "M": [
-        [1,0,0,0,1],
-        [1,1,0,1,1],
-        [1,0,1,0,1][::-1],  # row mirrored
-        [1,0,0,0,1],
-        [1,0,0,0,1],
-    ],
-    "N": [
-        [1,0,0,0,1],
-        [1,1,0,0,1],
-        [1,0,1,0,1][::-1],  # row mirrored
-        [1,0,0,1,1],
-        [1,0,0,0,1],
-    ],
-    "O": [
-        [0,1,1,1,0],
-        [1,0,0,0,1],
-        [1,0,0,0,1][::-1],  # row mirrored
-        [1,0,0,0,1],
-        [0,1,1,1,0],
-    ],
-    "P": [
-        [1,1,1,1,0],
-        [1,0,0,0,1],
-        [1,1,1,1,0][::-1],  # row mirrored
-        [1,0,0,0,0],
-        [1,0,0,0,0],
-    ],
-    "Q": [
-        [0,1,1,1,0],
-        [1,0,0,0,1],
-        [1,0,0,0,1][::-1],  # row mirrored
-        [1,0,1,0,1],
-        [0,1,1,1,1],
-    ],
-    "R": [
-        [1,1,1,1,0],
-        [1,0,0,0,1],
-        [1,1,1,1,0][::-1],  # row mirrored
-        [1,0,0,1,0],
-        [1,0,0,0,1],
-    ],
-    "S": [
-        [0,1,1,1,1],
-        [1,0,0,0,0],
-        [0,1,1,1,0][::-1],  # row mirrored
-        [0,0,0,0,1],
-        [1,1,1,1,0],
-    ],
-    "T": [
-        [1,1,1,1,1],
-        [0,0,1,0,0],
-        [0,0,1,0,0][::-1],  # row mirrored
-        [0,0,1,0,0],
-        [0,0,1,0,0],
-    ],
-    "U": [
-        [1,0,0,0,1],
-        [1,0,0,0,1],
-        [1,0,0,0,1][::-1],  # row mirrored
-        [1,0,0,0,1],
-        [0,1,1,1,0],
-    ],
-    "V": [
-        [1,0,0,0,1],
-        [1,0,0,0,1],
-        [1,0,0,0,1][::-1],  # row mirrored
-        [0,1,0,1,0],
-        [0,0,1,0,0],
-    ],
-    "W": [
-        [1,0,0,0,1],
-        [1,0,0,0,1],
-        [1,0,1,0,1][::-1],  # row mirrored
-        [1,1,0,1,1],
-        [1,0,0,0,1],
-    ],
-    "X": [
-        [1,0,0,0,1],
-        [0,1,0,1,0],
-        [0,0,1,0,0][::-1],  # row mirrored
-        [0,1,0,1,0],
-        [1,0,0,0,1],
-    ],
-    "Y": [
-        [1,0,0,0,1],
-        [0,1,0,1,0],
-        [0,0,1,0,0][::-1],  # row mirrored
-        [0,0,1,0,0],
-        [0,0,1,0,0],
-    ],
-    "Z": [
-        [1,1,1,1,1],
-        [0,0,0,1,0],
-        [0,0,1,0,0][::-1],  # row mirrored
-        [0,1,0,0,0],
-        [1,1,1,1,1],
-    ],
-    "0": [
-        [0,1,1,1,0],
-        [1,0,0,0,1],
-        [1,0,0,0,1][::-1],  # row mirrored
-        [1,0,0,0,1],
-        [0,1,1,1,0],
-    ],
-    "1": [
-        [0,0,1,0,0],
-        [0,1,1,0,0],
-        [0,0,1,0,0][::-1],  # row mirrored
-        [0,0,1,0,0],
-        [0,1,1,1,0],
-    ],
-    "2": [
-        [0,1,1,1,0],
-        [1,0,0,0,1],
-        [0,0,0,0,1][::-1],  # row mirrored
-        [0,0,1,0,0],
-        [1,1,1,1,1],
-    ],
-    "3": [
-        [1,1,1,1,0],
-        [0,0,0,0,1],
-        [0,0,0,0,1][::-1],  # row mirrored
-        [1,0,0,0,1],
-        [0,1,1,1,0],
-    ],
-    "4": [
-        [0,0,1,0,0],
-        [0,1,1,0,0],
-        [1,0,1,0,1][::-1],  # row mirrored
-        [1,1,1,1,1],
-        [0,0,1,0,0],
-    ],
-    "5": [
-        [1,1,1,1,1],
-        [1,0,0,0,0],
-        [1,0,0,0,0][::-1],  # row mirrored
-        [0,0,0,0,1],
-        [1,1,1,1,0],
-    ],
-    "6": [
-        [0,1,1,1,1],
-        [1,0,0,0,0],
-        [1,0,0,0,0][::-1],  # row mirrored
-        [1,0,0,0,1],
-        [0,1,1,1,0],
-    ],
-    "7": [
-        [1,1,1,1,1],
-        [0,0,0,0,1],
-        [0,0,0,0,1][::-1],  # row mirrored
-        [0,0,1,0,0],
-        [0,0,1,0,0],
-    ],
-    "8": [
-        [0,1,1,1,0],
-        [1,0,0,0,1],
-        [1,0,0,0,1][::-1],  # row mirrored
-        [1,0,0,0,1],
-        [0,1,1,1,0],
-    ],
-    "9": [
-        [0,1,1,1,0],
-        [1,0,0,0,1],
-        [0,0,0,0,1][::-1],  # row mirrored
-        [0,0,0,0,1],
-        [0,1,1,1,0],
-    ],
-    "♥": [
-        [1,0,0,0,1],
-        [1,1,0,1,1],
-        [1,1,1,1,1][::-1],  # row mirrored
-        [0,1,1,1,0],
-        [0,0,1,0,0],
-    ],
-    "★": [
-        [0,1,0,1,0],
-        [1,0,1,0,1],
-        [1,0,1,0,1][::-1],  # row mirrored
-        [0,1,1,1,0],
-        [0,0,1,0,0],
-    ],
-    "☀": [
-        [0,1,1,1,0],
-        [1,0,1,0,1],
-        [1,0,1,0,1][::-1],  # row mirrored
-        [1,0,1,0,1],
-        [0,1,1,1,0],
-    ],
-    "☺": [
-        [0,1,1,1,0],
-        [1,0,0,0,1],
-        [0,1,0,1,0][::-1],  # row mirrored
-        [1,1,1,1,1],
-        [0,1,1,1,0],
-    ],
-    "☂": [
-        [0,0,1,0,0],
-        [0,1,1,1,0],
-        [0,1,1,1,0][::-1],  # row mirrored
-        [0,0,1,0,0],
-        [0,1,0,0,0],
-    ],
-}
\ No newline at end of file
+    "A": 0x118FE2E,  # .###. #...# ##### #...# #...#
+    "B": 0x0F8BE2F,  # ####. #...# ####. #...# ####.
+    "C": 0x1E0843E,  # .#### #.... #.... #.... .####
+    "D": 0x0F8C62F,  # ####. #...# #...# #...# ####.
+    "E": 0x1F0BC3F,  # ##### #.... ####. #.... #####
+    "F": 0x010BC3F,  # ##### #.... ####. #.... #....
+    "G": 0x1E8F43E,  # .#### #.... #.### #...# .####
+    "H": 0x118FE31,  # #...# #...# ##### #...# #...#
+    "I": 0x1F2109F,  # ##### ..#.. ..#.. ..#.. #####
+    "J": 0x0E8C218,  # ...## ....# ....# #...# .###.
+    "K": 0x1149D31,  # #...# #..#. ###.. #..#. #...#
+    "L": 0x1F08421,  # #.... #.... #.... #.... #####
+    "M": 0x118D771,  # #...# ##.## #.#.# #...# #...#
+    "N": 0x11CD671,  # #...# ##..# #.#.# #..## #...#
+    "O": 0x0E8C62E,  # .###. #...# #...# #...# .###.
+    "P": 0x010BE2F,  # ####. #...# ####. #.... #....
+    "Q": 0x1EAC62E,  # .###. #...# #...# #.#.# .####
+    "R": 0x114BE2F,  # ####. #...# ####. #..#. #...#
+    "S": 0x0F8383E,  # .#### #.... .###. ....# ####.
+    "T": 0x042109F,  # ##### ..#.. ..#.. ..#.. ..#..
+    "U": 0x0E8C631,  # #...# #...# #...# #...# .###.
+    "V": 0x0454631,  # #...# #...# #...# .#.#. ..#..
+    "W": 0x11DD631,  # #...# #...# #.#.# ##.## #...#
+    "X": 0x1151151,  # #...# .#.#. ..#.. .#.#. #...#
+    "Y": 0x0421151,  # #...# .#.#. ..#.. ..#.. ..#..
+    "Z": 0x1F1111F,  # ##### ...#. ..#.. .#... #####
+    "0": 0x0E8C62E,  # .###. #...# #...# #...# .###.
+    "1": 0x0E210C4,  # ..#.. .##.. ..#.. ..#.. .###.
+    "2": 0x1F2422E,  # .###. #...# ....# ..#.. #####
+    "3": 0x0E8C20F,  # ####. ....# ....# #...# .###.
+    "4": 0x04FD4C4,  # ..#.. .##.. #.#.# ##### ..#..
+    "5": 0x0F8043F,  # ##### #.... #.... ....# ####.
+    "6": 0x0E8843E,  # .#### #.... #.... #...# .###.
+    "7": 0x042421F,  # ##### ....# ....# ..#.. ..#..
+    "8": 0x0E8C62E,  # .###. #...# #...# #...# .###.
+    "9": 0x0E8422E,  # .###. #...# ....# ....# .###.
+    "♥": 0x0477F71,  # #...# ##.## ##### .###. ..#..
+    "★": 0x04756AA,  # .#.#. #.#.# #.#.# .###. ..#..
+    "☀": 0x0EAD6AE,  # .###. #.#.# #.#.# #.#.# .###.
+    "☺": 0x0EFAA2E,  # .###. #...# .#.#. ##### .###.
+    "☂": 0x02239C4,  # ..#.. .###. .###. ..#.. .#...
+    " ": 0x0000000,  # ..... ..... ..... ..... .....
+    "-": 0x0003800,  # ..... ..... .###. ..... .....
+}
+
+
+def lit(glyph, row, col):
+    """
+    Returns 1 if the pixel at (row, col) of a packed glyph is lit, else 0.
+    """
+    return (glyph >> (row * 5 + col)) & 1
+
+
+def decode(glyph):
+    """
+    Expand a packed glyph to a 5x5 list of 0/1 rows.
+    """
+    return [[lit(glyph, row, col) for col in range(5)] for row in range(5)]
@@ -1,11 +1,12 @@
-import ujson
-from machine import Pin, Timer
-import time
+# Startup imports only what the first frame needs; the WiFi and network
+# modules are imported once the connecting animation is lit.
+import profiler
+profiler.mark("main.py")
+from machine import Pin
 import neopixel
-import requests as urequests
 import uasyncio as asyncio
-from wifi_manager import WifiManager
-from settings_manager import load_settings, save_settings
+import time
+from settings_manager import get_settings
 from routines import (
     update_brightness,
     flashing_routine,
@@ -13,76 +14,89 @@ from routines import (
     fade_routine,
     skate_routine,
     skate_rng_routine,
-    goal_routine,
+    marquee_routine,
+    goal_frames,
     reset_brightness,
     wifi_connected_routine,
     wifi_connecting_routine
 )
-from wifi_functions import setup_wifi, reset_wifi
-from api_nhl import team_info_update
-import globals
+from celebration import GoalOverlay
+from buttons import ButtonEvents, LONG, DOUBLE
+from score_state import ScoreState
+from scoreboard import ScoreBoard
+from power import PowerManager
+import heap
+from palette import load_palettes
+import frame_cache
 from letters import letters_5x5
+profiler.mark("imports")
 
 # ---------------- Settings ----------------
-settings = load_settings()
+settings = get_settings()
 colour = settings['colour']
 colour_routine = settings['colour_routine']
 brightness = settings['brightness']
 MAX_COLOUR = settings['MAX_COLOUR']
 num_pixels = settings['NUM_PIXELS']
 skate_pixels = settings['SKATE_PIXELS']
-word = settings['WORD']
+word = settings['WORD'].upper()
 myTeam = settings['MYTEAM']
 url = settings['url']
 myVersion = settings.get('myVersion', 1)
+score_ms = settings.get('SCORE_SECONDS', 5) * 1000
+word_ms = settings.get('SCORE_INTERVAL', 30) * 1000
+profiler.enable(settings.get('PROFILE', False))
+profiler.mark("settings")
 
 # ---------------- Button config ----------------
 BUTTON_PINS = [7, 8, 9]  # 7=brightness/reset, 8=colour, 9=colour routine
 LONG_PRESS_MS = 5000
 
-buttons = [Pin(pin, Pin.IN, Pin.PULL_UP) for pin in BUTTON_PINS]
+buttons = ButtonEvents(
+    [Pin(pin, Pin.IN, Pin.PULL_UP) for pin in BUTTON_PINS],
+    debounce_ms=settings.get('DEBOUNCE_MS', 50),
+    double_ms=settings.get('DOUBLE_PRESS_INTERVAL', 500),
+    long_ms=LONG_PRESS_MS,
+    long_press=(0,),                                   # Hold brightness to reset WiFi
+    double_press=(0,) if profiler.enabled else (),     # Double-tap brightness to dump profiler stats
+)
 
 # ---------------- NeoPixel setup ----------------
 pin_np = Pin(6, Pin.OUT)
 np = neopixel.NeoPixel(pin_np, num_pixels)
+renderer = None
+if settings.get('RENDER_THREAD', False):
+    # Routines draw into np's buffer; a thread pushes finished frames
+    from render_thread import RenderThread
+    renderer = RenderThread(np, neopixel.NeoPixel(pin_np, num_pixels), settings.get('RENDER_FPS', 50))
+    renderer.start()
+profiler.instrument_strip(np)
 
 # ---------------- Globals ----------------
+ROUTINE_COUNT = 6  # flashing, fill, skate, skate_rng, fade, marquee
+SCORE_STATES = ("LIVE", "CRIT")  # Game states that alternate the word with the score
 lettersx4 = 0
-colour_idx = 1
+colour_idx = -1  # Index into the palette's word colours (-1 = before the first)
 colour_idx_skate = -1
 colour_idx_letters = -1
 colour_b = False
 colour_b_skate = False
 colour_b_letters = False
-fade = brightness
+marquee_offset = -1
+fade = 0  # Position in the fade cycle
 restart_flag = asyncio.Event()
+score_state = ScoreState()  # Published by the score poller, consumed by the goal overlay
 wm = None
+showing_score = False
+phase_start = 0  # ticks_ms when the current word/score phase began
 
-# ---------------- Load Colors ----------------
-def load_colors(filename='colors.txt'):
-    """
-    Load RGB color definitions from a text file.
+# ---------------- Colour palettes ----------------
+palettes = load_palettes()  # One Palette per colour mode
 
-    Returns:
-        dict: Mapping of color names to (R, G, B) tuples.
-    """
-    loaded_colors = {}
-    with open(filename, 'r') as f:
-        for line in f:
-            name, values = line.strip().split(':')
-            loaded_colors[name] = list(map(int, values.split(',')))
-    return loaded_colors
-
-loaded_colors = load_colors()
-
-# Color palettes for different routines
-iModeColours = [
-    [loaded_colors.get("OFF"), loaded_colors.get("WHITE"), loaded_colors.get("RED"), loaded_colors.get("BLUE"), loaded_colors.get("WHITE")] + [(-1,-1,-1)]*4,
-    [loaded_colors.get("OFF"), loaded_colors.get("WHITE"), loaded_colors.get("RED"), loaded_colors.get("ORANGE"),
-     loaded_colors.get("YELLOW"), loaded_colors.get("GREEN"), loaded_colors.get("BLUE"), loaded_colors.get("VIOLET"), (-1,-1,-1)],
-    [loaded_colors.get("OFF"), loaded_colors.get("WHITE"), loaded_colors.get("LBLUE"), loaded_colors.get("PINK"),
-     loaded_colors.get("WHITE")] + [(-1,-1,-1)]*4
-]
+# Goal celebrations play as an overlay task; the normal routines restart afterwards
+goals = GoalOverlay(np, num_pixels, palettes[0], brightness, on_done=restart_flag.set)
+scoreboard = ScoreBoard(np, num_pixels, skate_pixels, letters_5x5)
+power = PowerManager(score_state, buttons.pins, settings)  # Idle/quiet profiles when no game is on
 
 # ---------------- Reset Routine Variables ----------------
 def reset_routine_vars():
@@ -91,16 +105,18 @@ def reset_routine_vars():
     """
     global colour_idx, colour_b, fade
     global colour_idx_skate, colour_b_skate
-    global colour_idx_letters, colour_b_letters
+    global colour_idx_letters, colour_b_letters, marquee_offset
 
     # Reset routine indexes and flags
-    colour_idx = 1
+    colour_idx = -1
     colour_b = False
-    fade = brightness
+    fade = 0
     colour_idx_skate = -1
     colour_b_skate = False
     colour_idx_letters = -1
     colour_b_letters = False
+    marquee_offset = -1
+    scoreboard.invalidate()
 
     # Clear all LEDs
     for i in range(num_pixels):
@@ -110,7 +126,7 @@ def reset_routine_vars():
 # ---------------- Button Actions ----------------
 def toggle_brightness():
     """
-    Cycle brightness levels and save to settings.
+    Cycle brightness levels and store in settings.
     """
     global brightness
     if brightness <= 0.02745:
@@ -118,8 +134,10 @@ def toggle_brightness():
     else:
         brightness /= 2
     update_brightness(np, brightness)
+    goals.brightness = brightness
+    frame_cache.clear()
+    goal_frames(np, num_pixels, palettes[0], brightness)  # Keep goal frames ready
     settings['brightness'] = brightness
-    save_settings(settings)
 
 def toggle_colour():
     """
@@ -127,8 +145,9 @@ def toggle_colour():
     """
     global colour
     colour = (colour + 1) % MAX_COLOUR
+    frame_cache.clear()
+    goal_frames(np, num_pixels, palettes[0], brightness)  # Keep goal frames ready
     settings['colour'] = colour
-    save_settings(settings)
     if colour_routine in [2, 3]:
         return
     restart_flag.set()  # Reset routines on next loop
@@ -138,53 +157,68 @@ def toggle_colour_routine():
     Cycle color routines and optionally trigger routine reset.
     """
     global colour_routine
-    colour_routine = (colour_routine + 1) % 5
+    colour_routine = (colour_routine + 1) % ROUTINE_COUNT
     settings['colour_routine'] = colour_routine
-    save_settings(settings)
     if colour_routine == 3:
         return
     restart_flag.set()  # Reset routines on next loop
 
-# ---------------- Button Watcher ----------------
-async def watch_button(pin, idx):
+# ---------------- Button Handler ----------------
+async def on_button(idx, kind):
     """
-    Async task to watch a button and handle short/long presses.
+    Handle a debounced button press.
 
     Args:
-        pin (Pin): GPIO pin object.
-        idx (int): Button index.
+        idx (int): Button index (0=brightness/reset, 1=colour, 2=colour routine).
+        kind (int): SHORT, LONG or DOUBLE.
     """
     global wm
-    while True:
-        while pin.value():  # wait for button press
-            await asyncio.sleep_ms(10)
-        press_time = time.ticks_ms()
-        long_press_handled = False
-
-        while not pin.value():
-            # Handle long press for button 0 (reset WiFi)
-            if idx == 0 and time.ticks_diff(time.ticks_ms(), press_time) >= LONG_PRESS_MS:
-                print("Long press detected on pin 7, resetting WiFi...")
-                wm_new, success = await reset_wifi(wm, ap_name=myTeam, ap_password=myTeam)
-                if success:
-                    wm = wm_new
-                    print("WiFi reset complete.")
-                long_press_handled = True
-                while not pin.value():
-                    await asyncio.sleep_ms(10)
-                break
-            await asyncio.sleep_ms(10)
-
-        # Handle short press actions
-        if not long_press_handled:
-            if idx == 0:
-                toggle_brightness()
-            elif idx == 1:
-                toggle_colour()
-            elif idx == 2:
-                toggle_colour_routine()
-
-        await asyncio.sleep_ms(100)
+    power.touch()
+    if kind == LONG:
+        # Long press on button 0 resets WiFi
+        from wifi_functions import reset_wifi
+        print("Long press detected on pin 7, resetting WiFi...")
+        score_state.clear_goals()
+        goals.cancel()
+        wm_new, success = await reset_wifi(wm, ap_name=myTeam, ap_password=myTeam, settings=settings)
+        if success:
+            wm = wm_new
+            print("WiFi reset complete.")
+    elif kind == DOUBLE:
+        profiler.dump()
+        heap.report()
+    elif idx == 0:
+        toggle_brightness()
+    elif idx == 1:
+        toggle_colour()
+    elif idx == 2:
+        toggle_colour_routine()
+
+# ---------------- Live Score Schedule ----------------
+def score_turn():
+    """
+    Decide whether the live score is shown this frame. While a game is
+    LIVE the sign alternates `word_ms` of word animation with `score_ms`
+    of score; otherwise the word animation runs all the time.
+
+    Returns:
+        bool: True while the score should be shown.
+    """
+    global showing_score, phase_start
+    now = time.ticks_ms()
+    if not score_ms or score_state.game_state not in SCORE_STATES:
+        if showing_score:
+            showing_score = False
+            restart_flag.set()  # Redraw the word from scratch
+        return False
+    if time.ticks_diff(now, phase_start) >= (score_ms if showing_score else word_ms):
+        showing_score = not showing_score
+        phase_start = now
+        if showing_score:
+            scoreboard.invalidate()
+        else:
+            restart_flag.set()
+    return showing_score
 
 # ---------------- NeoPixel Routines ----------------
 async def run_color_routines():
@@ -192,34 +226,55 @@ async def run_color_routines():
     Run selected NeoPixel color routine.
     """
     global colour_idx, colour_b, fade, colour_idx_skate, colour_b_skate, colour_idx_letters, colour_b_letters, restart_flag
+    global marquee_offset
+
+    # A power profile change redraws at the new brightness
+    if power.update():
+        restart_flag.set()
+
+    # Alternate with the live score (may flag a restart of the word routine)
+    show_score = score_turn()
 
     # Reset routine variables if flagged
     if restart_flag.is_set():
         reset_routine_vars()
         restart_flag.clear()
 
-    colours = iModeColours[colour]
+    if power.quiet:
+        return  # Sign stays dark
+
+    level = power.brightness(brightness)
+    palette = palettes[colour]
+    profiler.frame_begin()
+
+    if show_score:
+        await scoreboard.show(score_state.score, score_state.opponent, palette, level)
+        return
 
     # Select routine based on colour_routine
     if colour_routine == 0:
         colour_idx = await flashing_routine(np, num_pixels, skate_pixels, lettersx4, letters_5x5, word,
-                                            colours, colour_idx, brightness)
+                                            palette, colour_idx, level)
     elif colour_routine == 1:
         colour_idx, colour_idx_letters, colour_b_letters = await fill_routine(
             np, num_pixels, skate_pixels, lettersx4, letters_5x5, word,
-            colours, colour_idx, colour_idx_letters, colour_b_letters, brightness)
+            palette, colour_idx, colour_idx_letters, colour_b_letters, level)
     elif colour_routine == 2:
         colour_idx, colour_idx_skate, colour_b_skate, colour_idx_letters, colour_b_letters = await skate_routine(
             np, num_pixels, skate_pixels, lettersx4, letters_5x5, word,
-            colours, colour_idx, colour_idx_skate, colour_b_skate, colour_idx_letters, colour_b_letters, brightness)
+            palette, colour_idx, colour_idx_skate, colour_b_skate, colour_idx_letters, colour_b_letters, level)
     elif colour_routine == 3:
         colour_idx, colour_idx_skate, colour_b_skate, colour_idx_letters, colour_b_letters = await skate_rng_routine(
             np, num_pixels, skate_pixels, lettersx4, letters_5x5, word,
-            colours, colour_idx, colour_idx_skate, colour_b_skate, colour_idx_letters, colour_b_letters, brightness)
+            palette, colour_idx, colour_idx_skate, colour_b_skate, colour_idx_letters, colour_b_letters, level)
     elif colour_routine == 4:
         colour_idx, colour_b, fade = await fade_routine(
             np, num_pixels, skate_pixels, lettersx4, letters_5x5, word,
-            colours, colour_idx, colour_b, brightness, fade)
+            palette, colour_idx, colour_b, level, fade)
+    elif colour_routine == 5:
+        colour_idx, marquee_offset = await marquee_routine(
+            np, num_pixels, skate_pixels, letters_5x5, word,
+            palette, colour_idx, marquee_offset, level)
 
 # ---------------- Main Loop ----------------
 async def main():
@@ -230,16 +285,31 @@ async def main():
     nhl_task = None
 
     # Initial WiFi connecting animation
-    await wifi_connecting_routine(np, num_pixels, skate_pixels, iModeColours[0], brightness)
+    await wifi_connecting_routine(np, num_pixels, skate_pixels, palettes[0], brightness)
+    profiler.mark("first pixel")
+
+    # Deferred until the sign is lit
+    from wifi_functions import setup_wifi
+
+    # Pre-render goal frames so the first celebration starts instantly
+    goal_frames(np, num_pixels, palettes[0], brightness)
+    profiler.mark("goal frames")
 
     # Setup WiFi
     wm, success = await setup_wifi(ap_name="HockeySign", ap_password="HockeySign")
     if not success:
         print("Initial WiFi setup failed, portal should be running.")
-
-    # Start async button watchers
-    for i, b in enumerate(buttons):
-        asyncio.create_task(watch_button(b, i))
+    asyncio.create_task(wm.supervise())  # Reconnect if the link drops later
+    profiler.mark("wifi")
+    profiler.boot_report()
+    heap.report()  # Baseline for the steady-state heap
+
+    # Start the button event consumer and the goal celebration overlay
+    asyncio.create_task(buttons.run(on_button))
+    asyncio.create_task(goals.run(score_state))
+    asyncio.create_task(settings.run())
+    asyncio.create_task(power.run(wm.online))
+    asyncio.create_task(heap.collector())  # gc.collect() in the idle time between frames
 
     wifi_connected_ran = False
 
@@ -247,30 +317,50 @@ async def main():
         try:
             # Run WiFi-connected routine once
             if wm.is_connected() and not wifi_connected_ran:
-                await wifi_connected_routine(np, num_pixels, skate_pixels, iModeColours[colour], brightness)
+                await wifi_connected_routine(np, num_pixels, skate_pixels, palettes[colour], brightness)
                 wifi_connected_ran = True
 
             # Start NHL API polling if WiFi connected
             if nhl_task is None and wifi_connected_ran and wm.is_connected():
                 print("Starting NHL API updates")
-                nhl_task = asyncio.create_task(team_info_update(url, myTeam, myVersion))
-
-            # Run goal animation if score increased
-            if globals.teamscore > globals.previous_score and globals.first_nhl_scores >= 2:
-                await goal_routine(np, num_pixels, iModeColours[0], brightness)
-            globals.previous_score = globals.teamscore
-
-            # Run selected color routines
-            await run_color_routines()
+                import api_nhl
+                poller = lambda: api_nhl.team_info_update(url, myTeam, myVersion, score_state, wm.online)
+                if settings.get('RELAY', False):
+                    # One sign on the LAN polls; the others listen
+                    from relay import Relay
+                    relay = Relay(score_state, myTeam, poller, settings.get('RELAY_GROUP'), settings.get('RELAY_PORT'))
+                    nhl_task = asyncio.create_task(relay.run(
+                        wm.online, lambda: api_nhl.latest_version,
+                        lambda v: api_nhl.check_version(url, v, settings.get('myVersion'), score_state)))
+                else:
+                    nhl_task = asyncio.create_task(poller())
+
+            # Run selected color routines (each sleeps until its next frame),
+            # or sleep until the goal overlay hands the strip back
+            if goals.active:
+                await goals.finished.wait()
+            else:
+                goals.strip_free.clear()  # A goal waits for this step to finish
+                try:
+                    await run_color_routines()
+                finally:
+                    goals.strip_free.set()
+                await power.rest()  # Slower frames or sleep when idle
 
         except Exception as e:
             print(f"[Main] Loop error: {e}")
-        await asyncio.sleep(0)
+            await asyncio.sleep_ms(100)
 
 # ---------------- Start ----------------
 try:
     asyncio.run(main())
 except KeyboardInterrupt:
     print("Program stopped.")
+    if renderer:
+        renderer.stop()
+    settings.flush()
+    if profiler.enabled:
+        profiler.dump()
+        heap.report()
 except Exception as e:
     print(f"Unexpected error: {e}")
\ No newline at end of file
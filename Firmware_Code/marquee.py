@@ -0,0 +1,80 @@
+"""
+Scrolling text.
+
+A message is rasterised once into packed column bitmaps (one byte per
+canvas column, bit y set when row y is lit), followed by a blank gap as
+wide as the sign. Each frame only shifts a window over that buffer, so
+messages of any length scroll without touching the glyphs again.
+"""
+import layout
+from letters import lit
+
+SPACING = 1  # Blank columns between characters
+
+_text = None
+_width = 0
+_columns = None
+
+
+def compile_text(letters_5x5, text, gap):
+    """
+    Rasterise a message into column bitmaps.
+
+    Arguments:
+    - letters_5x5: font (packed glyphs)
+    - text: message; characters missing from the font show as spaces
+    - gap: blank columns appended so the message scrolls fully out
+
+    Returns:
+        bytearray: One byte per column.
+    """
+    size = layout.LETTER_SIZE
+    columns = bytearray((size + SPACING) * len(text) + gap)
+    x = 0
+    for char in text:
+        glyph = letters_5x5.get(char, 0)
+        for col in range(size):
+            bits = 0
+            for row in range(size):
+                bits |= lit(glyph, row, col) << row
+            columns[x + col] = bits
+        x += size + SPACING
+    return columns
+
+
+def columns_for(letters_5x5, text, sign):
+    """
+    Returns the column bitmaps for `text`, compiling them only when the
+    message (or the sign width) changed.
+    """
+    global _text, _width, _columns
+    if text != _text or sign.width != _width:
+        _text = text
+        _width = sign.width
+        _columns = compile_text(letters_5x5, text, sign.width)
+    return _columns
+
+
+def draw(np, sign, columns, offset, colour, off):
+    """
+    Draw the window of `columns` starting at `offset` onto the word rows
+    (wrapping around the end of the buffer; no write).
+
+    Arguments:
+    - np: NeoPixel object
+    - sign: Layout of the sign
+    - columns: column bitmaps from columns_for()
+    - offset: first column shown at the left edge
+    - colour: RGB tuple for lit pixels (already scaled)
+    - off: RGB tuple for unlit pixels
+    """
+    grid = sign.grid
+    width = sign.width
+    length = len(columns)
+    size = layout.LETTER_SIZE
+    for x in range(width):
+        bits = columns[(offset + x) % length]
+        i = x
+        for row in range(size):
+            np[grid[i]] = colour if (bits >> row) & 1 else off
+            i += width
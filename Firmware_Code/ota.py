@@ -0,0 +1,286 @@
+"""
+Over-the-air firmware updates.
+
+When the server reports a newer `latestVersion`, the updater downloads
+the release manifest (file names, sizes and SHA-256 hashes) and fetches
+only the files whose hash differs from the copy on the board. Each file
+streams in small chunks straight to a staging file in `ota/` with a
+running hash, so a download needs only a 512-byte chunk buffer whatever
+the file size. Interrupted downloads resume from the staged bytes with an
+HTTP Range request. Files the server offers gzipped are downloaded
+compressed and inflated locally once verified; releases are compressed
+with a small LZ77 window (`gz_wbits`, 1 KiB from build_ota.py), which is
+all the extra RAM inflating needs.
+
+Nothing replaces the running firmware until every file is staged and
+verified: then a commit journal is written and the board restarts, and
+`ota_apply.apply()` (called from boot.py, before any other module is
+imported) moves the staged files into place. A swap cut short by a power
+loss is finished on the next boot, so the board never runs a mix of
+versions.
+"""
+import ujson
+import hashlib
+import binascii
+import uasyncio as asyncio
+from ota_apply import (STAGING, MANIFEST, COMMIT, exists as _exists, size as _size,
+                       remove as _remove, makedirs as _makedirs, replace as _replace,
+                       clear_staging as _clear_staging, set_version as _set_version)
+
+try:
+    import deflate  # MicroPython 1.21+
+except ImportError:
+    deflate = None
+
+CHUNK = 512                     # Bytes per read/write/hash step
+MAX_MANIFEST = 8192             # Largest manifest accepted
+TIMEOUT_MS = 10000              # Connect, or wait for the next chunk
+ATTEMPTS = 3                    # Tries per update before waiting RETRY_MS
+RETRY_MS = 600000               # Wait after a failed update
+BUSY_STATES = ("PRE", "LIVE", "CRIT")  # Don't restart the board during a game
+MAX_WBITS = 12                  # Largest inflate window accepted (4 KiB); bigger ones stay uncompressed
+
+busy = False  # An update task is running
+
+
+# ---------------- Files ----------------
+def _hexdigest(h):
+    return binascii.hexlify(h.digest()).decode()
+
+
+def file_hash(path, buf=None):
+    """
+    Returns the SHA-256 of a file as hex, or None if it does not exist.
+    """
+    buf = buf or bytearray(CHUNK)
+    mv = memoryview(buf)
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                h.update(mv[:n])
+    except OSError:
+        return None
+    return _hexdigest(h)
+
+
+# ---------------- HTTP ----------------
+async def fetch_manifest(base):
+    """
+    Download and decode the release manifest.
+
+    Args:
+        base (str): Firmware URL prefix, e.g. "http://host:8000/nhl-data/firmware/".
+
+    Returns:
+        dict: {"version": int, "files": [{"name", "size", "sha256",
+              optional "gz_size", "gz_sha256", "gz_wbits"}, ...]}
+    """
+    import http_client  # Network stack only once an update is due
+    resp = await http_client.get(base + "manifest", 0, TIMEOUT_MS)
+    try:
+        if resp.status != 200:
+            raise OSError("manifest: HTTP %d" % resp.status)
+        if resp.length > MAX_MANIFEST:
+            raise OSError("manifest too large")
+        data = bytearray(MAX_MANIFEST)
+        mv = memoryview(data)
+        n = 0
+        while True:
+            if n == MAX_MANIFEST:
+                raise OSError("manifest too large")
+            got = await resp.readinto(mv[n:])
+            if not got:
+                break
+            n += got
+    finally:
+        resp.close()
+    return ujson.loads(bytes(mv[:n]))
+
+
+# ---------------- Download ----------------
+async def download(base, entry, buf):
+    """
+    Stage one file as `ota/<name>.new`, resuming a partial download.
+
+    Args:
+        base (str): Firmware URL prefix.
+        entry (dict): Manifest entry of the file.
+        buf (bytearray): Chunk buffer.
+
+    Raises:
+        OSError: On network errors or a hash mismatch (the partial file
+                 is kept for resuming, unless it is corrupt).
+    """
+    name = entry["name"]
+    wbits = entry.get("gz_wbits", 15)
+    gz = deflate is not None and "gz_sha256" in entry and wbits <= MAX_WBITS
+    size = entry["gz_size"] if gz else entry["size"]
+    digest = entry["gz_sha256"] if gz else entry["sha256"]
+    part = STAGING + "/" + name + (".gz.part" if gz else ".part")
+    _makedirs(part)
+
+    # Resume: hash what is already staged
+    h = hashlib.sha256()
+    mv = memoryview(buf)
+    have = _size(part)
+    if have > size:
+        _remove(part)
+        have = -1
+    if have > 0:
+        with open(part, "rb") as f:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                h.update(mv[:n])
+    have = max(have, 0)
+
+    if have < size:
+        import http_client
+        url = base + "files/" + name + (".gz" if gz else "")
+        resp = await http_client.get(url, have, TIMEOUT_MS)
+        try:
+            if resp.status == 200 and have:
+                # Server ignored the range: start over
+                h = hashlib.sha256()
+                have = 0
+            elif resp.status not in (200, 206):
+                raise OSError("%s: HTTP %d" % (name, resp.status))
+            print(f"[OTA] {name}: {'resuming at ' + str(have) if have else 'downloading'} ({size} B)")
+            with open(part, "ab" if have else "wb") as f:
+                while have < size:
+                    n = await resp.readinto(mv[:min(CHUNK, size - have)])
+                    if not n:
+                        raise OSError(name + ": connection closed")
+                    f.write(mv[:n])
+                    h.update(mv[:n])
+                    have += n
+        finally:
+            resp.close()
+
+    if _hexdigest(h) != digest:
+        _remove(part)
+        raise OSError(name + ": hash mismatch")
+
+    new = STAGING + "/" + name + ".new"
+    if gz:
+        _inflate(part, new, entry["sha256"], wbits, buf)
+        _remove(part)
+    else:
+        _replace(part, new)
+
+
+def _inflate(src, dst, digest, wbits, buf):
+    # Decompress a verified .gz download, checking the result's hash.
+    # The window is allocated at the size the release was compressed with.
+    h = hashlib.sha256()
+    mv = memoryview(buf)
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        stream = deflate.DeflateIO(fin, deflate.GZIP, wbits)
+        while True:
+            n = stream.readinto(buf)
+            if not n:
+                break
+            fout.write(mv[:n])
+            h.update(mv[:n])
+    if _hexdigest(h) != digest:
+        _remove(dst)
+        raise OSError(dst + ": hash mismatch after inflating")
+
+
+# ---------------- Update ----------------
+async def update(base):
+    """
+    Stage every changed file of the current release and write the commit
+    journal. Safe to call again after a failure: finished files are kept
+    and partial ones resume.
+
+    Args:
+        base (str): Firmware URL prefix.
+
+    Returns:
+        int: Version staged, or None if the board is already up to date.
+    """
+    manifest = await fetch_manifest(base)
+    version = manifest["version"]
+    buf = bytearray(CHUNK)
+
+    # Staged files of another release are useless
+    try:
+        with open(MANIFEST) as f:
+            if ujson.load(f).get("version") != version:
+                _clear_staging()
+    except (OSError, ValueError):
+        _clear_staging()
+    _makedirs(MANIFEST)
+    with open(MANIFEST, "w") as f:
+        ujson.dump(manifest, f)
+
+    staged = []
+    for entry in manifest["files"]:
+        name = entry["name"]
+        new = STAGING + "/" + name + ".new"
+        if _exists(new) and file_hash(new, buf) == entry["sha256"]:
+            staged.append(name)  # Staged by an earlier attempt
+        elif file_hash(name, buf) == entry["sha256"]:
+            continue  # Unchanged
+        else:
+            await download(base, entry, buf)
+            staged.append(name)
+
+    if not staged:
+        # Files already match the release: just record its version
+        _clear_staging()
+        _set_version(version)
+        return None
+
+    # Journal last: from here on the swap goes ahead, even across reboots
+    with open(COMMIT + ".tmp", "w") as f:
+        ujson.dump({"version": version, "files": staged}, f)
+    _replace(COMMIT + ".tmp", COMMIT)
+    print(f"[OTA] Version {version} staged ({len(staged)} of {len(manifest['files'])} files changed)")
+    return version
+
+
+async def run(url, state=None):
+    """
+    Stage the latest release, then restart into it once no game is on.
+    Run with asyncio.create_task(); does nothing if an update is already
+    running.
+
+    Args:
+        url (str): Server endpoint URL (the firmware lives under "firmware/").
+        state (ScoreState): Restart is held back while a game is on.
+    """
+    global busy
+    if busy:
+        return
+    busy = True
+    base = url if url.endswith("/") else url + "/"
+    base += "firmware/"
+    try:
+        for attempt in range(ATTEMPTS):
+            try:
+                version = await update(base)
+                break
+            except Exception as e:
+                print(f"[OTA] Update attempt {attempt + 1} failed: {e}")
+                await asyncio.sleep_ms(2000)
+        else:
+            await asyncio.sleep_ms(RETRY_MS)
+            return
+        if version is None:
+            print("[OTA] Already up to date")
+            return
+        while state is not None and state.game_state in BUSY_STATES:
+            await asyncio.sleep(60)
+        print("[OTA] Restarting to install the update")
+        await asyncio.sleep_ms(500)
+        import machine
+        machine.reset()
+    finally:
+        busy = False
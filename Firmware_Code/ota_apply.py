@@ -0,0 +1,111 @@
+"""
+Boot-time half of over-the-air updates.
+
+boot.py calls `apply()` before any other firmware module is imported, so
+the files it swaps in are the ones main.py loads. Only `os` and `ujson`
+are imported here: nothing that a release could replace is in
+`sys.modules` yet, and a normal boot does no more than one failed open().
+The download side lives in ota.py.
+"""
+import os
+import ujson
+
+STAGING = "ota"
+MANIFEST = STAGING + "/manifest.json"
+COMMIT = STAGING + "/commit"    # Journal: present once every file is staged
+
+
+# ---------------- Files ----------------
+def exists(path):
+    try:
+        os.stat(path)
+        return True
+    except OSError:
+        return False
+
+
+def size(path):
+    try:
+        return os.stat(path)[6]
+    except OSError:
+        return -1
+
+
+def remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def makedirs(path):
+    # Create the parent folders of `path` (no os.path on MicroPython)
+    parts = path.split("/")[:-1]
+    for i in range(1, len(parts) + 1):
+        try:
+            os.mkdir("/".join(parts[:i]))
+        except OSError:
+            pass
+
+
+def replace(src, dst):
+    # Rename over an existing file (some filesystems need the remove)
+    try:
+        os.rename(src, dst)
+    except OSError:
+        remove(dst)
+        os.rename(src, dst)
+
+
+def clear_staging():
+    try:
+        names = os.listdir(STAGING)
+    except OSError:
+        return
+    for name in names:
+        path = STAGING + "/" + name
+        if os.stat(path)[0] & 0x4000:  # Folder
+            for sub in os.listdir(path):
+                remove(path + "/" + sub)
+            try:
+                os.rmdir(path)
+            except OSError:
+                pass
+        else:
+            remove(path)
+
+
+def set_version(version):
+    """
+    Record the installed firmware version in the settings.
+    """
+    from settings_manager import get_settings  # Imported after any swap: the new copy
+    settings = get_settings()
+    settings['myVersion'] = version
+    settings.flush()
+
+
+# ---------------- Swap ----------------
+def apply():
+    """
+    Move staged files into place if an update was committed. Call from
+    boot.py before anything else is imported.
+
+    Returns:
+        int: Version installed, or None if there was nothing to apply.
+    """
+    try:
+        with open(COMMIT) as f:
+            journal = ujson.load(f)
+    except (OSError, ValueError):
+        return None
+    for name in journal["files"]:
+        new = STAGING + "/" + name + ".new"
+        if exists(new):
+            makedirs(name)
+            replace(new, name)
+    version = journal["version"]
+    set_version(version)
+    clear_staging()
+    print(f"[OTA] Installed version {version}")
+    return version
@@ -0,0 +1,83 @@
+"""
+Colour palettes.
+
+Each colour mode is compiled once from colors.txt into a Palette: the off
+colour, the skate colour and a dense tuple of the usable word colours,
+with brightness-scaled copies kept ready. Routines pick word colours by
+index modulo `len(palette.words)`, so nothing is scanned or rebuilt per
+frame.
+"""
+from routines import adjust_brightness
+
+# Colour modes cycled by the colour button: (off, skate, word colours)
+MODES = (
+    ("OFF", "WHITE", ("RED", "BLUE", "WHITE")),
+    ("OFF", "WHITE", ("RED", "ORANGE", "YELLOW", "GREEN", "BLUE", "VIOLET")),
+    ("OFF", "WHITE", ("LBLUE", "PINK", "WHITE")),
+)
+
+
+class Palette:
+    """
+    Colours for one colour mode.
+
+    Attributes:
+        off (tuple): Colour of unlit LEDs.
+        skate (tuple): Skate colour.
+        words (tuple): Word colours (never empty).
+        skate_b (tuple): `skate` scaled to `brightness`.
+        words_b (tuple): `words` scaled to `brightness`.
+    """
+
+    def __init__(self, off, skate, words):
+        self.off = tuple(off)
+        self.skate = tuple(skate)
+        self.words = tuple(tuple(c) for c in words) or ((255, 255, 255),)
+        self.brightness = None
+        self.skate_b = self.skate
+        self.words_b = self.words
+
+    def at(self, brightness):
+        """
+        Pre-scale the skate and word colours for `brightness` (only when
+        it changed since the last call).
+
+        Returns:
+            Palette: self, for chaining.
+        """
+        if brightness != self.brightness:
+            self.brightness = brightness
+            self.skate_b = adjust_brightness(self.skate, brightness)
+            self.words_b = tuple(adjust_brightness(c, brightness) for c in self.words)
+        return self
+
+
+def load_colors(filename='colors.txt'):
+    """
+    Load RGB color definitions from a text file.
+
+    Returns:
+        dict: Mapping of color names to (R, G, B) tuples.
+    """
+    loaded_colors = {}
+    with open(filename, 'r') as f:
+        for line in f:
+            name, values = line.strip().split(':')
+            loaded_colors[name] = tuple(map(int, values.split(',')))
+    return loaded_colors
+
+
+def load_palettes(filename='colors.txt'):
+    """
+    Build a Palette for every colour mode in MODES.
+
+    Returns:
+        list: Palettes, indexed by the `colour` setting.
+    """
+    colours = load_colors(filename)
+    white = (255, 255, 255)
+    palettes = []
+    for off, skate, words in MODES:
+        palettes.append(Palette(colours.get(off, (0, 0, 0)), colours.get(skate, white),
+                                [colours[name] for name in words if name in colours]))
+    return palettes
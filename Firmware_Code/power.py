@@ -0,0 +1,180 @@
+"""
+Power management.
+
+While no game is on (OFF or FUT) and nobody has pressed a button for a
+while, the sign drops to an idle profile: dimmer, fewer frames per
+second and a lower CPU clock. During quiet hours it goes dark, and with
+LIGHT_SLEEP enabled the CPU light-sleeps between checks. A button press
+or the next scheduled score poll wakes it immediately.
+"""
+import time
+import machine
+import uasyncio as asyncio
+
+IDLE_AFTER_MS = 60000       # Full profile kept this long after a button press
+SLEEP_SLICE_MS = 200        # Longest light sleep; buttons are checked after each
+QUIET_CHECK_MS = 60000      # Longest quiet wait without light sleep (quiet hours may end)
+CLOCK_RESYNC_MS = 86400000  # Re-sync the clock from NTP once a day
+IDLE_STATES = ("OFF", "FUT")
+
+
+class PowerManager:
+    """
+    Decides between the full, idle and quiet profiles and paces the main
+    loop accordingly.
+
+    Attributes:
+        idle (bool): Idle profile active.
+        quiet (bool): Quiet hours active (sign dark).
+    """
+
+    def __init__(self, state, pins, settings):
+        """
+        Args:
+            state (ScoreState): Game state and next poll time.
+            pins (list): Button pins (active low); pressing one wakes the sign.
+            settings (Settings): QUIET_START/QUIET_END/UTC_OFFSET and the
+                                 IDLE_* / LIGHT_SLEEP power settings.
+        """
+        self.state = state
+        self.pins = pins
+        self.quiet_start = settings.get('QUIET_START', 0)
+        self.quiet_end = settings.get('QUIET_END', 0)
+        self.utc_offset = settings.get('UTC_OFFSET', 0)
+        self.idle_dim = settings.get('IDLE_BRIGHTNESS', 0.5)
+        self.idle_frame_ms = settings.get('IDLE_FRAME_MS', 250)
+        self.idle_freq = settings.get('IDLE_FREQ_MHZ', 80) * 1000000
+        self.light_sleep = settings.get('LIGHT_SLEEP', False)
+        self.full_freq = machine.freq()
+        self.idle = False
+        self.quiet = False
+        self.clock_set = False
+        self._dim_for = -1
+        self._dimmed = 0
+        self._last_touch = time.ticks_ms()
+        self._frame_at = time.ticks_ms()  # When the current frame started
+        self._wake = asyncio.Event()
+
+    # ---------------- Inputs ----------------
+    def touch(self):
+        """
+        Note user activity (a button press) and wake the main loop; its
+        next update() switches back to the full profile and redraws.
+        """
+        self._last_touch = time.ticks_ms()
+        self._wake.set()
+
+    def is_quiet_hour(self):
+        """
+        Returns True if the local time is within the quiet hours (never
+        before the clock has been set).
+        """
+        if not self.clock_set or self.quiet_start == self.quiet_end:
+            return False
+        hour = (time.localtime()[3] + self.utc_offset) % 24
+        if self.quiet_start < self.quiet_end:
+            return self.quiet_start <= hour < self.quiet_end
+        return hour >= self.quiet_start or hour < self.quiet_end  # Over midnight
+
+    def update(self):
+        """
+        Re-evaluate the profile and apply the CPU clock for it.
+
+        Returns:
+            bool: True if the profile changed.
+        """
+        state = self.state
+        idle = (state.fetches > 0 and state.game_state in IDLE_STATES
+                and time.ticks_diff(time.ticks_ms(), self._last_touch) >= IDLE_AFTER_MS)
+        quiet = idle and self.is_quiet_hour()
+        if idle == self.idle and quiet == self.quiet:
+            return False
+        self.idle = idle
+        self.quiet = quiet
+        if self.idle_freq:
+            machine.freq(self.idle_freq if idle else self.full_freq)
+        print(f"[Power] {'Quiet' if quiet else 'Idle' if idle else 'Full'} profile")
+        return True
+
+    def brightness(self, brightness):
+        """
+        Returns the brightness to draw with under the current profile.
+        """
+        if not self.idle:
+            return brightness
+        if brightness != self._dim_for:
+            # Cached: float arithmetic allocates on the board
+            self._dim_for = brightness
+            self._dimmed = brightness * self.idle_dim
+        return self._dimmed
+
+    # ---------------- Pacing ----------------
+    async def rest(self):
+        """
+        Pause between frames: no-op in the full profile, padding each frame
+        out to IDLE_FRAME_MS when idle, and a sleep until the next poll or
+        button press during quiet hours.
+        """
+        await self._pause()
+        self._frame_at = time.ticks_ms()
+
+    async def _pause(self):
+        if not self.idle:
+            return
+        if not self.quiet:
+            # The routine's own sleeps count towards the frame period
+            elapsed = time.ticks_diff(time.ticks_ms(), self._frame_at)
+            if elapsed < self.idle_frame_ms:
+                await self._wait(self.idle_frame_ms - elapsed)
+            return
+        # Quiet: nothing to draw until the next poll is due
+        remaining = time.ticks_diff(self.state.next_poll, time.ticks_ms())
+        if remaining <= 0:
+            await self._wait(self.idle_frame_ms)  # Poll running: let it finish
+            return
+        if self.light_sleep:
+            machine.lightsleep(min(remaining, SLEEP_SLICE_MS))
+            if self._button_down():
+                self.touch()
+            await asyncio.sleep_ms(0)  # Let tasks due after the sleep run
+        else:
+            await self._wait(min(remaining, QUIET_CHECK_MS))
+
+    async def _wait(self, ms):
+        # Sleep, but return early on a button press
+        self._wake.clear()
+        try:
+            await asyncio.wait_for_ms(self._wake.wait(), ms)
+        except asyncio.TimeoutError:
+            pass
+
+    def _button_down(self):
+        # Pin IRQs don't fire during light sleep, so sample the levels
+        for pin in self.pins:
+            if not pin.value():
+                return True
+        return False
+
+    # ---------------- Clock ----------------
+    async def run(self, online):
+        """
+        Keep the clock in sync for quiet hours (only if they are set).
+        Run with asyncio.create_task().
+
+        Args:
+            online (Event): Set while WiFi is connected.
+        """
+        if self.quiet_start == self.quiet_end:
+            return
+        while True:
+            await online.wait()
+            try:
+                import ntptime
+                ntptime.settime()
+                self.clock_set = True
+                print("[Power] Clock synced")
+            except Exception as e:
+                print(f"[Power] Clock sync failed: {e}")
+                await asyncio.sleep(60)
+                continue
+            await asyncio.sleep_ms(CLOCK_RESYNC_MS)
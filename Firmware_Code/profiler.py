@@ -0,0 +1,219 @@
+"""
+Lightweight on-device profiler.
+
+Records timings (in microseconds) for a handful of fixed probes into
+preallocated ring buffers, so recording a sample never allocates:
+  - FRAME:     frame composition (routine step start -> LED write)
+  - LED_WRITE: time spent blocked in np.write()
+  - NET_POLL:  one score poll against the server
+  - SAVE:      one settings save to flash
+  - COLLECT:   one scheduled gc.collect() (see heap.py)
+  - ALLOC:     bytes allocated from one frame to the next (not a time)
+
+It also counts unscheduled garbage collections seen between frames (the
+ones that cause stutters), and keeps a boot
+timeline of named milestones (always on, so time-to-first-pixel can be
+tracked without enabling profiling).
+
+Dump the summary over serial with `profiler.dump()`, or enable the
+PROFILE setting to attach it to each server poll.
+"""
+import time
+import gc
+from array import array
+
+# ---------------- Probes ----------------
+FRAME = 0
+LED_WRITE = 1
+NET_POLL = 2
+SAVE = 3
+COLLECT = 4
+ALLOC = 5
+
+NAMES = ("frame", "np.write", "poll", "save", "collect", "alloc B")
+SLOTS = len(NAMES)
+SAMPLES = 32  # Ring buffer length per probe
+
+# ---------------- State ----------------
+enabled = False
+_samples = array('l', [0] * (SLOTS * SAMPLES))
+_count = array('l', [0] * SLOTS)  # Total samples recorded per probe
+_peak = array('l', [0] * SLOTS)   # All-time maximum per probe
+_frame_t0 = -1
+_last_alloc = 0
+gc_count = 0
+_marks = []  # Boot timeline: (milestone, ticks_ms since reset)
+
+
+def enable(on=True):
+    """
+    Turn sample recording on or off.
+    """
+    global enabled
+    enabled = on
+
+
+def reset():
+    """
+    Clear all recorded samples and counters.
+    """
+    global gc_count, _frame_t0
+    for i in range(len(_samples)):
+        _samples[i] = 0
+    for i in range(SLOTS):
+        _count[i] = 0
+        _peak[i] = 0
+    gc_count = 0
+    _frame_t0 = -1
+
+
+# ---------------- Recording ----------------
+def record(slot, us):
+    """
+    Store one sample for a probe in its ring buffer.
+
+    Args:
+        slot (int): Probe index (FRAME, LED_WRITE, ...).
+        us (int): Duration in microseconds.
+    """
+    if not enabled:
+        return
+    n = _count[slot]
+    _samples[slot * SAMPLES + n % SAMPLES] = us
+    _count[slot] = n + 1
+    if us > _peak[slot]:
+        _peak[slot] = us
+
+
+def start():
+    """
+    Returns a start timestamp for `stop()`.
+    """
+    return time.ticks_us()
+
+
+def stop(slot, t0):
+    """
+    Record the time elapsed since `t0` against a probe.
+    """
+    record(slot, time.ticks_diff(time.ticks_us(), t0))
+
+
+def frame_begin():
+    """
+    Mark the start of a frame. The frame sample is closed by the next LED
+    write. Also records the bytes allocated since the last frame, and
+    detects garbage collections that ran since then.
+    """
+    global _frame_t0, _last_alloc, gc_count
+    if not enabled:
+        return
+    alloc = gc.mem_alloc()
+    if alloc < _last_alloc:
+        gc_count += 1
+    elif _last_alloc:
+        record(ALLOC, alloc - _last_alloc)
+    _last_alloc = alloc
+    _frame_t0 = time.ticks_us()
+
+
+def instrument_strip(np):
+    """
+    Wrap np.write() so each write is timed and closes the current frame.
+
+    Args:
+        np (NeoPixel): Strip to instrument.
+    """
+    write = np.write
+
+    def timed_write():
+        global _frame_t0
+        if not enabled:
+            write()
+            return
+        t0 = time.ticks_us()
+        if _frame_t0 >= 0:
+            record(FRAME, time.ticks_diff(t0, _frame_t0))
+            _frame_t0 = -1
+        write()
+        record(LED_WRITE, time.ticks_diff(time.ticks_us(), t0))
+
+    np.write = timed_write
+
+
+def collected():
+    """
+    Note a scheduled gc.collect(), so the next frame neither counts it as
+    an unscheduled collection nor records its freed bytes.
+    """
+    global _last_alloc
+    _last_alloc = gc.mem_alloc() if enabled else 0
+
+
+# ---------------- Boot timeline ----------------
+def mark(name):
+    """
+    Record a boot milestone at the current time since reset.
+
+    Args:
+        name (str): Milestone, e.g. "first pixel".
+    """
+    _marks.append((name, time.ticks_ms()))
+
+
+def boot_report():
+    """
+    Print the boot timeline over serial.
+    """
+    prev = 0
+    for name, t in _marks:
+        print("[Boot] {:>6} ms (+{:>5})  {}".format(t, t - prev, name))
+        prev = t
+
+
+# ---------------- Reporting ----------------
+def stats(slot):
+    """
+    Summarise the samples currently held for a probe.
+
+    Returns:
+        tuple: (count, min_us, avg_us, max_us, peak_us)
+    """
+    n = _count[slot]
+    held = min(n, SAMPLES)
+    if held == 0:
+        return 0, 0, 0, 0, 0
+    base = slot * SAMPLES
+    lo = hi = _samples[base]
+    total = 0
+    for i in range(base, base + held):
+        v = _samples[i]
+        total += v
+        if v < lo:
+            lo = v
+        if v > hi:
+            hi = v
+    return n, lo, total // held, hi, _peak[slot]
+
+
+def summary():
+    """
+    Returns:
+        dict: Probe name -> [count, min, avg, max, peak] (µs), plus "gc"
+              and "boot" (list of [milestone, ms since reset]).
+    """
+    result = {"gc": gc_count, "boot": [list(m) for m in _marks]}
+    for slot in range(SLOTS):
+        result[NAMES[slot]] = list(stats(slot))
+    return result
+
+
+def dump():
+    """
+    Print the profiling summary over serial.
+    """
+    print("[Profiler] probe       count     min     avg     max    peak (us; alloc in bytes)")
+    for slot in range(SLOTS):
+        n, lo, avg, hi, peak = stats(slot)
+        print("[Profiler] {:<10}{:>7}{:>8}{:>8}{:>8}{:>8}".format(NAMES[slot], n, lo, avg, hi, peak))
+    print(f"[Profiler] Unscheduled GC runs seen: {gc_count}, free heap: {gc.mem_free()}")
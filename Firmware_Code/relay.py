@@ -0,0 +1,237 @@
+"""
+LAN relay.
+
+Several signs following the same team on one network share a single
+server poll. One sign, the leader, runs the normal score poller and
+multicasts a compact state packet after every poll (and as a heartbeat
+in between). The others, the followers, publish those packets to their
+ScoreState instead of polling, so goal celebrations start on every sign
+within a few milliseconds of each other.
+
+Election needs no configuration. A follower that hears no leader for
+LEADER_TIMEOUT_MS takes over, waiting a little longer the higher its node
+id (from the chip's MAC address) so the signs don't all claim at once. A
+sign joining later follows the running leader; if two signs lead at once,
+the one with the higher id steps down.
+"""
+import socket
+import struct
+import time
+import machine
+import uasyncio as asyncio
+
+POLL_MS = 50                 # Socket poll period (uasyncio has no UDP streams)
+HEARTBEAT_MS = 5000          # Leader repeats its last state this often
+LEADER_TIMEOUT_MS = 15000    # Followers take over after this long without a leader
+CLAIM_SPREAD_MS = 5000       # Extra wait before claiming, spread by node id
+
+MAGIC = b"LR"
+PROTOCOL = 1
+# Magic, protocol, node id, sequence, state, score, opponent (255 = unknown),
+# seconds until the leader's next poll, latest firmware version; team name follows
+HEADER = "<2sBIHBBBHH"
+HEADER_SIZE = struct.calcsize(HEADER)
+STATES = ("OFF", "FUT", "PRE", "LIVE", "CRIT")
+NO_SCORE = 255
+
+
+def node_id():
+    """
+    Returns this board's relay id (last four bytes of its MAC address).
+    """
+    return int.from_bytes(machine.unique_id()[-4:], "big")
+
+
+def encode(node, seq, game_state, score, opponent, next_poll_s, version, team):
+    """
+    Build a state packet.
+
+    Returns:
+        bytes: Packet (HEADER_SIZE bytes plus the team name).
+    """
+    code = STATES.index(game_state) if game_state in STATES else 0
+    return struct.pack(HEADER, MAGIC, PROTOCOL, node, seq & 0xFFFF, code,
+                       min(score, 254), NO_SCORE if opponent is None else min(opponent, 254),
+                       min(max(next_poll_s, 0), 0xFFFF), version) + team
+
+
+def decode(packet):
+    """
+    Parse a state packet.
+
+    Returns:
+        tuple: (node, seq, game_state, score, opponent, next_poll_s,
+               version, team bytes), or None if it is not a relay packet.
+    """
+    if len(packet) < HEADER_SIZE or packet[:2] != MAGIC:
+        return None
+    magic, protocol, node, seq, code, score, opponent, next_poll_s, version = \
+        struct.unpack(HEADER, packet[:HEADER_SIZE])
+    if protocol != PROTOCOL or code >= len(STATES):
+        return None
+    return (node, seq, STATES[code], score, None if opponent == NO_SCORE else opponent,
+            next_poll_s, version, bytes(packet[HEADER_SIZE:]))
+
+
+class Relay:
+    """
+    Leader election and state sharing for one team on the LAN.
+
+    Attributes:
+        leading (bool): This sign polls the server.
+        leader (int): Node id of the current leader (None until one is heard).
+        received (int): State packets published as a follower.
+        sent (int): Packets sent as leader.
+    """
+
+    def __init__(self, state, team, poller, group, port, node=None):
+        """
+        Args:
+            state (ScoreState): Published to by the poller (leader) or by
+                                the relay (follower).
+            team (str): Team followed; packets for other teams are ignored.
+            poller (callable): Returns the score poller coroutine, e.g.
+                               lambda: team_info_update(url, ...).
+            group (str): Multicast group, e.g. "239.255.76.82".
+            port (int): UDP port.
+            node (int): Relay id (defaults to node_id()).
+        """
+        self.state = state
+        self.team = team.encode()
+        self.poller = poller
+        self.group = group
+        self.port = port
+        self.node = node_id() if node is None else node
+        self.leading = False
+        self.leader = None
+        self.received = 0
+        self.sent = 0
+        self._task = None
+        self._sock = None
+        self._seq = 0
+        self._last_seq = -1
+        self._sent_fetches = -1  # state.fetches when the leader last sent
+        self._sent_at = 0
+        self._heard_at = time.ticks_ms()
+        self._claim_ms = LEADER_TIMEOUT_MS + self.node % CLAIM_SPREAD_MS
+
+    # ---------------- Socket ----------------
+    def _open(self):
+        group = bytes([int(part) for part in self.group.split('.')])
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(('0.0.0.0', self.port))
+        # Join the group on the default interface
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, group + b'\x00\x00\x00\x00')
+        sock.setblocking(False)
+        self._sock = sock
+
+    def _close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _send(self, latest_version):
+        state = self.state
+        next_poll_s = time.ticks_diff(state.next_poll, time.ticks_ms()) // 1000
+        packet = encode(self.node, self._seq, state.game_state, state.score, state.opponent,
+                        next_poll_s, latest_version, self.team)
+        try:
+            self._sock.sendto(packet, (self.group, self.port))
+            self.sent += 1
+        except OSError as e:
+            print("[Relay] Send failed:", e)
+        self._sent_at = time.ticks_ms()
+
+    # ---------------- Roles ----------------
+    def _lead(self):
+        print(f"[Relay] Leading (node {self.node:08x})")
+        self.leading = True
+        self.leader = self.node
+        self._sent_fetches = -1  # Announce at once
+        self._task = asyncio.create_task(self.poller())
+
+    def _follow(self, leader):
+        if self.leading:
+            print(f"[Relay] Node {leader:08x} leads, stepping down")
+            self._task.cancel()
+            self._task = None
+            self.leading = False
+        elif leader != self.leader:
+            print(f"[Relay] Following node {leader:08x}")
+        self.leader = leader
+
+    def _receive(self, packet, on_version):
+        fields = decode(packet)
+        if fields is None:
+            return
+        node, seq, game_state, score, opponent, next_poll_s, version, team = fields
+        if team != self.team or node == self.node:
+            return
+        now = time.ticks_ms()
+        if self.leading and node > self.node:
+            # Two leaders: ours wins, tell the other one now
+            self._sent_at = time.ticks_add(now, -HEARTBEAT_MS)
+            return
+        self._heard_at = now
+        if node != self.leader or self.leading:
+            self._follow(node)
+            self._last_seq = -1
+        if seq != self._last_seq:
+            self._last_seq = seq
+            self.state.publish(game_state, score, opponent)
+            self.state.next_poll = time.ticks_add(now, next_poll_s * 1000 + POLL_MS)  # Power manager wakes for it
+            self.received += 1
+            if version and on_version is not None:
+                on_version(version)
+
+    # ---------------- Task ----------------
+    async def run(self, online, latest_version=None, on_version=None):
+        """
+        Elect a leader and share state until cancelled.
+        Run with asyncio.create_task().
+
+        Args:
+            online (Event): Set while WiFi is connected.
+            latest_version (callable): Returns the latest firmware version
+                                       the server reported (leader side).
+            on_version (callable): Called with the version the leader reported
+                                   (follower side), so followers update too.
+        """
+        size = HEADER_SIZE + 32  # Room for any team name
+        try:
+            while True:
+                if not online.is_set():
+                    self._close()
+                    await online.wait()
+                    self._heard_at = time.ticks_ms()
+                if self._sock is None:
+                    self._open()
+                    print(f"[Relay] Listening on {self.group}:{self.port}")
+
+                # Drain received packets
+                while True:
+                    try:
+                        packet = self._sock.recv(size)
+                    except OSError:
+                        break
+                    self._receive(packet, on_version)
+
+                now = time.ticks_ms()
+                if self.leading:
+                    state = self.state
+                    if state.fetches != self._sent_fetches:
+                        # New poll result: send it right away
+                        self._sent_fetches = state.fetches
+                        self._seq += 1
+                        self._send(latest_version() if latest_version else 0)
+                    elif time.ticks_diff(now, self._sent_at) >= HEARTBEAT_MS:
+                        self._send(latest_version() if latest_version else 0)
+                elif time.ticks_diff(now, self._heard_at) >= self._claim_ms:
+                    self._lead()
+
+                await asyncio.sleep_ms(POLL_MS)
+        finally:
+            if self._task is not None:
+                self._task.cancel()
+            self._close()
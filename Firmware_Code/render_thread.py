@@ -0,0 +1,111 @@
+"""
+Render thread.
+
+Optionally moves the LED output off the uasyncio loop. Routines keep
+drawing into the strip's own buffer (the back buffer) exactly as before;
+np.write() becomes a short copy into the front buffer under a lock, and a
+separate `_thread` pushes the front buffer to the LEDs at a steady frame
+rate. A slow network poll then no longer holds up the strip, and a strip
+write no longer holds up the event loop.
+
+When the routines draw faster than the frame rate only the newest frame
+is shown. `_thread` exists on CPython as well, so the host simulator runs
+this unchanged.
+"""
+import _thread
+import time
+
+
+class RenderThread:
+    """
+    Double-buffered output for a NeoPixel strip.
+
+    Attributes:
+        presented (int): Frames handed over by np.write().
+        pushed (int): Frames written to the LEDs.
+    """
+
+    def __init__(self, np, out, fps=50):
+        """
+        Args:
+            np (NeoPixel): Strip the routines draw on (its buffer is the back buffer).
+            out (NeoPixel): Second strip object on the same pin, used by the
+                            thread to transmit.
+            fps (int): Most frames pushed per second.
+        """
+        self.np = np
+        self.out = out
+        self.period_ms = max(1000 // max(fps, 1), 1)
+        self.front = bytearray(len(np.buf))
+        self.presented = 0
+        self.pushed = 0
+        self._lock = _thread.allocate_lock()
+        self._dirty = False
+        self._running = False
+        self._stopped = True
+        self._write = None
+
+    # ---------------- Asyncio side ----------------
+    def present(self):
+        """
+        Hand the back buffer over as the next frame (replaces np.write()).
+        """
+        with self._lock:
+            self.front[:] = self.np.buf
+            self._dirty = True
+        self.presented += 1
+
+    def start(self):
+        """
+        Route np.write() through the front buffer and start the thread.
+        """
+        if self._running:
+            return
+        self._write = self.np.write
+        self.np.write = self.present
+        self._running = True
+        self._stopped = False
+        _thread.start_new_thread(self._run, ())
+        print(f"[Render] Thread started ({1000 // self.period_ms} fps)")
+
+    def stop(self):
+        """
+        Stop the thread after it pushes any pending frame, and restore
+        direct writes.
+        """
+        if not self._running:
+            return
+        self._running = False
+        while not self._stopped:
+            time.sleep_ms(1)
+        self.np.write = self._write
+
+    # ---------------- Render thread ----------------
+    def _push(self):
+        out = self.out
+        with self._lock:
+            # Take the new frame; the old transmit buffer becomes the front buffer
+            self.front, out.buf = out.buf, self.front
+            self._dirty = False
+        out.write()
+        self.pushed += 1
+
+    def _run(self):
+        next_ms = time.ticks_ms()
+        try:
+            while self._running:
+                if self._dirty:
+                    self._push()
+                next_ms = time.ticks_add(next_ms, self.period_ms)
+                wait = time.ticks_diff(next_ms, time.ticks_ms())
+                if wait > 0:
+                    time.sleep_ms(wait)
+                else:
+                    next_ms = time.ticks_ms()  # Fell behind: don't catch up in a burst
+            if self._dirty:
+                self._push()
+        except Exception as e:
+            print(f"[Render] Thread error: {e}")
+            self._running = False
+            self.np.write = self._write  # Fall back to direct writes
+        self._stopped = True
@@ -1,4 +1,8 @@
 import uasyncio as asyncio
+import frame_cache
+import layout
+import marquee
+from letters import lit
 
 # =========================
 # --- Basic LED Helpers ---
@@ -38,48 +42,170 @@ def reset_brightness(np, brightness):
         np[i] = (int(r / brightness), int(g / brightness), int(b / brightness))
     np.write()
 
+def fill_pixels(np, indexes, r, g, b, offset=0):
+    """
+    Sets the LEDs in `indexes` (shifted by `offset`) to (r, g, b) by
+    writing the strip buffer directly, so no colour tuple is needed.
+    """
+    buf = np.buf
+    bpp = np.bpp
+    ro, go, bo = np.ORDER[0], np.ORDER[1], np.ORDER[2]
+    for i in indexes:
+        j = (i + offset) * bpp
+        buf[j + ro] = r
+        buf[j + go] = g
+        buf[j + bo] = b
+
 
 # =========================
-# --- Matrix Mapping ---
+# --- Letter Drawing ---
 # =========================
 
-def serpentine_index(row, col, width=5, height=5):
+def write_letter(np, sign, letter_index, glyph, colour):
     """
-    Maps a (row, col) coordinate to the physical NeoPixel index 
-    on a serpentine-wired matrix.
+    Writes a 5x5 letter glyph into one letter slot of the sign.
 
-    Assumes:
-    - Bottom row (physical row 0) = row index height-1
-    - Wiring snakes left-right, right-left for odd rows
+    Arguments:
+    - np: NeoPixel object
+    - sign: Layout of the sign
+    - letter_index: letter slot, from the left
+    - glyph: packed 25-bit glyph (see letters.py)
+    - colour: RGB tuple, already scaled for brightness
     """
-    physical_row = height - 1 - row  # bottom row = 0
-    return physical_row * width + col
+    if letter_index >= sign.letters:
+        return
+    grid = sign.grid
+    width = sign.width
+    x0 = letter_index * layout.LETTER_SIZE
+    for row in range(5):
+        base = row * width + x0
+        for col in range(5):
+            np[grid[base + col]] = colour if lit(glyph, row, col) else (0, 0, 0)
+
+
+def word_pixels_bottom_up(sign, letters_5x5, word):
+    """
+    Returns the LED indexes of the word's lit pixels in skate animation
+    order: letter by letter, rows bottom to top, left to right (the
+    middle row right to left).
+    """
+    pixels = []
+    for letter_index, char in enumerate(word):
+        if char not in letters_5x5 or letter_index >= sign.letters:
+            continue
+        glyph = letters_5x5[char]
+        x0 = letter_index * layout.LETTER_SIZE
+        for row in (4, 3, 2, 1, 0):
+            cols = (4, 3, 2, 1, 0) if row == 2 else (0, 1, 2, 3, 4)
+            for col in cols:
+                if lit(glyph, row, col):
+                    pixels.append(sign.index(x0 + col, row))
+    return pixels
 
 
-def write_letter(np, base_index, matrix, colour, brightness, letter_width=5, letter_height=5):
+class WordPixels:
+    """
+    The word's pixels on a sign, compiled once so routines don't rebuild
+    them every frame.
+
+    Attributes:
+        rows (list): Per canvas row, the LED indexes to light (bytes); the
+                     word rows hold its lit pixels, the skate rows all
+                     skate LEDs.
+        order (bytes): Lit pixels in skate animation order.
+        lit (bytes): Lit pixels of every letter.
+        unlit (bytes): Dark pixels of every letter.
     """
-    Writes a 5x5 letter matrix to the NeoPixel strip.
 
-    Arguments:
-    - np: NeoPixel object
-    - base_index: starting index for this letter in the strip
-    - matrix: 5x5 2D array of 0/1 representing the letter
-    - colour: RGB tuple
-    - brightness: float 0-1
-    """
-    for row in range(letter_height):
-        for col in range(letter_width):
-            idx = serpentine_index(row, col, letter_width, letter_height) + base_index
-            if idx >= len(np):
+    def __init__(self, sign, letters_5x5, word):
+        self.sign = sign
+        self.font = letters_5x5
+        self.word = word
+        rows = [[] for _ in range(layout.HEIGHT)]
+        unlit = []
+        for letter_index, char in enumerate(word):
+            if char not in letters_5x5 or letter_index >= sign.letters:
                 continue
-            np[idx] = adjust_brightness(colour, brightness) if matrix[row][col] else (0, 0, 0)
+            glyph = letters_5x5[char]
+            x0 = letter_index * layout.LETTER_SIZE
+            for row in range(5):
+                for col in range(5):
+                    if lit(glyph, row, col):
+                        rows[row].append(sign.index(x0 + col, row))
+                    else:
+                        unlit.append(sign.index(x0 + col, row))
+        self.rows = [bytes(r) for r in rows]
+        self.rows[layout.SKATE_ENDS] = sign.row(layout.SKATE_ENDS)
+        self.rows[layout.SKATE_BLADE] = sign.row(layout.SKATE_BLADE)
+        self.order = bytes(word_pixels_bottom_up(sign, letters_5x5, word))
+        self.lit = bytes([i for r in rows[:5] for i in r])
+        self.unlit = bytes(unlit)
+
+
+_word_pixels = None
+
+
+def word_pixels(sign, letters_5x5, word):
+    """
+    Returns the WordPixels for `word`, compiling them only when the sign,
+    font or word changed.
+    """
+    global _word_pixels
+    word = word or ""
+    wp = _word_pixels
+    if wp is None or wp.sign is not sign or wp.font is not letters_5x5 or wp.word != word:
+        wp = _word_pixels = WordPixels(sign, letters_5x5, word)
+    return wp
 
 
 # =========================
 # --- Flashing Routine ---
 # =========================
 
-async def flashing_routine(np, num_pixels, skate_pixels, lettersx4, letters_5x5, word, colour_array, colour_idx, brightness):
+_flash_inputs = None  # What the cached flash frames were rendered for
+_flash_frames = None  # (on, off) frames per word colour, rendered on first use
+
+
+def flash_frames(np, sign, letters_5x5, word, palette, lettersx4, colour_idx):
+    """
+    Returns the (on, off) frames of the flashing routine for one word
+    colour. Frames are rendered once and kept until the sign, word,
+    palette or brightness changes; the inputs are compared one by one so
+    a cache hit allocates nothing.
+    """
+    global _flash_inputs, _flash_frames
+    k = _flash_inputs
+    if (k is None or k[0] is not sign or k[1] is not palette or k[2] != palette.brightness
+            or k[3] is not letters_5x5 or k[4] != word or k[5] != lettersx4):
+        _flash_inputs = (sign, palette, palette.brightness, letters_5x5, word, lettersx4)
+        _flash_frames = [None] * len(palette.words)
+    frames = _flash_frames[colour_idx]
+    if frames is None:
+        word_colour = palette.words_b[colour_idx]
+
+        def draw_on(np):
+            for i in range(sign.num_pixels):
+                np[i] = palette.off
+
+            # --- Flash skate LEDs ---
+            for i in sign.skate:
+                np[i + lettersx4] = palette.skate_b
+
+            # --- Flash letters ---
+            for letter_index, char in enumerate(word):
+                if char in letters_5x5:
+                    write_letter(np, sign, letter_index, letters_5x5[char], word_colour)
+
+        def draw_off(np):
+            for i in range(sign.num_pixels):
+                np[i] = palette.off
+
+        frames = _flash_frames[colour_idx] = (frame_cache.render(np, draw_on),
+                                              frame_cache.render(np, draw_off))
+    return frames
+
+
+async def flashing_routine(np, num_pixels, skate_pixels, lettersx4, letters_5x5, word, palette, colour_idx, brightness):
     """
     Flashes the skate LEDs and the word letters once.
 
@@ -88,49 +214,27 @@ async def flashing_routine(np, num_pixels, skate_pixels, lettersx4, letters_5x5,
     - num_pixels: total LEDs
     - skate_pixels: number of "skate" LEDs before letters
     - lettersx4: offset index for letters
-    - letters_5x5: dictionary mapping letters to 5x5 matrices
-    - word: string to display
-    - colour_array: array of RGB tuples
-    - colour_idx: current index in colour_array for word
+    - letters_5x5: dictionary mapping letters to packed 5x5 glyphs
+    - word: string to display (upper case)
+    - palette: Palette with the off, skate and word colours
+    - colour_idx: index of the previous word colour in palette.words
     - brightness: scaling factor
     """
 
-    pixels_per_letter = 25  # 5x5 letters
-
-    # Flip serpentine rows 1,2,3
-    def fix_serpentine_row_mirroring(matrix):
-        rows_to_flip = {1, 2, 3}
-        return [list(reversed(row)) if i in rows_to_flip else row for i, row in enumerate(matrix)]
+    sign = layout.for_sign(num_pixels, skate_pixels)
 
     # --- Select colours ---
-    colour_idx += 1
-    if colour_idx < len(colour_array) and colour_array[colour_idx] == (-1, -1, -1):
-        colour_idx = 2
-
-    word_colour = colour_array[colour_idx]
-    skate_colour = colour_array[1]  # always same for skate
+    palette.at(brightness)
+    colour_idx = (colour_idx + 1) % len(palette.words)
 
-    # --- Flash skate LEDs ---
-    for i in range(min(skate_pixels, num_pixels)):
-        np[i + lettersx4] = adjust_brightness(skate_colour, brightness)
+    # --- Both frames are rendered once per word/colour/brightness ---
+    on, off = flash_frames(np, sign, letters_5x5, word or "", palette, lettersx4, colour_idx)
 
-    # --- Flash letters ---
-    word = (word or "").upper()[:5]
-    for letter_index, char in enumerate(word):
-        if char not in letters_5x5:
-            continue
-        matrix = letters_5x5[char]
-        matrix = fix_serpentine_row_mirroring(matrix)
-        base = skate_pixels + letter_index * pixels_per_letter
-        write_letter(np, base, matrix, word_colour, brightness)
-
-    np.write()
+    frame_cache.show(np, on)
     await asyncio.sleep(0.75)
 
     # --- Turn all LEDs off ---
-    for i in range(num_pixels):
-        np[i] = colour_array[0]
-    np.write()
+    frame_cache.show(np, off)
     await asyncio.sleep(0.75)
 
     return colour_idx
@@ -141,7 +245,7 @@ async def flashing_routine(np, num_pixels, skate_pixels, lettersx4, letters_5x5,
 # =========================
 
 async def fill_routine(np, num_pixels, skate_pixels, lettersx4, letters_5x5, word,
-                       colour_array, colour_idx,
+                       palette, colour_idx,
                        colour_idx_letters, colour_b_letters,
                        brightness):
     """
@@ -149,59 +253,35 @@ async def fill_routine(np, num_pixels, skate_pixels, lettersx4, letters_5x5, wor
     Handles forward/backwards cycling of rows.
     """
 
-    pixels_per_letter = 25
-
-    def fix_serpentine_row_mirroring(matrix):
-        rows_to_flip = {1, 2, 3}
-        return [list(reversed(row)) if i in rows_to_flip else row for i, row in enumerate(matrix)]
-
-    if colour_idx < 2:
-        colour_idx = 2
-    word_colour = colour_array[colour_idx]
+    sign = layout.for_sign(num_pixels, skate_pixels)
 
-    word = (word or "").upper()[:5]
-    row_pixels = [[] for _ in range(7)]
+    palette.at(brightness)
+    colour_idx = max(colour_idx, 0) % len(palette.words)
+    word_colour = palette.words_b[colour_idx]
 
-    # Collect indices for each row
-    for letter_index, char in enumerate(word):
-        if char not in letters_5x5:
-            continue
-        matrix = fix_serpentine_row_mirroring(letters_5x5[char])
-        base = skate_pixels + letter_index * pixels_per_letter
-        for row in range(5):
-            for col in range(5):
-                if matrix[row][col]:
-                    idx = base + serpentine_index(row, col, 5, 5)
-                    row_pixels[row].append(idx)
-
-    # Skate rows (fixed)
-    row_pixels[5] = [0, 11]
-    row_pixels[6] = list(range(1, 11))
+    # LED indexes per row: the word's lit pixels, then the skate rows
+    row_pixels = word_pixels(sign, letters_5x5, word).rows
 
     # Animate forward/backward
     if not colour_b_letters:
         colour_idx_letters += 1
         if colour_idx_letters < len(row_pixels):
-            colour = word_colour if colour_idx_letters < 5 else colour_array[1]
+            colour = word_colour if colour_idx_letters < 5 else palette.skate_b
             for idx in row_pixels[colour_idx_letters]:
-                np[idx] = adjust_brightness(colour, brightness)
+                np[idx] = colour
         else:
             colour_b_letters = True
             colour_idx_letters -= 1
     else:
         if colour_idx_letters >= 0:
             for idx in row_pixels[colour_idx_letters]:
-                np[idx] = colour_array[0]
+                np[idx] = palette.off
             colour_idx_letters -= 1
         else:
             colour_b_letters = False
             colour_idx_letters = -1
             # Advance word colour
-            colour_idx += 1
-            while colour_idx < len(colour_array) and (colour_array[colour_idx] == (-1, -1, -1) or colour_idx < 2):
-                colour_idx += 1
-            if colour_idx >= len(colour_array):
-                colour_idx = 2
+            colour_idx = (colour_idx + 1) % len(palette.words)
 
     np.write()
     await asyncio.sleep(0.1)
@@ -212,64 +292,114 @@ async def fill_routine(np, num_pixels, skate_pixels, lettersx4, letters_5x5, wor
 # --- Fade Routine ---
 # =========================
 
-async def fade_routine(np, num_pixels, skate_pixels, lettersx4, letters_5x5, word, colour_array, colour_idx, colour_b, brightness, fade):
+FADE_MIN = 0.007       # Fade turns around below this brightness
+FADE_STEP = 1.2        # Brightness factor per frame
+FADE_MAX_STEPS = 256   # Safety limit on the compiled cycle length
+
+
+class FadeCycle:
     """
-    Gradually fades word and skate LEDs in/out.
-    Handles row mirroring and brightness adjustments.
+    One full fade-out/fade-in cycle, compiled for a palette and
+    brightness by stepping the fade exactly as frame-by-frame float
+    arithmetic would, so routines only index into it.
+
+    Attributes:
+        length (int): Frames in the cycle.
+        stride (int): Bytes per frame in `levels`.
+        levels (bytearray): Per frame, the scaled skate colour then every
+                            scaled word colour (3 bytes each).
+        rising (bytearray): 1 on the frames of the fade-in half.
+        advance (bytearray): 1 on the frame the word colour moves on.
     """
 
-    pixels_per_letter = 25
+    def __init__(self, palette, brightness):
+        self.palette = palette
+        self.brightness = brightness
+        colours = (palette.skate,) + palette.words
+        self.stride = 3 * len(colours)
+        self.levels = bytearray()
+        self.rising = bytearray()
+        self.advance = bytearray()
+        fade = brightness
+        colour_b = False
+        while len(self.rising) < FADE_MAX_STEPS:
+            advance = 0
+            if fade >= FADE_MIN and not colour_b:
+                fade /= FADE_STEP
+                if fade <= FADE_MIN:
+                    advance = 1
+            else:
+                colour_b = True
+                fade *= FADE_STEP
+                if fade >= brightness:
+                    fade = brightness
+                    colour_b = False
+            for colour in colours:
+                self.levels.extend(adjust_brightness(colour, fade))
+            self.rising.append(1 if colour_b else 0)
+            self.advance.append(advance)
+            if fade == brightness and not colour_b:
+                break  # Back at full brightness: the cycle repeats
+        self.length = len(self.rising)
+
+
+_fade_cycle = None
+
+
+def fade_cycle(palette, brightness):
+    """
+    Returns the FadeCycle for a palette and brightness, compiling it only
+    when either changed.
+    """
+    global _fade_cycle
+    fc = _fade_cycle
+    if fc is None or fc.palette is not palette or fc.brightness != brightness:
+        fc = _fade_cycle = FadeCycle(palette, brightness)
+    return fc
 
-    def fix_serpentine_row_mirroring(matrix):
-        rows_to_flip = {1, 2, 3}
-        return [list(reversed(row)) if i in rows_to_flip else row for i, row in enumerate(matrix)]
 
-    if colour_idx < 2:
-        colour_idx = 2
-    while colour_idx >= len(colour_array) or colour_array[colour_idx] == (-1, -1, -1):
-        colour_idx = 2
+async def fade_routine(np, num_pixels, skate_pixels, lettersx4, letters_5x5, word, palette, colour_idx, colour_b, brightness, fade):
+    """
+    Gradually fades word and skate LEDs in/out.
 
-    # Fade logic
-    if fade >= 0.007 and not colour_b:
-        fade /= 1.2
-        if fade <= 0.007:
-            colour_idx += 1
-            if colour_idx >= len(colour_array) or colour_array[colour_idx] == (-1, -1, -1):
-                colour_idx = 2
-    else:
-        colour_b = True
-        fade *= 1.2
-        if fade >= brightness:
-            fade = brightness
-            colour_b = False
+    Arguments:
+    - colour_b: True while fading in
+    - fade: frame position in the fade cycle (0 = start of the fade-out)
+    """
+
+    sign = layout.for_sign(num_pixels, skate_pixels)
+    cycle = fade_cycle(palette, brightness)
+
+    num_colours = len(palette.words)
+    colour_idx = max(colour_idx, 0) % num_colours
+
+    # Fade logic (precompiled)
+    step = fade % cycle.length
+    if cycle.advance[step]:
+        colour_idx = (colour_idx + 1) % num_colours
+    colour_b = cycle.rising[step] == 1
 
     # Skate LEDs
-    skate_colour = colour_array[1]
-    row_top = [0, 11]
-    row_bottom = list(range(1, 11))
-    for i in row_top + row_bottom:
-        if i < num_pixels:
-            np[i + lettersx4] = adjust_brightness(skate_colour, fade)
+    levels = cycle.levels
+    i = step * cycle.stride
+    fill_pixels(np, sign.skate, levels[i], levels[i + 1], levels[i + 2], lettersx4)
 
     # Word letters
-    word = (word or "").upper()[:5]
-    for letter_index, char in enumerate(word):
-        if char not in letters_5x5:
-            continue
-        matrix = fix_serpentine_row_mirroring(letters_5x5[char])
-        base = skate_pixels + letter_index * pixels_per_letter
-        write_letter(np, base, matrix, colour_array[colour_idx], fade)
+    pixels = word_pixels(sign, letters_5x5, word)
+    i += 3 * (colour_idx + 1)
+    fill_pixels(np, pixels.lit, levels[i], levels[i + 1], levels[i + 2])
+    fill_pixels(np, pixels.unlit, 0, 0, 0)
 
     np.write()
     await asyncio.sleep(0.1)
-    return colour_idx, colour_b, fade
+    return colour_idx, colour_b, step + 1
 
 # =========================
 # --- Skate Routine ---
 # =========================
 
 async def skate_routine(np, num_pixels, skate_pixels, lettersx4, letters_5x5, word,
-                        colour_array, colour_idx,
+                        palette, colour_idx,
                         colour_idx_skate, colour_b_skate,
                         colour_idx_letters, colour_b_letters,
                         brightness):
@@ -280,69 +410,48 @@ async def skate_routine(np, num_pixels, skate_pixels, lettersx4, letters_5x5, wo
     Handles row 2 mirroring and cycling of word colours.
     """
 
-    pixels_per_letter = 25  # Each letter is a 5x5 matrix
+    sign = layout.for_sign(num_pixels, skate_pixels)
 
     # Ensure the first word colour is valid
-    if colour_idx < 2:
-        colour_idx = 2
+    palette.at(brightness)
+    colour_idx = max(colour_idx, 0) % len(palette.words)
 
-    skate_colour = colour_array[1]  # colour for skate block
-    word_colour = colour_array[colour_idx]  # colour for letters
+    skate_colour = palette.skate_b  # colour for skate block
+    word_colour = palette.words_b[colour_idx]  # colour for letters
 
     # --- Animate skate block ---
     if not colour_b_skate:
         colour_idx_skate += 1
         if colour_idx_skate < skate_pixels:
-            np[colour_idx_skate] = adjust_brightness(skate_colour, brightness)
+            np[colour_idx_skate] = skate_colour
         elif colour_idx_skate == skate_pixels:
             colour_b_skate = True
     else:
         colour_idx_skate -= 1
         if colour_idx_skate >= 0:
-            np[colour_idx_skate] = colour_array[0]  # turn off LED when moving back
+            np[colour_idx_skate] = palette.off  # turn off LED when moving back
         else:
             colour_b_skate = False
 
-    # --- Build word pixel indices ---
-    word = (word or "").upper()[:5]  # limit to 5 letters
-    word_pixels = []
-
-    for letter_index, char in enumerate(word):
-        if char not in letters_5x5:
-            continue
-        matrix = letters_5x5[char]
-        base = skate_pixels + letter_index * pixels_per_letter
-
-        # Bottom-to-top iteration for correct animation
-        for row in reversed(range(5)):
-            physical_row = 5 - 1 - row
-            right_to_left = physical_row % 2 == 1  # odd rows go right-to-left
-            if row == 2:  # middle row always right-to-left
-                right_to_left = True
-            for col in range(5):
-                mapped_col = 4 - col if right_to_left else col
-                if matrix[row][col]:
-                    global_idx = base + physical_row * 5 + mapped_col
-                    word_pixels.append(global_idx)
+    # --- Word pixel indices (bottom-to-top for correct animation) ---
+    order = word_pixels(sign, letters_5x5, word).order
 
     # --- Animate letters forward/back ---
     if not colour_b_letters:
-        if colour_idx_letters + 1 < len(word_pixels):
+        if colour_idx_letters + 1 < len(order):
             colour_idx_letters += 1
-            np[word_pixels[colour_idx_letters]] = adjust_brightness(word_colour, brightness)
+            np[order[colour_idx_letters]] = word_colour
         else:
             colour_b_letters = True
     else:
         if colour_idx_letters >= 0:
-            np[word_pixels[colour_idx_letters]] = colour_array[0]
+            np[order[colour_idx_letters]] = palette.off
             colour_idx_letters -= 1
         else:
             colour_b_letters = False
             colour_idx_letters = -1
             # Cycle word colour
-            colour_idx += 1
-            if colour_idx < len(colour_array) and colour_array[colour_idx] == (-1, -1, -1):
-                colour_idx = 2
+            colour_idx = (colour_idx + 1) % len(palette.words)
 
     # --- Push updates to the strip ---
     np.write()
@@ -356,7 +465,7 @@ async def skate_routine(np, num_pixels, skate_pixels, lettersx4, letters_5x5, wo
 # =========================
 
 async def skate_rng_routine(np, num_pixels, skate_pixels, lettersx4, letters_5x5, word,
-                            colour_array, colour_idx,
+                            palette, colour_idx,
                             colour_idx_skate, colour_b_skate,
                             colour_idx_letters, colour_b_letters,
                             brightness):
@@ -365,75 +474,52 @@ async def skate_rng_routine(np, num_pixels, skate_pixels, lettersx4, letters_5x5
     Ensures boundaries are respected and skips "off" colours.
     """
 
-    pixels_per_letter = 25
-    if colour_idx < 2:
-        colour_idx = 2
+    sign = layout.for_sign(num_pixels, skate_pixels)
+    palette.at(brightness)
+    colour_idx = max(colour_idx, 0) % len(palette.words)
 
-    skate_colour = colour_array[1]  # skate block colour
+    skate_colour = palette.skate_b  # skate block colour
     base_colour_idx = colour_idx     # starting colour for word LEDs
 
     # --- Animate skate block ---
     if not colour_b_skate:
         colour_idx_skate += 1
         if colour_idx_skate < skate_pixels:
-            np[colour_idx_skate] = adjust_brightness(skate_colour, brightness)
+            np[colour_idx_skate] = skate_colour
         else:
             colour_b_skate = True
     else:
         colour_idx_skate -= 1
         if colour_idx_skate >= 0:
-            np[colour_idx_skate] = colour_array[0]
+            np[colour_idx_skate] = palette.off
         else:
             colour_b_skate = False
 
-    # --- Build word pixel list in physical order ---
-    word = (word or "").upper()[:5]
-    word_pixels = []
-    for letter_index, char in enumerate(word):
-        if char not in letters_5x5:
-            continue
-        matrix = letters_5x5[char]
-        base = skate_pixels + letter_index * pixels_per_letter
-        for row in reversed(range(5)):
-            physical_row = 5 - 1 - row
-            right_to_left = physical_row % 2 == 1
-            if row == 2:  # middle row animates right-to-left
-                right_to_left = True
-            for col in range(5):
-                mapped_col = 4 - col if right_to_left else col
-                if matrix[row][col]:
-                    global_idx = base + physical_row * 5 + mapped_col
-                    word_pixels.append(global_idx)
-
-    # --- Usable colours for letters ---
-    usable_colours = [c for c in colour_array[2:] if c != (-1, -1, -1)]
-    if not usable_colours:
-        usable_colours = [(255, 255, 255)]  # default to white
+    # --- Word pixels in animation order ---
+    order = word_pixels(sign, letters_5x5, word).order
 
+    # --- Word colours, pre-scaled ---
+    usable_colours = palette.words_b
     num_colours = len(usable_colours)
 
     # --- Animate word LEDs one at a time ---
     if not colour_b_letters:  # turning LEDs on
         colour_idx_letters += 1
-        if colour_idx_letters < len(word_pixels):
-            led_colour_idx = (base_colour_idx - 2 + colour_idx_letters) % num_colours
-            np[word_pixels[colour_idx_letters]] = adjust_brightness(usable_colours[led_colour_idx], brightness)
+        if colour_idx_letters < len(order):
+            led_colour_idx = (base_colour_idx + colour_idx_letters) % num_colours
+            np[order[colour_idx_letters]] = usable_colours[led_colour_idx]
         else:
             colour_b_letters = True
             colour_idx_letters -= 1
     else:  # turning LEDs off
         if colour_idx_letters >= 0:
-            np[word_pixels[colour_idx_letters]] = colour_array[0]
+            np[order[colour_idx_letters]] = palette.off
             colour_idx_letters -= 1
         else:
             colour_b_letters = False
             colour_idx_letters = -1
             # Cycle base colour for next sequence
-            colour_idx += 1
-            while colour_idx < len(colour_array) and (colour_array[colour_idx] == (-1, -1, -1) or colour_idx < 2):
-                colour_idx += 1
-            if colour_idx >= len(colour_array):
-                colour_idx = 2
+            colour_idx = (colour_idx + 1) % num_colours
 
     np.write()
     await asyncio.sleep(0.1)
@@ -441,74 +527,123 @@ async def skate_rng_routine(np, num_pixels, skate_pixels, lettersx4, letters_5x5
 
 
 # =========================
-# --- Goal Routine ---
+# --- Marquee Routine ---
 # =========================
 
-def goal_function(np, num_pixels, colours, brightness, led_b_state):
+async def marquee_routine(np, num_pixels, skate_pixels, letters_5x5, word,
+                          palette, colour_idx, offset, brightness):
     """
-    Turns all LEDs on or off during goal celebration.
+    Scrolls the whole word (any length) across the sign one column per
+    frame, with the skate lit. The word colour advances after each pass.
+
+    Arguments:
+    - offset: first message column shown at the left edge (-1 to start
+              with the message entering from the right)
+
+    Returns:
+        tuple: (colour_idx, offset) for the next frame
     """
-    if led_b_state:
-        for i in range(num_pixels):
-            np[i] = adjust_brightness(colours[2], brightness)
-    else:
-        for i in range(num_pixels):
-            np[i] = colours[0]
+    sign = layout.for_sign(num_pixels, skate_pixels)
+    palette.at(brightness)
+    columns = marquee.columns_for(letters_5x5, word or "", sign)
+    length = len(columns)
+
+    if offset < 0:
+        offset = length - sign.width  # Window over the trailing gap
+    colour_idx = max(colour_idx, 0) % len(palette.words)
+
+    for i in sign.skate:
+        np[i] = palette.skate_b
+    marquee.draw(np, sign, columns, offset, palette.words_b[colour_idx], palette.off)
     np.write()
 
+    offset += 1
+    if offset >= length:
+        offset = 0
+    elif offset == length - sign.width:
+        colour_idx = (colour_idx + 1) % len(palette.words)  # Message has scrolled out
+    await asyncio.sleep(0.1)
+    return colour_idx, offset
+
+
+# =========================
+# --- Goal Routine ---
+# =========================
+
+# Goal burst pattern: (LEDs on, seconds held), played twice
+GOAL_SEQUENCE = (
+    (True, 2.5), (False, 0.5),
+    (True, 2.5), (False, 0.5),
+    (True, 0.5), (False, 0.5),
+    (True, 0.5), (False, 0.5),
+    (True, 2.5), (False, 0.5),
+)
+
+
+def goal_function(np, num_pixels, palette, brightness, led_b_state):
+    """
+    Sets all LEDs on or off for a goal celebration frame (no write).
+    Uses the palette's first word colour.
+    """
+    colour = adjust_brightness(palette.words[0], brightness) if led_b_state else palette.off
+    for i in range(num_pixels):
+        np[i] = colour
+
 
-async def goal_routine(np, num_pixels, colours, brightness):
+def goal_frames(np, num_pixels, palette, brightness):
+    """
+    Returns the cached (on, off) goal frames, rendering them on first use.
+    Call ahead of time to have celebrations start instantly.
+    """
+    key = ("goal", num_pixels, palette.off, palette.words[0], brightness)
+    return frame_cache.frames(key, lambda: (
+        frame_cache.render(np, lambda np: goal_function(np, num_pixels, palette, brightness, True)),
+        frame_cache.render(np, lambda np: goal_function(np, num_pixels, palette, brightness, False)),
+    ))
+
+
+async def goal_routine(np, num_pixels, palette, brightness):
     """
     Repeated goal celebration sequence with timed on/off phases.
     """
-    for i in range(2):
-        goal_function(np, num_pixels, colours, brightness, True)
-        await asyncio.sleep(2.5)
-        goal_function(np, num_pixels, colours, brightness, False)
-        await asyncio.sleep(0.5)
-        # repeat multiple bursts
-        goal_function(np, num_pixels, colours, brightness, True)
-        await asyncio.sleep(2.5)
-        goal_function(np, num_pixels, colours, brightness, False)
-        await asyncio.sleep(0.5)
-        goal_function(np, num_pixels, colours, brightness, True)
-        await asyncio.sleep(0.5)
-        goal_function(np, num_pixels, colours, brightness, False)
-        await asyncio.sleep(0.5)
-        goal_function(np, num_pixels, colours, brightness, True)
-        await asyncio.sleep(0.5)
-        goal_function(np, num_pixels, colours, brightness, False)
-        await asyncio.sleep(0.5)
-        goal_function(np, num_pixels, colours, brightness, True)
-        await asyncio.sleep(2.5)
-        goal_function(np, num_pixels, colours, brightness, False)
-        await asyncio.sleep(0.5)
+    on, off = goal_frames(np, num_pixels, palette, brightness)
+    for _ in range(2):
+        for led_on, hold in GOAL_SEQUENCE:
+            frame_cache.show(np, on if led_on else off)
+            await asyncio.sleep(hold)
 
 
 # =========================
 # --- WiFi LED Routines ---
 # =========================
 
-async def wifi_connected_routine(np, num_pixels, skate_pixel, colours, brightness):
+async def wifi_connected_routine(np, num_pixels, skate_pixel, palette, brightness):
     """
     Blink skate LEDs 3 times to indicate WiFi connected.
     """
-    for _ in range(3):
+    def draw(np, colour):
         for i in range(skate_pixel):
-            np[i] = adjust_brightness(colours[1], brightness)
-        np.write()
+            np[i] = colour
+
+    key = ("wifi", skate_pixel, palette.off, palette.skate, brightness)
+    on, off = frame_cache.frames(key, lambda: (
+        frame_cache.render(np, lambda np: draw(np, adjust_brightness(palette.skate, brightness)), 0, skate_pixel),
+        frame_cache.render(np, lambda np: draw(np, palette.off), 0, skate_pixel),  # turn off
+    ))
+
+    for _ in range(3):
+        frame_cache.show(np, on)
         await asyncio.sleep_ms(200)
-        for i in range(skate_pixel):
-            np[i] = colours[0]  # turn off
-        np.write()
+        frame_cache.show(np, off)
         await asyncio.sleep_ms(200)
 
 
-async def wifi_connecting_routine(np, num_pixels, skate_pixel, colours, brightness):
+async def wifi_connecting_routine(np, num_pixels, skate_pixel, palette, brightness):
     """
     Display a progress indicator for connecting WiFi.
     """
+    colour = adjust_brightness(palette.skate, brightness)
     for i in range((skate_pixel - skate_pixel + 1), (skate_pixel - 1)):
-        np[i] = adjust_brightness(colours[1], brightness)
+        np[i] = colour
     np.write()
     await asyncio.sleep(0)
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""
+Shared game state, published by the score poller.
+
+Replaces polling shared globals: `team_info` publishes each fetched
+score here, and consumers await events instead of comparing scores on
+every loop iteration. Goals are queued so every goal is delivered, even
+when several arrive between two celebrations.
+"""
+import uasyncio as asyncio
+from array import array
+
+
+class ScoreState:
+    """
+    Latest game state and score, plus a queue of goal events.
+    """
+
+    QUEUE_SIZE = 8  # Pending goals kept; the oldest is dropped when full
+
+    def __init__(self):
+        self.game_state = "OFF"
+        self.score = 0
+        self.opponent = None  # Opponent score, if the server sends it
+        self.fetches = 0  # Successful fetches so far (the first one sets the baseline)
+        self.next_poll = 0  # ticks_ms when the poller fetches next
+        self._goals = array('i', [0] * self.QUEUE_SIZE)
+        self._head = 0
+        self._count = 0
+        self._goal_event = asyncio.Event()
+
+    # ---------------- Publishing ----------------
+    def publish(self, game_state, score, opponent=None):
+        """
+        Record a fetched game state and score, queueing one goal event per
+        goal scored since the previous fetch.
+
+        Args:
+            game_state (str): PRE, LIVE, CRIT, FUT or OFF.
+            score (int): Current team score.
+            opponent (int): Current opponent score, or None if unknown.
+        """
+        if self.fetches and score > self.score:
+            for s in range(self.score + 1, score + 1):
+                self._push_goal(s)
+        self.score = score
+        self.opponent = opponent
+        self.game_state = game_state
+        self.fetches += 1
+
+    def _push_goal(self, score):
+        if self._count == self.QUEUE_SIZE:
+            self._head = (self._head + 1) % self.QUEUE_SIZE
+            self._count -= 1
+        self._goals[(self._head + self._count) % self.QUEUE_SIZE] = score
+        self._count += 1
+        self._goal_event.set()
+
+    # ---------------- Consuming ----------------
+    def pending_goals(self):
+        """
+        Returns the number of goal events not yet consumed.
+        """
+        return self._count
+
+    def clear_goals(self):
+        """
+        Drop all pending goal events.
+        """
+        self._count = 0
+
+    async def next_goal(self):
+        """
+        Wait for the next goal event.
+
+        Returns:
+            int: Team score after that goal.
+        """
+        while not self._count:
+            self._goal_event.clear()
+            await self._goal_event.wait()
+        score = self._goals[self._head]
+        self._head = (self._head + 1) % self.QUEUE_SIZE
+        self._count -= 1
+        return score
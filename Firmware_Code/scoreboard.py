@@ -0,0 +1,125 @@
+"""
+Live score display.
+
+Shows the game score ("3-2", or just the team's score when the server
+does not send the opponent's) one character per letter cell. The board
+remembers what every cell currently shows, so when the score changes only
+the cells whose character changed are redrawn.
+"""
+import uasyncio as asyncio
+import layout
+from routines import write_letter
+
+FRAME_MS = 200  # How often a score change is picked up while shown
+
+
+def score_text(score, opponent, cells):
+    """
+    Returns the text shown for a score, fitted to the sign.
+
+    Args:
+        score (int): Team score.
+        opponent (int): Opponent score, or None if unknown.
+        cells (int): Letter cells on the sign.
+
+    Returns:
+        str: e.g. "3-2", or "3" when the full score does not fit.
+    """
+    if opponent is not None:
+        text = f"{score}-{opponent}"
+        if len(text) <= cells:
+            return text
+    return str(score)
+
+
+class ScoreBoard:
+    """
+    Draws the score into the letter cells with partial redraws.
+
+    The strip is assumed to still hold the last score drawn until
+    `invalidate()` is called (e.g. after another routine drew over it).
+    """
+
+    def __init__(self, np, num_pixels, skate_pixels, letters_5x5):
+        """
+        Args:
+            np (NeoPixel): Strip to draw on.
+            num_pixels (int): Total LEDs.
+            skate_pixels (int): LEDs in the skate.
+            letters_5x5 (dict): Font (packed glyphs).
+        """
+        self.np = np
+        self.sign = layout.for_sign(num_pixels, skate_pixels)
+        self.letters_5x5 = letters_5x5
+        self._shown = [None] * self.sign.letters  # Character drawn in each cell
+        self._colour = None
+        self._score = None
+        self._opponent = None
+        self._text = ""
+
+    def invalidate(self):
+        """
+        Forget what is on the strip; the next draw repaints everything.
+        """
+        self._colour = None
+
+    def draw(self, text, palette, brightness):
+        """
+        Draw `text` centred on the letter cells, writing only the cells
+        that changed since the last draw.
+
+        Args:
+            text (str): Characters to show (one per cell).
+            palette (Palette): Colours; the first word colour is used.
+            brightness (float): LED brightness.
+
+        Returns:
+            int: Number of cells redrawn (0 if the strip is unchanged).
+        """
+        np = self.np
+        sign = self.sign
+        palette.at(brightness)
+        colour = palette.words_b[0]
+        cells = sign.letters
+        first = max((cells - len(text)) // 2, 0)
+
+        if colour != self._colour:
+            # Full repaint: off colour, skate, and every cell
+            self._colour = colour
+            for i in range(len(np)):
+                np[i] = palette.off
+            for i in sign.skate:
+                np[i] = palette.skate_b
+            for cell in range(cells):
+                self._shown[cell] = None
+
+        redrawn = 0
+        for cell in range(cells):
+            i = cell - first
+            char = text[i] if 0 <= i < len(text) else " "
+            if char != self._shown[cell]:
+                self._shown[cell] = char
+                write_letter(np, sign, cell, self.letters_5x5.get(char, 0), colour)
+                redrawn += 1
+        if redrawn:
+            np.write()
+        return redrawn
+
+    async def show(self, score, opponent, palette, brightness):
+        """
+        Draw the score and wait one frame.
+
+        Args:
+            score (int): Team score.
+            opponent (int): Opponent score, or None if unknown.
+            palette (Palette): Colours.
+            brightness (float): LED brightness.
+        """
+        if score != self._score or opponent != self._opponent:
+            self._score = score
+            self._opponent = opponent
+            self._text = score_text(score, opponent, self.sign.letters)
+        changed = self.draw(self._text, palette, brightness)
+        if 0 < changed < len(self._shown):
+            print(f"[Score] Redrew {changed} cell(s)")
+        await asyncio.sleep_ms(FRAME_MS)
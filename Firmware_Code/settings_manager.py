@@ -1,44 +1,328 @@
 import ujson
 import os
+import struct
+import time
+import uasyncio as asyncio
+import profiler
+
+SETTINGS_FILE = 'settings.json'   # Human-editable copy, imported when it changes
+BINARY_FILE = 'settings.bin'      # Compact copy read at boot
+TEMP_FILE = 'settings.tmp'
+
+MAGIC = b'LRS'
+FORMAT_VERSION = 7
+
+# Every setting: (name, type code, default, format version it was added in).
+# Type codes: B/H = unsigned 8/16-bit int, b = signed 8-bit int, f = float,
+# ? = bool (one byte), s = string (16-bit length prefix).
+# New settings must be appended with the next FORMAT_VERSION; older binary
+# files are migrated by filling the newer fields with their defaults.
+FIELDS = (
+    ('SKATE_PIXELS', 'H', 12, 1),                 # Number of LEDs in the skate section
+    ('NUM_PIXELS', 'H', 114, 1),                  # Total number of LEDs on the strip
+    ('WORD', 's', 'SENS', 1),                     # Word displayed on the sign
+    ('MYTEAM', 's', 'Senators', 1),               # Team identifier
+    ('colour', 'B', 0, 1),                        # Colour mode index
+    ('colour_routine', 'B', 0, 1),                # LED routine index
+    ('brightness', 'f', 1.0, 1),                  # LED brightness (0-1 scale)
+    ('myVersion', 'H', 1, 1),                     # Firmware/software version
+    ('MAX_COLOUR', 'B', 3, 1),                    # Number of selectable colour modes
+    ('url', 's', "http://192.168.2.101:8000/nhl-data/", 1),  # API endpoint
+    ('nhl_api', '?', False, 1),                   # Enable NHL API usage
+    ('DEBOUNCE_MS', 'H', 50, 1),                  # Button debounce in milliseconds
+    ('DOUBLE_PRESS_INTERVAL', 'H', 500, 1),       # Double-press detection interval (ms)
+    ('PROFILE', '?', False, 1),                   # Record and report timings
+    ('SCORE_SECONDS', 'B', 5, 2),                 # Live score shown this long (s); 0 = never
+    ('SCORE_INTERVAL', 'H', 30, 2),               # Word animation time between score displays (s)
+    ('RENDER_THREAD', '?', False, 3),             # Push LED frames from a separate thread
+    ('RENDER_FPS', 'B', 50, 3),                   # Render thread frame rate
+    ('QUIET_START', 'B', 0, 4),                   # Quiet hours start (local hour, 0-23)
+    ('QUIET_END', 'B', 0, 4),                     # Quiet hours end; equal to start = no quiet hours
+    ('UTC_OFFSET', 'b', -5, 4),                   # Local time offset from UTC (hours)
+    ('IDLE_BRIGHTNESS', 'f', 0.5, 4),             # Brightness factor when no game is on
+    ('IDLE_FRAME_MS', 'H', 250, 4),               # Minimum frame period when idle (ms)
+    ('IDLE_FREQ_MHZ', 'H', 80, 4),                # CPU clock when idle; 0 = unchanged
+    ('LIGHT_SLEEP', '?', False, 4),               # Light-sleep the CPU during quiet hours
+    ('OTA', '?', True, 5),                        # Install firmware updates from the server
+    ('NHL_URL', 's', "https://api-web.nhle.com/v1/score/now", 6),  # NHL score feed (fallback)
+    ('FALLBACK_AFTER', 'B', 3, 6),                # Failed server polls before reading NHL_URL; 0 = never
+    ('RELAY', '?', False, 7),                     # Share one server poll between signs on the LAN
+    ('RELAY_GROUP', 's', "239.255.76.82", 7),     # Relay multicast group
+    ('RELAY_PORT', 'H', 5382, 7),                 # Relay UDP port
+)
+
+
+class Settings:
+    """
+    All settings as plain attributes (one slot per field in FIELDS).
+    """
+
+    __slots__ = tuple(f[0] for f in FIELDS) + ('json_stamp',)
+
+    def __init__(self):
+        for name, _, default, _ in FIELDS:
+            setattr(self, name, default)
+        self.json_stamp = (0, 0)  # (size, mtime) of settings.json when last imported
+
+    # ---------------- JSON ----------------
+    def update(self, data):
+        """
+        Set fields from a dict (e.g. parsed settings.json), converting each
+        value to the field's type. Unknown keys are ignored.
+        """
+        for name, code, _, _ in FIELDS:
+            if name not in data:
+                continue
+            value = data[name]
+            if code == 's':
+                value = str(value)
+            elif code == 'f':
+                value = float(value)
+            elif code == '?':
+                value = bool(value)
+            else:
+                value = int(value)
+            setattr(self, name, value)
+        for name in data:
+            if not any(f[0] == name for f in FIELDS):
+                print(f"[Settings] Ignoring unknown setting: {name}")
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: All settings, for JSON export.
+        """
+        return {name: getattr(self, name) for name, _, _, _ in FIELDS}
+
+    # ---------------- Binary ----------------
+    def pack(self):
+        """
+        Returns:
+            bytes: Compact binary representation (current FORMAT_VERSION).
+        """
+        parts = [MAGIC, struct.pack('<BII', FORMAT_VERSION, self.json_stamp[0], self.json_stamp[1])]
+        for name, code, _, _ in FIELDS:
+            value = getattr(self, name)
+            if code == 's':
+                data = value.encode()
+                parts.append(struct.pack('<H', len(data)))
+                parts.append(data)
+            elif code == '?':
+                parts.append(struct.pack('<B', 1 if value else 0))
+            else:
+                parts.append(struct.pack('<' + code, value))
+        return b''.join(parts)
+
+    @classmethod
+    def unpack(cls, data):
+        """
+        Decode a binary settings blob, migrating older format versions.
+
+        Returns:
+            Settings: Decoded settings.
+
+        Raises:
+            ValueError: If the blob is not a settings file this firmware can read.
+        """
+        if data[:3] != MAGIC:
+            raise ValueError("bad magic")
+        version, size, mtime = struct.unpack_from('<BII', data, 3)
+        if version > FORMAT_VERSION:
+            raise ValueError("settings format from newer firmware")
+        settings = cls()
+        settings.json_stamp = (size, mtime)
+        offset = 12
+        for name, code, _, since in FIELDS:
+            if since > version:
+                continue  # Added after this file was written: keep the default
+            if code == 's':
+                n = struct.unpack_from('<H', data, offset)[0]
+                offset += 2
+                value = str(data[offset:offset + n], 'utf-8')
+                offset += n
+            elif code == '?':
+                value = bool(data[offset])
+                offset += 1
+            else:
+                value = struct.unpack_from('<' + code, data, offset)[0]
+                offset += struct.calcsize(code)
+            setattr(settings, name, value)
+        if version < FORMAT_VERSION:
+            print(f"[Settings] Migrated settings from format {version} to {FORMAT_VERSION}")
+        return settings
+
+
+def _json_stamp():
+    """
+    Returns (size, mtime) of settings.json, or None if it does not exist.
+    """
+    try:
+        st = os.stat(SETTINGS_FILE)
+    except OSError:
+        return None
+    return (st[6], st[8])
+
+
+def _write_atomic(filename, data):
+    # Write to a temporary file, then rename it over the old one, so a power
+    # cut mid-write never leaves a corrupt file
+    with open(TEMP_FILE, 'wb') as f:
+        f.write(data)
+    try:
+        os.rename(TEMP_FILE, filename)
+    except OSError:
+        # Filesystems that cannot rename over an existing file
+        try:
+            os.remove(filename)
+        except OSError:
+            pass  # Not there yet: the rename below reports the real error
+        os.rename(TEMP_FILE, filename)
+
+
+def import_json(filename=SETTINGS_FILE):
+    """
+    Load settings from a JSON file.
+
+    Returns:
+        Settings: Defaults overridden by the values found in the file.
+    """
+    settings = Settings()
+    with open(filename, 'r') as f:
+        settings.update(ujson.load(f))
+    return settings
+
+
+def export_json(settings, filename=SETTINGS_FILE):
+    """
+    Write the current settings to a human-readable JSON file.
+    """
+    _write_atomic(filename, ujson.dumps(settings.to_dict()).encode())
+    if filename == SETTINGS_FILE:
+        # Don't re-import our own export on the next boot
+        settings.json_stamp = _json_stamp()
+        save_settings(settings)
+
 
 def load_settings():
     """
-    Load settings from 'settings.json'.
+    Load settings from 'settings.bin', importing 'settings.json' instead
+    when it has been edited since it was last imported.
 
     Returns:
-        dict: A dictionary of settings.
-              If the file is missing or invalid, returns default settings.
+        Settings: Loaded settings.
+                  If no file can be read, returns default settings.
     """
+    stamp = _json_stamp()
+    try:
+        with open(BINARY_FILE, 'rb') as f:
+            settings = Settings.unpack(f.read())
+        if stamp is None or stamp == settings.json_stamp:
+            return settings
+    except (OSError, ValueError) as e:
+        print(f"[Settings] No usable {BINARY_FILE} ({e})")
+
     try:
-        with open('settings.json', 'r') as f:
-            # Load JSON settings from file
-            return ujson.load(f)
+        settings = import_json()
+        settings.json_stamp = stamp
+        print(f"[Settings] Imported {SETTINGS_FILE}")
+        save_settings(settings)
+        return settings
     except (OSError, ValueError):
         # If the file doesn't exist or contains invalid JSON, return defaults
         print("Error loading settings, using defaults.")
-        return {
-            'colour': 0,                   # Default color index
-            'colour_routine': 0,           # Default LED routine index
-            'url': "http://192.168.2.101:8000/nhl-data/",  # Default API endpoint
-            'brightness': 1,               # Default LED brightness (0-1 scale)
-            'nhl_api': False,              # Enable NHL API usage (False = disabled)
-            'DEBOUNCE_MS': 50,             # Button debounce in milliseconds
-            'DOUBLE_PRESS_INTERVAL': 500,  # Double-press detection interval (ms)
-            'MAX_COLOUR': 3,               # Maximum selectable color index
-            'myVersion': 1,                # Firmware/software version
-            'NUM_PIXELS': 114,             # Total number of LEDs on the strip
-            'SKATE_PIXELS': 12,            # Number of LEDs in the skate section
-            'WORD': 'SENS',                # Default word displayed on the sign
-            'MYTEAM': 'Senators'           # Team identifier
-        }
+        return Settings()
+
 
 def save_settings(settings):
     """
-    Save the provided settings dictionary to 'settings.json'.
+    Save the provided settings to 'settings.bin'.
 
     Args:
-        settings (dict): Dictionary containing settings to save.
+        settings (Settings): Settings to save.
+    """
+    t0 = profiler.start()
+    _write_atomic(BINARY_FILE, settings.pack())
+    profiler.stop(profiler.SAVE, t0)
+
+
+class SettingsStore:
+    """
+    Settings held in RAM.
+
+    Changes only mark the store dirty; the `run()` task writes them to
+    flash once no change has happened for `quiet_ms`, so a burst of
+    button presses costs a single write. Call `flush()` before a reset.
+    """
+
+    def __init__(self, settings, quiet_ms=3000):
+        """
+        Args:
+            settings (Settings): Initial settings (from load_settings()).
+            quiet_ms (int): Time without changes before flushing.
+        """
+        self.data = settings
+        self.quiet_ms = quiet_ms
+        self.dirty = False
+        self._changed_at = 0
+        self._wake = asyncio.Event()
+
+    def __getitem__(self, key):
+        return getattr(self.data, key)
+
+    def __setitem__(self, key, value):
+        if getattr(self.data, key) == value:
+            return
+        setattr(self.data, key, value)
+        self.dirty = True
+        self._changed_at = time.ticks_ms()
+        self._wake.set()
+
+    def get(self, key, default=None):
+        return getattr(self.data, key, default)
+
+    def flush(self):
+        """
+        Write pending changes to flash now.
+        """
+        if self.dirty:
+            self.dirty = False
+            save_settings(self.data)
+            print("[Settings] Saved")
+
+    def export(self):
+        """
+        Write the current settings to settings.json for editing.
+        """
+        export_json(self.data)
+        self.dirty = False
+
+    async def run(self):
+        """
+        Flush changes after a quiet period. Run with asyncio.create_task().
+        """
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            while True:
+                left = self.quiet_ms - time.ticks_diff(time.ticks_ms(), self._changed_at)
+                if left <= 0:
+                    break
+                await asyncio.sleep_ms(left)
+            try:
+                self.flush()
+            except OSError as e:
+                self.dirty = True
+                print(f"[Settings] Save failed: {e}")
+
+
+_store = None
+
+
+def get_settings():
+    """
+    Returns the shared SettingsStore, loading settings on first use.
     """
-    with open('settings.json', 'w') as f:
-        # Serialize the dictionary as JSON and write to file
-        ujson.dump(settings, f)
\ No newline at end of file
+    global _store
+    if _store is None:
+        _store = SettingsStore(load_settings())
+    return _store
@@ -0,0 +1,231 @@
+"""
+Direct NHL score feed, used when the LumaRink server is unreachable.
+
+The public score feed lists every game of the day with broadcasts, goal
+scorers and more, far more than fits in RAM. `ScoreScanner` reads it as a
+byte stream and keeps only what the sign needs: the state and both
+scores of the game the configured team plays in. It holds a small key
+stack and one short capture buffer, and the download stops as soon as
+that game has been read.
+"""
+import uasyncio as asyncio
+import http_client
+
+CHUNK = 512          # Bytes read from the socket at a time
+TIMEOUT_MS = 10000   # Connect, or wait for the next chunk
+MAX_DEPTH = 16       # Deepest nesting tracked
+CAPTURE = 32         # Longest key or value kept; longer ones only need skipping
+
+_OUTSIDE = 0
+_STRING = 1
+_LITERAL = 2
+
+_QUOTE = 0x22
+_BACKSLASH = 0x5C
+_LITERAL_END = (0x2C, 0x5D, 0x7D, 0x20, 0x09, 0x0A, 0x0D)  # , ] } and whitespace
+_SIDES = (b"homeTeam", b"awayTeam")
+
+
+class ScoreScanner:
+    """
+    Incremental JSON scanner for the NHL score feed
+    (`{"games": [{"gameState": ..., "homeTeam": {"name": {"default": ...},
+    "score": ...}, "awayTeam": {...}}, ...]}`).
+
+    Attributes:
+        result (tuple): (game_state, team score, opponent score) once the
+                        team's game has been read, else None.
+    """
+
+    def __init__(self, team):
+        """
+        Args:
+            team (str): Team name as in the feed's name.default (e.g. "Senators").
+        """
+        self.team = team.encode()
+        self.result = None
+        self._mode = _OUTSIDE
+        self._escape = False
+        self._depth = 0
+        self._stack = bytearray(MAX_DEPTH)  # '{' or '[' per level
+        self._keys = [None] * MAX_DEPTH      # Current key of each object level
+        self._expect_key = False
+        self._text = bytearray(CAPTURE)
+        self._len = 0                        # Captured length; > CAPTURE = too long
+        self._reset_game()
+
+    def _reset_game(self):
+        self._state = None
+        self._names = [None, None]  # home, away
+        self._scores = [0, 0]
+
+    def _in_game(self):
+        # Inside games[i] (depth 3 or deeper)
+        return (self._depth >= 3 and self._keys[0] == b"games"
+                and self._stack[1] == 0x5B and self._stack[2] == 0x7B)
+
+    def _captured(self):
+        return bytes(self._text[:self._len]) if self._len <= CAPTURE else None
+
+    def _take(self, data, start, end):
+        # Capture data[start:end] (only while it still fits)
+        n = self._len
+        size = end - start
+        if n + size <= CAPTURE:
+            self._text[n:n + size] = data[start:end]
+        self._len = n + size
+
+    def _value(self, text):
+        # A complete string or literal value at the current position
+        depth = self._depth
+        if not self._in_game():
+            return
+        keys = self._keys
+        if depth == 3:
+            if keys[2] == b"gameState":
+                self._state = text
+        elif keys[2] in _SIDES:
+            side = _SIDES.index(keys[2])
+            if depth == 4 and keys[3] == b"score":
+                try:
+                    self._scores[side] = int(text)
+                except (TypeError, ValueError):
+                    pass
+            elif depth == 5 and keys[3] == b"name" and keys[4] == b"default":
+                self._names[side] = text
+
+    def _string_done(self):
+        if self._expect_key:
+            self._keys[self._depth - 1] = self._captured()
+            self._expect_key = False
+        else:
+            self._value(self._captured())
+
+    def _open(self, c):
+        depth = self._depth
+        if depth >= MAX_DEPTH:
+            raise ValueError("feed nested too deeply")
+        self._stack[depth] = c
+        self._keys[depth] = None
+        self._depth = depth + 1
+        self._expect_key = c == 0x7B
+        if self._depth == 3 and self._in_game():
+            self._reset_game()
+
+    def _close(self):
+        if self._depth == 3 and self._in_game():
+            self._game_done()
+        self._depth -= 1
+        self._expect_key = False
+
+    def _game_done(self):
+        names = self._names
+        if self.team not in names:
+            return
+        side = names.index(self.team)
+        state = self._state.decode() if self._state else "OFF"
+        self.result = (state, self._scores[side], self._scores[1 - side])
+
+    def feed(self, data):
+        """
+        Scan the next part of the feed.
+
+        Args:
+            data (bytes): Next bytes of the response body.
+
+        Returns:
+            bool: True once the team's game has been read (stop downloading).
+        """
+        i = 0
+        n = len(data)
+        while i < n:
+            mode = self._mode
+            if mode == _STRING:
+                if self._escape:
+                    # Escaped character: kept as is (no \u decoding needed for team names)
+                    self._escape = False
+                    self._take(data, i, i + 1)
+                    i += 1
+                    continue
+                end = data.find(b'"', i)
+                stop = n if end < 0 else end
+                slash = data.find(b"\\", i, stop)
+                if slash >= 0:
+                    self._take(data, i, slash)
+                    self._escape = True
+                    i = slash + 1
+                    continue
+                self._take(data, i, stop)
+                if end < 0:
+                    return False
+                self._mode = _OUTSIDE
+                i = end + 1
+                self._string_done()
+                continue
+
+            c = data[i]
+            if mode == _LITERAL:
+                if c not in _LITERAL_END:
+                    self._take(data, i, i + 1)
+                    i += 1
+                    continue
+                self._mode = _OUTSIDE
+                self._value(self._captured())
+                # The delimiter itself is handled below
+
+            if c == _QUOTE:
+                self._mode = _STRING
+                self._len = 0
+            elif c == 0x7B or c == 0x5B:  # { [
+                self._open(c)
+            elif c == 0x7D or c == 0x5D:  # } ]
+                self._close()
+                if self.result is not None:
+                    return True
+            elif c == 0x2C:  # ,
+                self._expect_key = self._depth > 0 and self._stack[self._depth - 1] == 0x7B
+            elif c == 0x3A:  # :
+                self._expect_key = False
+            elif c > 0x20:
+                self._mode = _LITERAL
+                self._len = 0
+                self._take(data, i, i + 1)
+            i += 1
+        return False
+
+
+async def fetch_score(url, team):
+    """
+    Read the team's game from the NHL score feed.
+
+    Args:
+        url (str): Score feed URL.
+        team (str): Team name as in the feed.
+
+    Returns:
+        tuple: (game_state, team score, opponent score), or None if the
+               team has no game in the feed.
+
+    Raises:
+        OSError: On network errors or a non-200 response.
+    """
+    scanner = ScoreScanner(team)
+    buf = bytearray(CHUNK)
+    mv = memoryview(buf)
+    read = 0
+    resp = await http_client.get(url, 0, TIMEOUT_MS)
+    try:
+        if resp.status != 200:
+            raise OSError("HTTP %d" % resp.status)
+        while True:
+            n = await resp.readinto(mv)
+            if not n:
+                break
+            read += n
+            if scanner.feed(bytes(mv[:n])):
+                break
+            await asyncio.sleep_ms(0)  # Let the LEDs run between chunks
+    finally:
+        resp.close()
+    print(f"[upstream] Scanned {read} B")
+    return scanner.result
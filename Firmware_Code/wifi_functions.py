@@ -19,7 +19,7 @@ async def setup_wifi(ap_name="WiFiManager", ap_password="wifimanager"):
     print(f"[WiFiFunctions] Setting up WiFi AP: {ap_name}")
 
     # Attempt to connect to known WiFi credentials
-    wm.connect()
+    await wm.connect()
     if wm.is_connected():
         print("[WiFiFunctions] Already connected to WiFi")
         print(f"[WiFiFunctions] Network config: {wm.get_address()}")
@@ -30,7 +30,7 @@ async def setup_wifi(ap_name="WiFiManager", ap_password="wifimanager"):
     asyncio.create_task(wm.web_server())  # Run portal asynchronously
     return wm, False
 
-async def reset_wifi(wm, ap_name="WiFiManager", ap_password="wifimanager"):
+async def reset_wifi(wm, ap_name="WiFiManager", ap_password="wifimanager", settings=None):
     """
     Reset stored WiFi credentials and relaunch AP portal.
 
@@ -38,6 +38,7 @@ async def reset_wifi(wm, ap_name="WiFiManager", ap_password="wifimanager"):
         wm (WifiManager): Current WifiManager instance.
         ap_name (str): SSID for the AP if portal mode is needed.
         ap_password (str): Password for the AP if portal mode is needed.
+        settings (SettingsStore): Flushed to flash before the board restarts.
 
     Returns:
         tuple: (WifiManager instance, bool)
@@ -49,6 +50,8 @@ async def reset_wifi(wm, ap_name="WiFiManager", ap_password="wifimanager"):
         try:
             wm.disconnect()          # Disconnect from current network
             wm.delete_credentials()  # Remove stored WiFi credentials
+            if settings:
+                settings.flush()     # Don't lose pending settings changes
             reset()                  # Restart the board to apply changes
         except Exception as e:
             print(f"[WiFiFunctions] Error during reset: {e}")
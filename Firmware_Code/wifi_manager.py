@@ -1,19 +1,27 @@
 import network
-import socket
-import re
-import time
 import os
 import uasyncio as asyncio
+from captive_dns import dns_server
 
 class WifiManager:
     """
     WiFi Manager for MicroPython devices.
     Handles:
-      - Station mode connections (STA_IF)
+      - Station mode connections (STA_IF), without blocking the event loop
+      - Reconnecting after the link drops (supervise task)
       - Access Point (AP_IF) for captive portal setup
       - Credential storage/retrieval
     """
 
+    CONNECT_TIMEOUT_MS = 5000   # Time allowed per profile
+    CHECK_INTERVAL_MS = 2000    # Link check period while connected
+    MAX_BACKOFF_MS = 60000      # Longest wait between reconnect rounds
+    HTTP_PORT = 80
+    DNS_PORT = 53
+    REQUEST_TIMEOUT_MS = 5000   # Time a portal client gets to send its request
+    MAX_BODY = 512              # Largest form submission accepted
+    STATIC_DIR = 'portal'       # Precompressed static files
+
     def __init__(self, ap_ssid='WiFiManager', ap_password='wifimanager'):
         """
         Initialize WifiManager with AP credentials and internal state.
@@ -31,23 +39,81 @@ class WifiManager:
         self.wlan_ap = network.WLAN(network.AP_IF)
         self.wlan_ap.active(False)
 
+        # Set while the station link is up
+        self.online = asyncio.Event()
+
+        # SSIDs from the last portal scan, strongest first
+        self.networks = []
+        # Signal strength per SSID from the last scan, for ordering profiles
+        self._rssi = {}
+        self._configure_lock = asyncio.Lock()
+
     # ---------------- WiFi Connection Methods ----------------
-    def connect(self):
+    async def connect(self, scan=True):
         """
         Attempt to connect to stored WiFi credentials.
-        Loads saved SSID/password pairs and tries them in order.
+        Tries saved profiles, most recently successful first.
+
+        Args:
+            scan (bool): Rescan to order the other profiles (blocks for a
+                         few seconds); otherwise the last scan is used.
+
+        Returns:
+            bool: True if connected.
         """
         if self.wlan_sta.isconnected():
             print("[WiFiManager] Already connected.")
-            return
+            self.online.set()
+            return True
 
-        profiles = self.read_credentials()
-        print(f"[WiFiManager] Loaded profiles: {profiles}")
+        profiles = self.ordered_profiles(scan)
+        print(f"[WiFiManager] Loaded profiles: {[ssid for ssid, _ in profiles]}")
 
-        for ssid, password in profiles.items():
-            if self.wifi_connect(ssid, password):
-                return
+        for ssid, password in profiles:
+            if await self.wifi_connect(ssid, password):
+                return True
         print("[WiFiManager] No working credentials found.")
+        return False
+
+    def ordered_profiles(self, scan=True):
+        """
+        Returns saved (ssid, password) pairs in the order to try them.
+
+        The file keeps the last successful network first. With several
+        profiles saved, the rest are ordered by signal strength from a scan
+        (a new one if `scan`, else the last one); networks not seen go last.
+        """
+        profiles = self.read_profiles()
+        if len(profiles) < 2:
+            return profiles
+        if scan:
+            try:
+                self.scan()
+            except OSError:
+                pass
+        rssi = self._rssi
+        rest = profiles[1:]
+        rest.sort(key=lambda p: rssi.get(p[0], -200), reverse=True)
+        return profiles[:1] + rest
+
+    def scan(self):
+        """
+        Scan for access points (blocks for a few seconds). The result is
+        kept for ordering profiles on later reconnects.
+
+        Returns:
+            list: (ssid, rssi) tuples, one per SSID (strongest access point),
+                  strongest first. Hidden networks are left out.
+        """
+        best = {}
+        for net in self.wlan_sta.scan():
+            ssid = net[0].decode()
+            if ssid and net[3] > best.get(ssid, -200):
+                best[ssid] = net[3]
+        self._rssi = best
+        found = list(best.items())
+        found.sort(key=lambda n: n[1], reverse=True)
+        return found
 
     def disconnect(self):
         """
@@ -71,28 +137,38 @@ class WifiManager:
     # ---------------- Credential Storage ----------------
     def write_credentials(self, ssid, password):
         """
-        Save a WiFi SSID/password pair to the local file.
+        Save a WiFi SSID/password pair to the local file, as the first
+        (most recently successful) profile.
         """
         try:
-            profiles = self.read_credentials()
-            profiles[ssid] = password
+            profiles = self.read_profiles()
+            if profiles and profiles[0] == (ssid, password):
+                return  # Already first: skip the flash write
+            profiles = [(ssid, password)] + [p for p in profiles if p[0] != ssid]
             with open(self.wifi_credentials, 'w') as file:
-                for s, p in profiles.items():
+                for s, p in profiles:
                     file.write(f'{s};{p}\n')
             print(f"[WiFiManager] Credentials saved for {ssid}.")
         except Exception as e:
             print(f"[WiFiManager] Failed to write credentials: {e}")
 
-    def read_credentials(self):
+    def read_profiles(self):
         """
-        Read saved WiFi credentials from file.
-        Returns a dictionary {ssid: password}.
+        Read saved WiFi credentials from file, in file order.
+        Returns a list of (ssid, password) tuples.
         """
         try:
             with open(self.wifi_credentials) as file:
-                return dict(line.strip().split(';') for line in file if ';' in line)
+                return [tuple(line.strip().split(';', 1)) for line in file if ';' in line]
         except OSError:
-            return {}
+            return []
+
+    def read_credentials(self):
+        """
+        Read saved WiFi credentials from file.
+        Returns a dictionary {ssid: password}.
+        """
+        return dict(self.read_profiles())
 
     def delete_credentials(self):
         """
@@ -105,121 +181,273 @@ class WifiManager:
             print("[WiFiManager] No WiFi credentials file found.")
 
     # ---------------- Connection Helper ----------------
-    def wifi_connect(self, ssid, password):
+    async def wifi_connect(self, ssid, password):
         """
         Attempt to connect to a specific SSID with password.
-        Returns True if successful.
+        Yields to the event loop while waiting. Returns True if successful.
         """
         print(f"[WiFiManager] Trying to connect to: {ssid}")
         self.wlan_sta.connect(ssid, password)
-        for _ in range(50):  # Retry for ~5 seconds
+        for _ in range(self.CONNECT_TIMEOUT_MS // 100):
             if self.wlan_sta.isconnected():
                 ip = self.wlan_sta.ifconfig()[0]
                 print(f"[WiFiManager] Connected to {ssid}. IP: {ip}")
+                self.write_credentials(ssid, password)  # Remember as last successful
+                self.online.set()
                 return True
-            time.sleep_ms(100)
+            await asyncio.sleep_ms(100)
         print(f"[WiFiManager] Connection to {ssid} failed.")
         self.wlan_sta.disconnect()
         return False
 
+    # ---------------- Link Supervisor ----------------
+    async def supervise(self):
+        """
+        Watch the station link and reconnect with exponential backoff when
+        it drops. `online` is cleared while the link is down.
+        Run with asyncio.create_task().
+        """
+        backoff = 1000
+        while True:
+            if self.wlan_sta.isconnected():
+                self.online.set()
+                backoff = 1000
+                await asyncio.sleep_ms(self.CHECK_INTERVAL_MS)
+                continue
+
+            if self.online.is_set():
+                print("[WiFiManager] Link lost, reconnecting...")
+                self.online.clear()
+
+            if self.wlan_ap.active() or not self.read_profiles():
+                # Captive portal is handling setup
+                await asyncio.sleep_ms(self.CHECK_INTERVAL_MS)
+                continue
+
+            # No scan: it would stall the event loop every round
+            if await self.connect(scan=False):
+                print("[WiFiManager] Reconnected.")
+                continue
+            print(f"[WiFiManager] Reconnect failed, retrying in {backoff // 1000}s")
+            await asyncio.sleep_ms(backoff)
+            backoff = min(backoff * 2, self.MAX_BACKOFF_MS)
+
     # ---------------- Captive Portal ----------------
+    def refresh_networks(self):
+        """
+        Rescan `networks` for the portal form. The scan blocks the event
+        loop for a few seconds, so it runs only before the access point
+        comes up, after a failed connection attempt and when the user
+        asks for it (/rescan); page loads are served from the list.
+        """
+        try:
+            self.networks = [ssid for ssid, _ in self.scan()]
+        except OSError as e:
+            print("[WiFiManager] Scan failed:", e)
+
     async def web_server(self):
         """
         Start a captive portal for WiFi configuration.
-        Runs asynchronously using uasyncio.
+        Serves several clients at once (phones open many sockets) and
+        answers DNS lookups with the portal address. Runs until the
+        station connects.
         """
         self.wlan_ap.active(False)
+        self.refresh_networks()  # Before any client is connected
         await asyncio.sleep_ms(100)
         self.wlan_ap.active(True)
         self.wlan_ap.config(essid=self.ap_ssid, password=self.ap_password, authmode=self.ap_authmode)
+        ip = self.wlan_ap.ifconfig()[0]
 
-        server_socket = socket.socket()
-        server_socket.setblocking(False)
+        dns = asyncio.create_task(dns_server(ip, self.DNS_PORT))
+        server = None
         try:
-            server_socket.bind(('', 80))
-            server_socket.listen(1)
-            print(f"[WiFiManager] Captive portal started at 192.168.4.1")
-
+            server = await asyncio.start_server(self._serve_client, '0.0.0.0', self.HTTP_PORT, backlog=4)
+            print(f"[WiFiManager] Captive portal started at {ip}")
             while not self.wlan_sta.isconnected():
-                try:
-                    conn, addr = server_socket.accept()
-                except OSError:
-                    await asyncio.sleep(0.1)
-                    continue
-
-                try:
-                    conn.settimeout(2.0)
-                    request = conn.recv(1024).decode()
-                    networks = [net[0].decode() for net in self.wlan_sta.scan()]
-                    if request and 'POST /' in request:
-                        self.handle_configure(conn, request, networks)
-                    else:
-                        conn.send(self.get_html(ssids=networks))
-                except Exception as e:
-                    print("[WiFiManager] Socket error:", e)
-                finally:
-                    conn.close()
-
-                await asyncio.sleep(0)
-
+                await asyncio.sleep_ms(500)
         finally:
-            try:
-                server_socket.close()
-            except Exception:
-                pass
+            dns.cancel()
+            if server is not None:
+                server.close()
+                await server.wait_closed()
             self.wlan_ap.active(False)
             await asyncio.sleep_ms(100)
             print("[WiFiManager] Captive portal closed")
 
-    def handle_configure(self, conn, request, networks):
+    async def _read_request(self, reader):
+        """
+        Read one HTTP request, however the client splits it across packets.
+
+        Returns:
+            tuple: (method, path, body) as strings.
+        """
+        line = await reader.readline()
+        parts = line.decode().split()
+        if len(parts) < 2:
+            raise ValueError("bad request line")
+        length = 0
+        while True:
+            line = await reader.readline()
+            if not line or line == b"\r\n":
+                break
+            if line[:15].lower() == b"content-length:":
+                length = int(line[15:])
+        if length > self.MAX_BODY:
+            raise ValueError("request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return parts[0], parts[1], body.decode()
+
+    async def _serve_client(self, reader, writer):
+        try:
+            method, path, body = await asyncio.wait_for_ms(
+                self._read_request(reader), self.REQUEST_TIMEOUT_MS)
+            if method == "POST":
+                await self.handle_configure(writer, body)
+            elif path == "/":
+                await self._send_page(writer)
+            elif path == "/rescan":
+                self.refresh_networks()
+                self._redirect_home(writer)  # So reloading the form doesn't rescan
+            elif path == "/style.css":
+                await self._send_static(writer, "style.css.gz", "text/css")
+            elif path == "/favicon.ico":
+                writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            else:
+                # Connectivity checks (generate_204, hotspot-detect, ...) go to the form
+                self._redirect_home(writer)
+            await writer.drain()
+        except Exception as e:
+            print("[WiFiManager] Client error:", e)
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    def _redirect_home(self, writer):
+        writer.write(b"HTTP/1.1 302 Found\r\nLocation: http://%s/\r\n"
+                     b"Content-Length: 0\r\nConnection: close\r\n\r\n" % self.wlan_ap.ifconfig()[0].encode())
+
+    async def handle_configure(self, writer, body):
         """
         Handle POST request from captive portal.
-        Extracts SSID/password and attempts connection.
-        """
-        match = re.search('ssid=([^&]*)&password=(.*)', request)
-        if match:
-            ssid = match.group(1).replace('%3F', '?').replace('%21', '!')
-            password = match.group(2).replace('%3F', '?').replace('%21', '!')
-            success = self.wifi_connect(ssid, password)
-            if success:
-                self.write_credentials(ssid, password)
-            conn.send(self.get_html(success=success, ssids=networks))
-        else:
-            conn.send(self.get_html(success=False, ssids=networks))
+        Extracts SSID/password from the form body and attempts connection.
+        """
+        form = _parse_form(body)
+        ssid = form.get('ssid')
+        success = False
+        if ssid:
+            async with self._configure_lock:  # One connection attempt at a time
+                success = await self.wifi_connect(ssid, form.get('password', ''))  # Saves the credentials on success
+                if not success:
+                    self.refresh_networks()  # The network may have gone or moved
+        await self._send_page(writer, success)
+
+    async def _send_static(self, writer, name, content_type):
+        """
+        Send a precompressed file from STATIC_DIR.
+        """
+        filename = self.STATIC_DIR + '/' + name
+        try:
+            size = os.stat(filename)[6]
+        except OSError:
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            return
+        writer.write(("HTTP/1.1 200 OK\r\nContent-Type: %s\r\nContent-Encoding: gzip\r\n"
+                      "Content-Length: %d\r\nCache-Control: max-age=86400\r\nConnection: close\r\n\r\n"
+                      % (content_type, size)).encode())
+        buf = bytearray(256)
+        with open(filename, 'rb') as f:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                writer.write(buf[:n])
+                await writer.drain()
+
+    async def _send_page(self, writer, success=None):
+        """
+        Stream the portal page with chunked transfer encoding, one piece at
+        a time, instead of building it in memory.
+        """
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n"
+                     b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+        for piece in self.get_html(success, self.networks):
+            if piece:
+                writer.write(b"%x\r\n" % len(piece))
+                writer.write(piece)
+                writer.write(b"\r\n")
+                await writer.drain()
+        writer.write(b"0\r\n\r\n")
 
     def get_html(self, success=None, ssids=None):
         """
-        Generate HTML for captive portal page.
+        Generate HTML for captive portal page, piece by piece.
         Shows form for SSID/password or connection status.
-        """
-        html = [
-            "<html><head><title>WiFi Manager</title>",
-            "<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">",
-            "<style>body{font-family:Arial,sans-serif;margin:0;padding:20px}h1{color:#333}"
-            "form{max-width:300px}label{display:block;margin-top:10px}input,select{width:100%;padding:5px;margin-top:5px}"
-            "input[type=\"submit\"]{background-color:#4CAF50;color:white;border:none;padding:10px;cursor:pointer}</style>",
-            "</head><body><h1>WiFi Manager</h1>"
-        ]
 
+        Yields:
+            bytes: Consecutive parts of the page.
+        """
+        yield _PAGE_HEAD
         if success is None:
-            html.append("<form action=\"/\" method=\"post\">")
-            html.append("<label for=\"ssid\">SSID:</label>")
+            yield b"<form action=\"/\" method=\"post\"><label for=\"ssid\">SSID:</label>"
             if ssids:
-                html.append("<select id=\"ssid\" name=\"ssid\">")
+                yield b"<select id=\"ssid\" name=\"ssid\">"
                 for ssid in ssids:
-                    html.append(f"<option value=\"{ssid}\">{ssid}</option>")
-                html.append("</select>")
+                    ssid = _escape(ssid)
+                    yield f"<option value=\"{ssid}\">{ssid}</option>".encode()
+                yield b"</select>"
             else:
-                html.append("<input type=\"text\" id=\"ssid\" name=\"ssid\" required>")
-            html.extend([
-                "<label for=\"password\">Password:</label>",
-                "<input type=\"password\" id=\"password\" name=\"password\" required>",
-                "<input type=\"submit\" value=\"Connect\"></form>"
-            ])
+                yield b"<input type=\"text\" id=\"ssid\" name=\"ssid\" required>"
+            yield _PAGE_FORM_TAIL
         elif success:
-            html.append("<p>Successfully connected to WiFi.</p>")
+            yield b"<p>Successfully connected to WiFi.</p>"
         else:
-            html.append("<p>Failed to connect. Please try again.</p>")
+            yield b"<p>Failed to connect. Please try again.</p>"
+        yield b"</body></html>"
+
+
+# ---------------- Portal helpers ----------------
+_PAGE_HEAD = (b"<html><head><title>WiFi Manager</title>"
+              b"<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">"
+              b"<link rel=\"stylesheet\" href=\"/style.css\">"
+              b"</head><body><h1>WiFi Manager</h1>")
+
+_PAGE_FORM_TAIL = (b"<label for=\"password\">Password:</label>"
+                   b"<input type=\"password\" id=\"password\" name=\"password\" required>"
+                   b"<input type=\"submit\" value=\"Connect\"></form>"
+                   b"<p><a href=\"/rescan\">Rescan networks</a></p>")
+
+
+def _escape(text):
+    """
+    Escape text for use inside HTML attributes and elements.
+    """
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+
+
+def _unquote(text):
+    """
+    Decode a URL-encoded form value ('+' and %XX escapes).
+    """
+    data = text.replace('+', ' ').encode()
+    parts = data.split(b'%')
+    out = bytearray(parts[0])
+    for part in parts[1:]:
+        try:
+            out.append(int(part[:2], 16))
+            out.extend(part[2:])
+        except ValueError:
+            out.extend(b'%' + part)
+    return out.decode()
+
 
-        html.append("</body></html>")
-        return ''.join(html)
\ No newline at end of file
+def _parse_form(body):
+    """
+    Parse an application/x-www-form-urlencoded body into a dict.
+    """
+    form = {}
+    for pair in body.split('&'):
+        key, _, value = pair.partition('=')
+        if key:
+            form[_unquote(key)] = _unquote(value)
+    return form
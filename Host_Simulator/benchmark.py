@@ -0,0 +1,221 @@
+"""
+Rendering benchmark for the firmware routines.
+
+Runs each routine in routines.py for N frames against the simulated
+NeoPixel strip (sleeps disabled) and reports time and allocations per
+frame. With --budget-us it exits non-zero when a routine's average frame
+time exceeds the budget, so it can guard against regressions in CI.
+
+With --render-thread the strip is driven through render_thread.py (a
+real thread pushing the front buffer), and the run checks that the last
+frame drawn is the last frame pushed.
+
+Usage:
+    python Host_Simulator/benchmark.py [--frames 500] [--routine fill]
+                                       [--palette 0] [--budget-us 2000]
+                                       [--render-thread]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import simulator
+
+simulator.install(time_scale=0)
+
+import uasyncio as asyncio  # noqa: E402
+import neopixel  # noqa: E402
+from machine import Pin  # noqa: E402
+import routines  # noqa: E402
+import palette  # noqa: E402
+from letters import letters_5x5  # noqa: E402
+from render_thread import RenderThread  # noqa: E402
+
+NUM_PIXELS = 112
+SKATE_PIXELS = 12
+WORD = "SENS"
+BRIGHTNESS = 0.15
+WARMUP_FRAMES = 10  # Steps run before allocations are measured (steady state)
+
+
+def build_palettes():
+    """
+    Build the colour palettes the same way main.py does.
+    """
+    return palette.load_palettes(os.path.join(simulator.FIRMWARE, "colors.txt"))
+
+
+# ---------------- Routine adapters ----------------
+# Each adapter advances one routine by a single frame, threading its
+# state through `s` the same way run_color_routines does in main.py.
+
+async def step_flashing(np, colours, s):
+    s["colour_idx"] = await routines.flashing_routine(
+        np, NUM_PIXELS, SKATE_PIXELS, 0, letters_5x5, WORD, colours, s["colour_idx"], BRIGHTNESS)
+
+
+async def step_fill(np, colours, s):
+    s["colour_idx"], s["idx_letters"], s["b_letters"] = await routines.fill_routine(
+        np, NUM_PIXELS, SKATE_PIXELS, 0, letters_5x5, WORD, colours,
+        s["colour_idx"], s["idx_letters"], s["b_letters"], BRIGHTNESS)
+
+
+async def step_skate(np, colours, s):
+    (s["colour_idx"], s["idx_skate"], s["b_skate"],
+     s["idx_letters"], s["b_letters"]) = await routines.skate_routine(
+        np, NUM_PIXELS, SKATE_PIXELS, 0, letters_5x5, WORD, colours,
+        s["colour_idx"], s["idx_skate"], s["b_skate"], s["idx_letters"], s["b_letters"], BRIGHTNESS)
+
+
+async def step_skate_rng(np, colours, s):
+    (s["colour_idx"], s["idx_skate"], s["b_skate"],
+     s["idx_letters"], s["b_letters"]) = await routines.skate_rng_routine(
+        np, NUM_PIXELS, SKATE_PIXELS, 0, letters_5x5, WORD, colours,
+        s["colour_idx"], s["idx_skate"], s["b_skate"], s["idx_letters"], s["b_letters"], BRIGHTNESS)
+
+
+async def step_fade(np, colours, s):
+    s["colour_idx"], s["b"], s["fade"] = await routines.fade_routine(
+        np, NUM_PIXELS, SKATE_PIXELS, 0, letters_5x5, WORD, colours,
+        s["colour_idx"], s["b"], BRIGHTNESS, s["fade"])
+
+
+async def step_marquee(np, colours, s):
+    s["colour_idx"], s["offset"] = await routines.marquee_routine(
+        np, NUM_PIXELS, SKATE_PIXELS, letters_5x5, "GO SENS GO", colours,
+        s["colour_idx"], s["offset"], BRIGHTNESS)
+
+
+async def step_goal(np, colours, s):
+    await routines.goal_routine(np, NUM_PIXELS, colours, BRIGHTNESS)
+
+
+async def step_wifi_connected(np, colours, s):
+    await routines.wifi_connected_routine(np, NUM_PIXELS, SKATE_PIXELS, colours, BRIGHTNESS)
+
+
+ROUTINES = {
+    "flashing": step_flashing,
+    "fill": step_fill,
+    "skate": step_skate,
+    "skate_rng": step_skate_rng,
+    "fade": step_fade,
+    "marquee": step_marquee,
+    "goal": step_goal,
+    "wifi_connected": step_wifi_connected,
+}
+
+
+def new_state():
+    return {
+        "colour_idx": -1, "b": False, "fade": 0,
+        "idx_skate": -1, "b_skate": False,
+        "idx_letters": -1, "b_letters": False, "offset": -1,
+    }
+
+
+# ---------------- Measurement ----------------
+async def measure_time(step, colours, frames, render_thread=False):
+    """
+    Run `frames` steps of a routine, timing each one.
+
+    Returns:
+        dict: min/avg/max µs per step, LED writes per step and, with a
+              render thread, frames pushed per step.
+    """
+    np = neopixel.NeoPixel(Pin(6, Pin.OUT), NUM_PIXELS)
+    np.RECORD = False
+    renderer = None
+    if render_thread:
+        out = neopixel.NeoPixel(Pin(6, Pin.OUT), NUM_PIXELS)
+        renderer = RenderThread(np, out)
+        renderer.start()
+    s = new_state()
+    times = []
+    for _ in range(frames):
+        t0 = time.perf_counter_ns()
+        await step(np, colours, s)
+        times.append(time.perf_counter_ns() - t0)
+    result = {
+        "min": min(times) / 1000,
+        "avg": sum(times) / len(times) / 1000,
+        "max": max(times) / 1000,
+        "writes": np.writes / frames,
+    }
+    if renderer:
+        renderer.stop()
+        result["writes"] = renderer.presented / frames
+        result["pushed"] = renderer.pushed / frames
+        result["in_sync"] = renderer.presented == 0 or out.frames[-1] == bytes(np.buf)
+    return result
+
+
+async def measure_alloc(step, colours, frames, warmup=WARMUP_FRAMES):
+    """
+    Run `frames` steps of a routine under tracemalloc, after `warmup`
+    untraced steps that compile the routine's caches.
+
+    Returns:
+        dict: Blocks still allocated after each step (averaged) and the
+              largest transient allocation (bytes) seen in a single step.
+    """
+    np = neopixel.NeoPixel(Pin(6, Pin.OUT), NUM_PIXELS)
+    np.RECORD = False
+    s = new_state()
+    blocks = 0
+    peak = 0
+    for _ in range(warmup):
+        await step(np, colours, s)
+    tracemalloc.start()
+    for _ in range(frames):
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        await step(np, colours, s)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+        after = tracemalloc.take_snapshot()
+        blocks += sum(max(0, d.count_diff) for d in after.compare_to(before, "lineno"))
+    tracemalloc.stop()
+    return {"blocks": blocks / frames, "peak": peak}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=500, help="steps per routine (default 500)")
+    parser.add_argument("--alloc-frames", type=int, default=50, help="steps measured for allocations (default 50)")
+    parser.add_argument("--routine", choices=sorted(ROUTINES), action="append", help="routine(s) to run (default all)")
+    parser.add_argument("--palette", type=int, default=0, help="colour mode index (default 0)")
+    parser.add_argument("--budget-us", type=float, help="fail if any routine's average step exceeds this")
+    parser.add_argument("--render-thread", action="store_true", help="push frames from a render thread")
+    args = parser.parse_args(argv)
+
+    colours = build_palettes()[args.palette]
+    names = args.routine or list(ROUTINES)
+    failed = []
+
+    print(f"{'routine':<16}{'min us':>10}{'avg us':>10}{'max us':>10}{'writes':>8}{'kept blk':>10}{'alloc B':>9}")
+    for name in names:
+        step = ROUTINES[name]
+        frames = args.frames if name not in ("goal", "wifi_connected") else max(1, args.frames // 50)
+        timing = asyncio.run(measure_time(step, colours, frames, args.render_thread))
+        alloc = asyncio.run(measure_alloc(step, colours, min(frames, args.alloc_frames)))
+        print(f"{name:<16}{timing['min']:>10.1f}{timing['avg']:>10.1f}{timing['max']:>10.1f}"
+              f"{timing['writes']:>8.1f}{alloc['blocks']:>10.1f}{alloc['peak']:>9}")
+        if args.render_thread:
+            print(f"{'':<16}render thread: {timing['pushed']:.2f} frames pushed per step"
+                  f"{'' if timing['in_sync'] else ', LAST FRAME NOT PUSHED'}")
+            if not timing["in_sync"]:
+                failed.append(name)
+        if args.budget_us is not None and timing["avg"] > args.budget_us:
+            failed.append(name)
+
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
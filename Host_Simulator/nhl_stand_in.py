@@ -0,0 +1,82 @@
+"""
+Local stand-in for the public NHL score feed.
+
+Serves a payload from Host_Simulator/payloads at /v1/score/now, for
+testing the firmware's direct fallback (set NHL_URL to
+http://<host>:<port>/v1/score/now and point `url` at a server that is
+down). By default the body is sent with chunked transfer encoding, in
+small writes, like the real feed. With --redirect, /v1/score/now answers
+307 with the dated URL (/v1/score/<currentDate>), as the real feed does.
+
+Usage:
+    python Host_Simulator/nhl_stand_in.py [payloads/score_now_live.json] [--port 8001] [--plain] [--redirect]
+"""
+import argparse
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PAYLOAD = os.path.join(HERE, "payloads", "score_now_live.json")
+WRITE_SIZE = 1400  # Bytes per write, about one TCP segment
+
+
+def make_handler(path, chunked, redirect):
+    with open(path, "rb") as f:
+        dated = "/v1/score/" + json.load(f)["currentDate"]
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if redirect and self.path == "/v1/score/now":
+                self.send_response(307)
+                self.send_header("Location", dated)
+                self.send_header("Content-Length", "0")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                return
+            if self.path != (dated if redirect else "/v1/score/now"):
+                self.send_error(404)
+                return
+            with open(path, "rb") as f:
+                data = f.read()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            if chunked:
+                self.send_header("Transfer-Encoding", "chunked")
+            else:
+                self.send_header("Content-Length", str(len(data)))
+            self.send_header("Connection", "close")
+            self.end_headers()
+            try:
+                for i in range(0, len(data), WRITE_SIZE):
+                    part = data[i:i + WRITE_SIZE]
+                    if chunked:
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+                    else:
+                        self.wfile.write(part)
+                if chunked:
+                    self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # The board stops reading once it has its game
+            self.close_connection = True
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("payload", nargs="?", default=DEFAULT_PAYLOAD, help="recorded score feed (JSON)")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--plain", action="store_true", help="send Content-Length instead of chunked")
+    parser.add_argument("--redirect", action="store_true", help="redirect /v1/score/now to the dated URL")
+    args = parser.parse_args()
+    server = ThreadingHTTPServer(("", args.port), make_handler(args.payload, not args.plain, args.redirect))
+    print(f"[nhl_stand_in] Serving {os.path.basename(args.payload)} on port {args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Local firmware server for testing over-the-air updates.
+
+Serves a release folder made by Build_Tools/build_ota.py under the same
+paths as the FastAPI server (/nhl-data/firmware/manifest and
+/nhl-data/firmware/files/<name>), with HTTP Range support so boards can
+resume. --drop-after cuts every file response after that many bytes, to
+exercise resuming.
+
+Usage:
+    python Host_Simulator/ota_server.py release [--port 8000] [--drop-after 700]
+"""
+import argparse
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIX = "/nhl-data/firmware/"
+
+
+def make_handler(root, drop_after):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == PREFIX + "manifest":
+                path = os.path.join(root, "manifest.json")
+            elif self.path.startswith(PREFIX + "files/"):
+                name = self.path[len(PREFIX + "files/"):]
+                path = os.path.normpath(os.path.join(root, "files", name))
+                if not path.startswith(os.path.join(root, "files") + os.sep):
+                    self.send_error(404)
+                    return
+            else:
+                self.send_error(404)
+                return
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                self.send_error(404)
+                return
+
+            start = 0
+            rng = self.headers.get("Range", "")
+            if rng.startswith("bytes=") and rng.endswith("-") and rng[6:-1].isdigit():
+                start = int(rng[6:-1])  # Malformed ranges get the whole file
+            if start >= len(data) > 0:
+                self.send_error(416)
+                return
+            self.send_response(206 if start else 200)
+            if start:
+                self.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+            self.send_header("Content-Length", str(len(data) - start))
+            self.send_header("Connection", "close")
+            self.end_headers()
+            body = data[start:]
+            if drop_after and self.path != PREFIX + "manifest":
+                body = body[:drop_after]
+            self.wfile.write(body)
+            self.close_connection = True
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("root", help="release folder from build_ota.py")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--drop-after", type=int, default=0,
+                        help="close file responses after this many bytes (0 = never)")
+    args = parser.parse_args()
+    server = ThreadingHTTPServer(("", args.port), make_handler(os.path.abspath(args.root), args.drop_after))
+    print(f"[ota_server] Serving {args.root} on port {args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
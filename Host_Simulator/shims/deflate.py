@@ -0,0 +1,50 @@
+"""
+Host stand-in for MicroPython's `deflate` module (read side only).
+
+Like the firmware, the window size is taken from `wbits` (default 15), so
+a stream compressed with a larger window than the reader allows fails
+here too.
+"""
+import zlib
+
+AUTO = 0
+RAW = 1
+ZLIB = 2
+GZIP = 3
+
+_CHUNK = 512
+
+
+class DeflateIO:
+    """
+    Decompressing wrapper around a binary stream.
+    """
+
+    def __init__(self, stream, format=AUTO, wbits=0, close=False):
+        wbits = wbits or 15
+        if format == RAW:
+            wbits = -wbits
+        elif format == GZIP:
+            wbits += 16
+        elif format == AUTO:
+            wbits += 32
+        self._stream = stream
+        self._d = zlib.decompressobj(wbits)
+        self._pending = b""
+
+    def read(self, n=-1):
+        while n < 0 or len(self._pending) < n:
+            data = self._stream.read(_CHUNK)
+            if not data:
+                self._pending += self._d.flush()
+                break
+            self._pending += self._d.decompress(data)
+        if n < 0:
+            n = len(self._pending)
+        out, self._pending = self._pending[:n], self._pending[n:]
+        return out
+
+    def readinto(self, buf):
+        data = self.read(len(buf))
+        buf[:len(data)] = data
+        return len(data)
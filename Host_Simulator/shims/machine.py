@@ -0,0 +1,142 @@
+"""
+Host stand-in for MicroPython's `machine` module.
+
+Pins keep their level in memory and can be driven from a script with
+`Pin.drive()`, which also fires any IRQ handler registered on the pin.
+"""
+import threading
+import time
+
+_freq = 160_000_000
+
+
+class Pin:
+    IN = 1
+    OUT = 3
+    OPEN_DRAIN = 7
+    PULL_UP = 2
+    PULL_DOWN = 1
+    IRQ_RISING = 1
+    IRQ_FALLING = 2
+
+    # All pins created so far, keyed by pin number
+    pins = {}
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self.mode = mode
+        self.pull = pull
+        self._value = 1 if pull == Pin.PULL_UP else 0
+        if value is not None:
+            self._value = value
+        self._handler = None
+        self._trigger = 0
+        Pin.pins[id] = self
+
+    def value(self, v=None):
+        if v is None:
+            return self._value
+        self._value = 1 if v else 0
+
+    def on(self):
+        self._value = 1
+
+    def off(self):
+        self._value = 0
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING, wake=None, hard=False):
+        self._handler = handler
+        self._trigger = trigger
+
+    def drive(self, level):
+        """
+        Simulate an external level change, firing the IRQ handler if the
+        edge matches its trigger.
+        """
+        level = 1 if level else 0
+        if level == self._value:
+            return
+        self._value = level
+        edge = Pin.IRQ_RISING if level else Pin.IRQ_FALLING
+        if self._handler and self._trigger & edge:
+            self._handler(self)
+
+    def __repr__(self):
+        return f"Pin({self.id})"
+
+
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1, **kwargs):
+        self.id = id
+        self._thread = None
+        self._stop = threading.Event()
+        if kwargs:
+            self.init(**kwargs)
+
+    def init(self, mode=PERIODIC, period=-1, freq=-1, callback=None):
+        self.deinit()
+        if freq > 0:
+            period = 1000 // freq
+        self._stop = threading.Event()
+
+        def run(stop=self._stop):
+            while not stop.wait(period / 1000):
+                callback(self)
+                if mode == Timer.ONE_SHOT:
+                    break
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+
+    def deinit(self):
+        self._stop.set()
+
+
+class RTC:
+    def __init__(self, id=0):
+        self._offset = 0
+
+    def datetime(self, dt=None):
+        if dt is None:
+            t = time.localtime(time.time() + self._offset)
+            return (t.tm_year, t.tm_mon, t.tm_mday, t.tm_wday, t.tm_hour, t.tm_min, t.tm_sec, 0)
+        return None
+
+
+class ResetError(SystemExit):
+    """Raised by `reset()` so a simulated reboot ends the run."""
+
+
+def reset():
+    raise ResetError("machine.reset()")
+
+
+def soft_reset():
+    raise ResetError("machine.soft_reset()")
+
+
+def freq(hz=None):
+    global _freq
+    if hz is None:
+        return _freq
+    _freq = hz
+
+
+def lightsleep(ms=None):
+    if ms:
+        time.sleep(ms / 1000)
+
+
+def idle():
+    pass
+
+
+def unique_id():
+    return b"\x00\x11\x22\x33\x44\x55"
+
+
+SLEEP = 2
+DEEPSLEEP = 4
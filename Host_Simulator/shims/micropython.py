@@ -0,0 +1,31 @@
+"""
+Host stand-in for MicroPython's `micropython` module.
+"""
+
+
+def const(x):
+    return x
+
+
+def schedule(func, arg):
+    func(arg)
+
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+
+def mem_info(verbose=False):
+    print("mem_info: not available on host")
+
+
+def opt_level(level=None):
+    return 0
+
+
+def native(f):
+    return f
+
+
+def viper(f):
+    return f
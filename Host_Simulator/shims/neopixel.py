@@ -0,0 +1,59 @@
+"""
+Host stand-in for MicroPython's `neopixel` module.
+
+Mirrors the real driver's buffer layout (GRB byte order) and records a
+copy of the buffer on every write() in `frames`.
+"""
+
+
+class NeoPixel:
+    ORDER = (1, 0, 2, 3)
+
+    # Set to False to stop recording frames (e.g. when measuring allocations)
+    RECORD = True
+    MAX_FRAMES = 2000
+
+    def __init__(self, pin, n, bpp=3, timing=1):
+        self.pin = pin
+        self.n = n
+        self.bpp = bpp
+        self.buf = bytearray(n * bpp)
+        self.timing = timing
+        self.frames = []
+        self.writes = 0
+
+    def __len__(self):
+        return self.n
+
+    def __setitem__(self, i, v):
+        offset = i * self.bpp
+        for j in range(self.bpp):
+            self.buf[offset + self.ORDER[j]] = v[j]
+
+    def __getitem__(self, i):
+        offset = i * self.bpp
+        return tuple(self.buf[offset + self.ORDER[j]] for j in range(self.bpp))
+
+    def fill(self, v):
+        b = self.buf
+        l = len(self.buf)
+        bpp = self.bpp
+        for i in range(bpp):
+            c = v[i]
+            j = self.ORDER[i]
+            while j < l:
+                b[j] = c
+                j += bpp
+
+    def write(self):
+        self.writes += 1
+        if self.RECORD and len(self.frames) < self.MAX_FRAMES:
+            self.frames.append(bytes(self.buf))
+
+    def pixels(self, frame=-1):
+        """
+        Returns a recorded frame as a list of (R, G, B) tuples.
+        """
+        data = self.frames[frame]
+        bpp = self.bpp
+        return [tuple(data[i * bpp + self.ORDER[j]] for j in range(bpp)) for i in range(self.n)]
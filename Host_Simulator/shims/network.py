@@ -0,0 +1,90 @@
+"""
+Host stand-in for MicroPython's `network` module.
+
+`NETWORKS` lists the access points the fake radio can see as
+(ssid, password, rssi). Connecting succeeds when the password matches.
+"""
+STA_IF = 0
+AP_IF = 1
+
+STAT_IDLE = 1000
+STAT_CONNECTING = 1001
+STAT_WRONG_PASSWORD = 202
+STAT_NO_AP_FOUND = 201
+STAT_CONNECT_FAIL = 203
+STAT_GOT_IP = 1010
+
+NETWORKS = [
+    ("HomeWiFi", "password", -48),
+]
+
+_interfaces = {}
+
+
+class WLAN:
+    def __new__(cls, interface_id=STA_IF):
+        # Like the firmware, every WLAN(STA_IF) refers to the same interface
+        if interface_id not in _interfaces:
+            wlan = super().__new__(cls)
+            wlan._init(interface_id)
+            _interfaces[interface_id] = wlan
+        return _interfaces[interface_id]
+
+    def _init(self, interface_id):
+        self.interface_id = interface_id
+        self._active = False
+        self._ssid = None
+        self._status = STAT_IDLE
+        self._config = {}
+
+    def active(self, is_active=None):
+        if is_active is None:
+            return self._active
+        self._active = bool(is_active)
+        if not self._active:
+            self._ssid = None
+            self._status = STAT_IDLE
+
+    def connect(self, ssid=None, key=None, **kwargs):
+        for name, password, _ in NETWORKS:
+            if name == ssid:
+                if password == key:
+                    self._ssid = ssid
+                    self._status = STAT_GOT_IP
+                else:
+                    self._status = STAT_WRONG_PASSWORD
+                return
+        self._status = STAT_NO_AP_FOUND
+
+    def disconnect(self):
+        self._ssid = None
+        self._status = STAT_IDLE
+
+    def isconnected(self):
+        return self._ssid is not None
+
+    def status(self, param=None):
+        if param == 'rssi':
+            for name, _, rssi in NETWORKS:
+                if name == self._ssid:
+                    return rssi
+            return 0
+        return self._status
+
+    def scan(self):
+        return [(name.encode(), b"\x00" * 6, 1, rssi, 3, False) for name, _, rssi in NETWORKS]
+
+    def ifconfig(self, config=None):
+        if self.interface_id == AP_IF:
+            return ("192.168.4.1", "255.255.255.0", "192.168.4.1", "192.168.4.1")
+        if self._ssid is None:
+            return ("0.0.0.0", "0.0.0.0", "0.0.0.0", "0.0.0.0")
+        return ("127.0.0.1", "255.255.255.0", "127.0.0.1", "127.0.0.1")
+
+    def config(self, *args, **kwargs):
+        if kwargs:
+            self._config.update(kwargs)
+            return None
+        if args:
+            return self._config.get(args[0])
+        return None
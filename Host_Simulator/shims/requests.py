@@ -0,0 +1,5 @@
+"""
+Host stand-in for MicroPython's `requests` (same as `urequests`).
+"""
+from urequests import *  # noqa: F401,F403
+from urequests import Response, request, get, post  # noqa: F401
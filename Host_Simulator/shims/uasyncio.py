@@ -0,0 +1,123 @@
+"""
+Host stand-in for MicroPython's `uasyncio`, backed by CPython asyncio.
+
+Adds the MicroPython-only helpers (sleep_ms, wait_for_ms, ThreadSafeFlag,
+Stream.readinto) and a TIME_SCALE factor applied to every sleep: 1.0 runs
+in real time, 0 turns sleeps into plain yields for benchmarking. Timeouts
+are not scaled, since they usually guard real network I/O.
+"""
+import asyncio as _asyncio
+from asyncio import *  # noqa: F401,F403
+
+TIME_SCALE = 1.0
+
+
+async def sleep(t):
+    await _asyncio.sleep(t * TIME_SCALE)
+
+
+async def sleep_ms(t):
+    await _asyncio.sleep(t * TIME_SCALE / 1000)
+
+
+async def wait_for(aw, timeout):
+    return await _asyncio.wait_for(aw, timeout)
+
+
+async def wait_for_ms(aw, timeout):
+    return await wait_for(aw, timeout / 1000)
+
+
+class ThreadSafeFlag:
+    """
+    Flag that may be set from an IRQ handler or another thread.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._event = _asyncio.Event()
+
+    def set(self):
+        loop = self._loop
+        if loop is None:
+            try:
+                loop = _asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+        if loop is None:
+            self._event.set()
+        else:
+            loop.call_soon_threadsafe(self._event.set)
+
+    def clear(self):
+        self._event.clear()
+
+    async def wait(self):
+        self._loop = _asyncio.get_running_loop()
+        await self._event.wait()
+        self._event.clear()
+
+
+class Stream:
+    """
+    Combined reader/writer, like MicroPython's uasyncio.Stream.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+
+    async def read(self, n=-1):
+        return await self._reader.read(n)
+
+    async def readinto(self, buf):
+        data = await self._reader.read(len(buf))
+        buf[:len(data)] = data
+        return len(data)
+
+    async def readexactly(self, n):
+        return await self._reader.readexactly(n)
+
+    async def readline(self):
+        return await self._reader.readline()
+
+    def write(self, buf):
+        self._writer.write(bytes(buf))
+
+    async def drain(self):
+        await self._writer.drain()
+
+    async def awrite(self, buf, off=0, sz=-1):
+        buf = buf[off:] if sz < 0 else buf[off:off + sz]
+        self.write(buf)
+        await self.drain()
+
+    def get_extra_info(self, name):
+        return self._writer.get_extra_info(name)
+
+    def close(self):
+        self._writer.close()
+
+    async def wait_closed(self):
+        try:
+            await self._writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+    async def aclose(self):
+        self.close()
+        await self.wait_closed()
+
+
+async def open_connection(host, port, ssl=None):
+    reader, writer = await _asyncio.open_connection(host, port, ssl=ssl)
+    stream = Stream(reader, writer)
+    return stream, stream
+
+
+async def start_server(callback, host, port, backlog=5):
+    async def handler(reader, writer):
+        stream = Stream(reader, writer)
+        await callback(stream, stream)
+
+    return await _asyncio.start_server(handler, host, port, backlog=backlog)
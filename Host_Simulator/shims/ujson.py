@@ -0,0 +1,4 @@
+"""
+Host stand-in for MicroPython's `ujson`.
+"""
+from json import dump, dumps, load, loads  # noqa: F401
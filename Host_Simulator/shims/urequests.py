@@ -0,0 +1,48 @@
+"""
+Host stand-in for MicroPython's `urequests`, built on urllib.
+"""
+import json as _json
+import urllib.error
+import urllib.request
+
+
+class Response:
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+        self.reason = b""
+
+    @property
+    def text(self):
+        return self.content.decode()
+
+    def json(self):
+        return _json.loads(self.content)
+
+    def close(self):
+        pass
+
+
+def request(method, url, data=None, json=None, headers=None, timeout=None):
+    headers = dict(headers or {})
+    if json is not None:
+        data = _json.dumps(json)
+        headers.setdefault("Content-Type", "application/json")
+    if isinstance(data, str):
+        data = data.encode()
+    req = urllib.request.Request(url, data=data, headers=headers, method=method)
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return Response(resp.status, resp.read())
+    except urllib.error.HTTPError as e:
+        return Response(e.code, e.read())
+    except urllib.error.URLError as e:
+        raise OSError(str(e.reason))
+
+
+def get(url, **kw):
+    return request("GET", url, **kw)
+
+
+def post(url, **kw):
+    return request("POST", url, **kw)
@@ -0,0 +1,75 @@
+"""
+LumaRink host simulator.
+
+Makes the firmware importable under CPython by putting the MicroPython
+shims (machine, neopixel, network, uasyncio, ...) and Firmware_Code on
+sys.path, and by adding the MicroPython-only functions the firmware uses
+to `time` and `gc`.
+
+Usage:
+    import simulator
+    simulator.install(time_scale=0)
+    import routines
+"""
+import gc
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SHIMS = os.path.join(HERE, "shims")
+FIRMWARE = os.path.join(os.path.dirname(HERE), "Firmware_Code")
+
+_installed = False
+
+
+def _patch_time():
+    t0 = time.perf_counter_ns()
+
+    def ticks_ms():
+        return ((time.perf_counter_ns() - t0) // 1_000_000) & 0x3FFFFFFF
+
+    def ticks_us():
+        return ((time.perf_counter_ns() - t0) // 1_000) & 0x3FFFFFFF
+
+    def ticks_diff(a, b):
+        # Ticks wrap at 2**30, like the firmware's small-int ticks
+        return ((a - b + 0x20000000) & 0x3FFFFFFF) - 0x20000000
+
+    def ticks_add(a, delta):
+        return (a + delta) & 0x3FFFFFFF
+
+    time.ticks_ms = ticks_ms
+    time.ticks_us = ticks_us
+    time.ticks_cpu = ticks_us
+    time.ticks_diff = ticks_diff
+    time.ticks_add = ticks_add
+    time.sleep_ms = lambda ms: time.sleep(ms / 1000)
+    time.sleep_us = lambda us: time.sleep(us / 1_000_000)
+
+
+def _patch_gc():
+    gc.mem_alloc = lambda: sys.getallocatedblocks() * 16
+    gc.mem_free = lambda: 1 << 20
+    gc.threshold = lambda *args: -1
+
+
+def install(time_scale=1.0):
+    """
+    Make the firmware and the MicroPython shims importable.
+
+    Args:
+        time_scale (float): Factor applied to every uasyncio sleep.
+                            0 turns sleeps into plain yields.
+    """
+    global _installed
+    if not _installed:
+        sys.path.insert(0, FIRMWARE)
+        sys.path.insert(0, SHIMS)
+        _patch_time()
+        _patch_gc()
+        _installed = True
+
+    import uasyncio
+    uasyncio.TIME_SCALE = time_scale
+
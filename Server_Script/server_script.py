@@ -1,5 +1,8 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Header
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel
+import json
+import os
 import requests
 import time
 import threading
@@ -21,12 +24,21 @@ homeTeamScore = []
 awayTeamName = []
 
 # Firmware / protocol versioning
-latestVersion = 1
+# Release folder made by Build_Tools/build_ota.py; its version is the latest
+FIRMWARE_DIR = os.environ.get("FIRMWARE_DIR", "release")
+try:
+    with open(os.path.join(FIRMWARE_DIR, "manifest.json")) as f:
+        latestVersion = json.load(f)["version"]
+except (OSError, ValueError, KeyError):
+    latestVersion = 1
 
 # Input timing values sent to the firmware when versions mismatch
 DOUBLE_PRESS_INTERVAL = 500
 DEBOUNCE_MS = 50
 
+# Latest profiling summary reported by each device (keyed by team name)
+deviceProfiles: Dict[str, dict] = {}
+
 # -----------------------------------------------------------------------------
 # Request model
 # -----------------------------------------------------------------------------
@@ -34,6 +46,7 @@ DEBOUNCE_MS = 50
 class Message(BaseModel):
     message: str   # Team name requested by the device
     version: int   # Firmware version running on the device
+    profile: Optional[dict] = None  # Profiling summary (devices with PROFILE enabled)
 
 # -----------------------------------------------------------------------------
 # Basic test endpoint
@@ -49,6 +62,10 @@ async def read_root():
 async def receive_string(data: Message):
     print(f"Received request for team: {data.message} with version {data.version}")
 
+    # Keep the latest profiling summary, if the device sent one
+    if data.profile is not None:
+        deviceProfiles[data.message] = data.profile
+
     # Detect firmware version mismatch
     if data.version != latestVersion:
         print(
@@ -64,6 +81,7 @@ async def receive_string(data: Message):
             response = {
                 "team_name": homeTeamName[x],
                 "score_game": homeTeamScore[x],
+                "score_opponent": awayTeamScore[x],
                 "game_state": gameState[x],
                 "new_url": "http://nhl-vps-9175.vpsmini.keepsec.cloud/nhl-data/",
                 "latestVersion": latestVersion,
@@ -85,6 +103,7 @@ async def receive_string(data: Message):
             response = {
                 "team_name": awayTeamName[x],
                 "score_game": awayTeamScore[x],
+                "score_opponent": homeTeamScore[x],
                 "game_state": gameState[x],
                 "new_url": "http://nhl-vps-9175.vpsmini.keepsec.cloud/nhl-data/",
                 "latestVersion": latestVersion,
@@ -103,6 +122,60 @@ async def receive_string(data: Message):
     print(f"No match found for team: {data.message}")
     return {"error": "Team not found"}
 
+# -----------------------------------------------------------------------------
+# Device profiling summaries
+# -----------------------------------------------------------------------------
+@app.get("/nhl-data/profile")
+async def read_profiles():
+    """
+    Returns the latest profiling summary sent by each device, as
+    probe -> [count, min, avg, max, peak] in microseconds.
+    """
+    return deviceProfiles
+
+# -----------------------------------------------------------------------------
+# Firmware updates
+# -----------------------------------------------------------------------------
+@app.get("/nhl-data/firmware/manifest")
+async def firmware_manifest():
+    """
+    Returns the release manifest (version, and size and SHA-256 of every file).
+    """
+    path = os.path.join(FIRMWARE_DIR, "manifest.json")
+    if not os.path.isfile(path):
+        return Response(status_code=404)
+    return FileResponse(path, media_type="application/json")
+
+@app.get("/nhl-data/firmware/files/{name:path}")
+async def firmware_file(name: str, byte_range: Optional[str] = Header(None, alias="Range")):
+    """
+    Returns one release file, from the requested offset if the device
+    sends `Range: bytes=<start>-` (resuming an interrupted download).
+    """
+    root = os.path.abspath(os.path.join(FIRMWARE_DIR, "files"))
+    path = os.path.abspath(os.path.join(root, name))
+    if not path.startswith(root + os.sep) or not os.path.isfile(path):
+        return Response(status_code=404)
+    with open(path, "rb") as f:
+        data = f.read()
+
+    # Only "bytes=<start>-" is supported; anything else gets the whole file
+    start = 0
+    if byte_range and byte_range.startswith("bytes=") and byte_range.endswith("-"):
+        offset = byte_range[6:-1]
+        if offset.isdigit():
+            start = int(offset)
+    if start == 0:
+        return Response(data, media_type="application/octet-stream")
+    if start >= len(data):
+        return Response(status_code=416)
+    return Response(
+        data[start:],
+        status_code=206,
+        media_type="application/octet-stream",
+        headers={"Content-Range": f"bytes {start}-{len(data) - 1}/{len(data)}"},
+    )
+
 # -----------------------------------------------------------------------------
 # NHL API polling
 # -----------------------------------------------------------------------------